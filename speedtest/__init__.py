@@ -4,4 +4,17 @@ from speedtest._decorators import (
     parametrize as parametrize,
     fixture as fixture,
     mark as mark,
+    group as group,
+    throughput as throughput,
+    timeout as timeout,
+    setup as setup,
+    limit as limit,
+    Work as Work,
+    ParamGrid as ParamGrid,
+)
+from speedtest._datafile import datafile as datafile
+from speedtest._regions import (
+    region as region,
+    pause as pause,
+    resume as resume,
 )
@@ -1,10 +1,11 @@
 """__main__ interface."""
 
 import os
+import sys
 import argparse
 import importlib
 import importlib.metadata
-from typing import Any
+from typing import Any, List
 from functools import partial
 
 # local import
@@ -13,8 +14,13 @@ from speedtest._ioops import (
     read_toml,
     read_ini,
 )
+from speedtest._bisect import run_bisect
+from speedtest._interpreters import run_interpreters
 from speedtest._log import log_output
-from speedtest._processor import run_session
+from speedtest._stringify import parse_time
+from speedtest._processor import run_merge, run_session
+from speedtest._selfbench import SUITE_DIR
+from speedtest._watch import run_watch
 
 
 def cliargs_argparser() -> dict[str, Any]:  # pragma: no cover
@@ -38,17 +44,208 @@ def cliargs_argparser() -> dict[str, Any]:  # pragma: no cover
     parser.add_argument(
         "--nreps",
         type=int,
-        default=3,
-        help="Number of repetitions per test. (default=3)",
+        default=None,
+        help="Number of repetitions per test. (default=3, 1 with --quick, "
+        "10 with --rigorous)",
+    )
+    profile_group = parser.add_mutually_exclusive_group()
+    profile_group.add_argument(
+        "--quick",
+        dest="profile",
+        action="store_const",
+        const="quick",
+        help="Calibrates for 10ms, up to 10000 loops, with 1 repetition.",
+    )
+    profile_group.add_argument(
+        "--rigorous",
+        dest="profile",
+        action="store_const",
+        const="rigorous",
+        help="Calibrates for 1s, with at least 10 repetitions.",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=parse_time,
+        default=None,
+        metavar="TIME",
+        help="Calibrates each test to run for at least TIME per repetition. (default=0.2s)",
+    )
+    parser.add_argument(
+        "--max-loops",
+        type=int,
+        default=None,
+        help="Limits the number of loops of each repetition.",
+    )
+    parser.add_argument(
+        "--clock",
+        choices=("wall", "process", "thread"),
+        default=None,
+        help="Times elapsed time, or the CPU time of the process or thread. "
+        "(default='wall')",
+    )
+    parser.add_argument(
+        "--rusage",
+        action="store_true",
+        help="Reports CPU time, context switches, page faults and max RSS.",
     )
     parser.add_argument("--tocsv", action="store_true", help="Generates a CSV table.")
     parser.add_argument("--totxt", action="store_true", help="Generates a text log.")
+    parser.add_argument(
+        "--topyperf",
+        action="store_true",
+        help="Generates a pyperf-compatible JSON file.",
+    )
+    parser.add_argument(
+        "--togbench",
+        action="store_true",
+        help="Generates a Google Benchmark JSON file.",
+    )
+    parser.add_argument(
+        "--tojunit",
+        action="store_true",
+        help="Generates a JUnit XML report, failing benchmarks over their limits.",
+    )
+    parser.add_argument(
+        "--toparquet",
+        action="store_true",
+        help="Generates a Parquet table (requires pyarrow).",
+    )
+    parser.add_argument(
+        "--toarrow",
+        action="store_true",
+        help="Generates an Arrow IPC table (requires pyarrow).",
+    )
+    parser.add_argument(
+        "--tojson", action="store_true", help="Generates a JSON file of results."
+    )
+    parser.add_argument(
+        "--json-file",
+        default=None,
+        metavar="PATH",
+        help="Writes the JSON output to PATH instead of runX.json (implies --tojson).",
+    )
+    parser.add_argument(
+        "--count-instructions",
+        action="store_true",
+        help="Counts the bytecode instructions and calls of one call of each "
+        "benchmark (Python 3.12+).",
+    )
+    parser.add_argument(
+        "--warmup",
+        default=None,
+        metavar="auto|N",
+        help="Discards the first N calls of each benchmark before timing it, or "
+        "with 'auto', those before its times reach a steady state. (default=0)",
+    )
+    parser.add_argument(
+        "--line-profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="TARGETS",
+        help="Times each line of the comma-separated functions TARGETS, e.g. "
+        "'mypkg.module.func', during one untimed call of each benchmark; without "
+        "TARGETS, the speed functions themselves. Saved under "
+        ".speedtest_cache/line_profile.",
+    )
+    parser.add_argument(
+        "--interleave",
+        action="store_true",
+        help="Runs the repeats of all benchmarks as rounds in a random order.",
+    )
+    parser.add_argument(
+        "--replicas",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Times every file in K fresh processes, each with a different "
+        "PYTHONHASHSEED, and separates the variance within and between processes.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seeds the order of --interleave, and the hash seeds of --replicas, "
+        "to reproduce a previous session.",
+    )
+    parser.add_argument(
+        "--shard",
+        default=None,
+        metavar="i/N",
+        help="Runs only the i-th of N shards of the files, spread evenly, or "
+        "balanced by the runtimes in --shard-costs.",
+    )
+    parser.add_argument(
+        "--shard-costs",
+        default=None,
+        metavar="FILE",
+        help="Balances --shard by the runtimes in FILE, the --tojson output of a "
+        "previous run, which every node must be given.",
+    )
+    parser.add_argument(
+        "-k",
+        dest="keyword",
+        default=None,
+        metavar="KEYWORD",
+        help="Only times benchmarks whose 'path:label' contains or matches KEYWORD.",
+    )
+    parser.add_argument(
+        "--interpreters",
+        default=None,
+        metavar="PYTHONS",
+        help="Runs the suite under each of a comma-separated list of interpreters, "
+        "e.g. 'python3.12,python3.13', and compares them.",
+    )
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="Also measures import time and first-call latency in fresh interpreters.",
+    )
+    parser.add_argument(
+        "--self-bench",
+        action="store_true",
+        help="Times speedtest's own stages on synthetic suites, instead of FILE_OR_DIR.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Re-times benchmarks whenever their code or local imports change.",
+    )
     parser.add_argument(
         "--no-cache", action="store_true", help="No read/write caching."
     )
     parser.add_argument(
         "--ignore-cache", action="store_true", help="Ignores .speedtest_cache if set."
     )
+    parser.add_argument(
+        "--no-precheck",
+        action="store_true",
+        help="Skips the system noise pre-check and calibration kernels.",
+    )
+    parser.add_argument(
+        "--wait-quiet",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Waits up to SECONDS for a noisy system to settle. (default=0)",
+    )
+    parser.add_argument(
+        "--normalize",
+        action="store_true",
+        help="Reports scores relative to the calibration kernels.",
+    )
+    parser.add_argument(
+        "--max-time-per-benchmark",
+        default=None,
+        metavar="TIME",
+        help="Kills any benchmark running longer than TIME, e.g. '30s'.",
+    )
+    parser.add_argument(
+        "--session-budget",
+        default=None,
+        metavar="TIME",
+        help="Skips benchmarks once the session has run for TIME, e.g. '15m'.",
+    )
     parser.add_argument(
         "--print-pad-width",
         type=int,
@@ -68,10 +265,116 @@ def cliargs_argparser() -> dict[str, Any]:  # pragma: no cover
     return args_dict
 
 
-def main(args_dict):
-    #######################################################
-    #   Main entry point
-    #######################################################
+def cliargs_merge_argparser(argv: List[str]) -> dict[str, Any]:  # pragma: no cover
+    """Generates command line arguments for the `speedtest merge` subcommand."""
+
+    parser = argparse.ArgumentParser(
+        prog="speedtest merge",
+        description="Merges the JSON outputs of sharded runs into one cache and report.",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="JSON files (or glob patterns) written by --tojson."
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="json_file",
+        default="combined.json",
+        help="Path of the merged JSON file. (default='combined.json')",
+    )
+    parser.add_argument(
+        "--unit",
+        choices=("s", "ms", "us", "ns", "auto"),
+        default="auto",
+        help="Forces all time units to share the same unit. (default='auto')",
+    )
+    parser.add_argument("--tocsv", action="store_true", help="Generates a CSV table.")
+    parser.add_argument("--totxt", action="store_true", help="Generates a text log.")
+    parser.add_argument(
+        "--topyperf",
+        action="store_true",
+        help="Generates a pyperf-compatible JSON file.",
+    )
+    parser.add_argument(
+        "--togbench",
+        action="store_true",
+        help="Generates a Google Benchmark JSON file.",
+    )
+    parser.add_argument(
+        "--tojunit",
+        action="store_true",
+        help="Generates a JUnit XML report, failing benchmarks over their limits.",
+    )
+    parser.add_argument(
+        "--toparquet",
+        action="store_true",
+        help="Generates a Parquet table (requires pyarrow).",
+    )
+    parser.add_argument(
+        "--toarrow",
+        action="store_true",
+        help="Generates an Arrow IPC table (requires pyarrow).",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Does not write the merged cache."
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Suppresses all printing."
+    )
+
+    args_dict = vars(parser.parse_args(argv))
+    args_dict["file_or_dir"] = []
+    return args_dict
+
+
+def cliargs_bisect_argparser(argv: List[str]) -> dict[str, Any]:  # pragma: no cover
+    """Generates command line arguments for the `speedtest bisect` subcommand."""
+
+    parser = argparse.ArgumentParser(
+        prog="speedtest bisect",
+        description="Finds the first commit between GOOD and BAD which made a "
+        "benchmark significantly slower.",
+    )
+    parser.add_argument("good", help="A git revision with the original speed.")
+    parser.add_argument("bad", help="A later git revision which is slower.")
+    parser.add_argument(
+        "file_or_dir", nargs="*", help="Path to file or directory of Python files."
+    )
+    parser.add_argument(
+        "-k",
+        dest="keyword",
+        required=True,
+        metavar="KEYWORD",
+        help="Selects the one benchmark to bisect, by its 'path:label'.",
+    )
+    parser.add_argument(
+        "--nreps",
+        type=int,
+        default=10,
+        help="Number of repetitions at each commit. (default=10)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=parse_time,
+        default=None,
+        metavar="TIME",
+        help="Calibrates each repetition to run for at least TIME. (default=0.2s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="Smallest relative slowdown to search for. (default=0.05)",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Suppresses all printing."
+    )
+
+    return vars(parser.parse_args(argv))
+
+
+def _collect_kwargs(args_dict) -> Kwargs:
+    """Collapses dotenv, ini, TOML and command-line arguments into Kwargs."""
 
     kwargs_dict = {}
 
@@ -114,19 +417,66 @@ def main(args_dict):
         kwargs_dict.update(read_toml("pyproject.toml"))
 
     kwargs_dict.update(dotenv_dict)
-    kwargs_dict.update(args_dict)
-    kwargs = Kwargs(**kwargs_dict)
+    # arguments which were not given on the command line do not override others.
+    kwargs_dict.update({k: v for k, v in args_dict.items() if v is not None})
+    return Kwargs(**kwargs_dict)
+
+
+def main(args_dict):
+    #######################################################
+    #   Main entry point
+    #######################################################
+
+    kwargs = _collect_kwargs(args_dict)
+    log = partial(log_output, kwargs=kwargs)
+
+    # the bundled suite is timed, cached and reported like any other.
+    if kwargs.self_bench:
+        kwargs.file_or_dir = [SUITE_DIR]
+
+    # call the session, returning its exit code.
+    if kwargs.watch:
+        run_watch(kwargs, log)
+        return 0
+    if kwargs.interpreters:
+        return run_interpreters(kwargs, log)
+    return run_session(kwargs, log)
+
+
+def main_merge(args_dict):
+    #######################################################
+    #   `speedtest merge` entry point
+    #######################################################
 
+    inputs = args_dict.pop("inputs")
+    kwargs = _collect_kwargs(args_dict)
     log = partial(log_output, kwargs=kwargs)
 
-    # call the session.
-    run_session(kwargs, log)
+    return run_merge(inputs, kwargs, log)
+
+
+def main_bisect(args_dict):
+    #######################################################
+    #   `speedtest bisect` entry point
+    #######################################################
+
+    good, bad = args_dict.pop("good"), args_dict.pop("bad")
+    threshold = args_dict.pop("threshold")
+    kwargs = _collect_kwargs(args_dict)
+    log = partial(log_output, kwargs=kwargs)
+
+    return run_bisect(good, bad, kwargs, log, threshold)
 
 
 def cli_interface():  # pragma: no cover
+    if sys.argv[1:2] == ["merge"]:
+        sys.exit(main_merge(cliargs_merge_argparser(sys.argv[2:])))
+    if sys.argv[1:2] == ["bisect"]:
+        sys.exit(main_bisect(cliargs_bisect_argparser(sys.argv[2:])))
+
     args = cliargs_argparser()
     # redundant, supports `python -m speedtest` call interface
-    main(args)
+    sys.exit(main(args))
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,237 @@
+"""Finds the first commit which made a benchmark slower, by binary search."""
+
+import contextlib
+import dataclasses
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional
+
+from speedtest._ioops import read_json
+from speedtest._kwargs import Kwargs
+from speedtest._stringify import stringify_time
+
+# the number of times a revision is re-measured while its comparison is inconclusive.
+_MAX_ROUNDS = 3
+
+# the fewest samples of each revision a comparison is made from.
+_MIN_SAMPLES = 5
+
+
+def git(*args: str, cwd: Optional[str] = None) -> str:
+    """Runs the local git binary, returning its stripped output."""
+    proc = subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"`git {' '.join(args)}` failed: {proc.stderr.strip()}")
+    return proc.stdout.strip()
+
+
+def list_commits(good: str, bad: str, cwd: Optional[str] = None) -> List[str]:
+    """Lists `good`, then every first-parent commit after it up to `bad`, in order."""
+    good_sha = git("rev-parse", "--verify", f"{good}^{{commit}}", cwd=cwd)
+    bad_sha = git("rev-parse", "--verify", f"{bad}^{{commit}}", cwd=cwd)
+    between = git(
+        "rev-list", "--first-parent", "--reverse", f"{good_sha}..{bad_sha}", cwd=cwd
+    ).split()
+    if not between:
+        raise ValueError(f"`{bad}` is not a descendant of `{good}`.")
+    return [good_sha] + between
+
+
+@contextlib.contextmanager
+def worktree(repo: str, rev: str) -> Iterator[str]:
+    """Checks out `rev` into a temporary, detached worktree of `repo`."""
+    path = tempfile.mkdtemp(prefix="speedtest-bisect-")
+    git("worktree", "add", "--detach", "--force", path, rev, cwd=repo)
+    try:
+        yield path
+    finally:
+        git("worktree", "remove", "--force", path, cwd=repo)
+
+
+def is_slower(
+    baseline: List[float], other: List[float], threshold: float = 0.05
+) -> Optional[bool]:
+    """Whether `other` is slower than `baseline` by more than `threshold`.
+
+    Timing noise only ever adds time, so `other` is slower when both its median and
+    its minimum exceed the baseline's by more than `threshold`. Unlike a test of the
+    means, this is not swayed by a few outliers on either side.
+
+    Returns
+    -------
+    bool, optional
+        True or False, or None when there are too few samples, or the medians
+        differ by more than `threshold` but the minimums do not, and more samples
+        are needed.
+    """
+    if min(len(baseline), len(other)) < _MIN_SAMPLES:
+        return None
+    if statistics.median(other) <= (1 + threshold) * statistics.median(baseline):
+        return False
+    if min(other) > (1 + threshold) * min(baseline):
+        return True
+    return None
+
+
+def _measure(
+    repo: str, rev: str, kwargs: Kwargs, outdir: str
+) -> Dict[str, List[float]]:
+    """Times the benchmarks selected by `kwargs.keyword` at `rev`.
+
+    The revision is checked out into a temporary worktree, whose root (and `src`
+    directory, if any) is put ahead of any installed copy on the PYTHONPATH of a
+    fresh interpreter, which runs the speed files of that revision.
+
+    Returns
+    -------
+    Dict[str, List[float]]
+        The time per loop of each repetition, by 'path:label'.
+    """
+    subdir = os.path.relpath(os.getcwd(), repo)
+    out_file = os.path.join(outdir, f"{rev}.json")
+    with worktree(repo, rev) as path:
+        paths = [path]
+        if os.path.isdir(os.path.join(path, "src")):
+            paths.append(os.path.join(path, "src"))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            paths + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+        )
+        cmd = [
+            sys.executable,
+            "-m",
+            "speedtest",
+            *kwargs.file_or_dir,
+            "-k",
+            kwargs.keyword or "",
+            "--nreps",
+            str(kwargs.nreps),
+            "--no-cache",
+            "--no-precheck",
+            "--quiet",
+            "--json-file",
+            out_file,
+        ]
+        if kwargs.min_time is not None:
+            cmd += ["--min-time", str(kwargs.min_time)]
+        proc = subprocess.run(
+            cmd,
+            cwd=os.path.join(path, subdir),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if not os.path.isfile(out_file):
+            raise RuntimeError(
+                f"speedtest failed at {rev[:8]}: "
+                + (proc.stderr.strip().splitlines() or ["no output"])[-1]
+            )
+
+        samples = {}
+        for file_path, items in read_json(out_file)["results"].items():
+            # name files relative to the repository, the same at every revision.
+            file_path_rel = os.path.relpath(file_path, path)
+            for label, properties in items.items():
+                if properties.get("status", "ok") == "ok":
+                    samples[f"{file_path_rel}:{label}"] = properties["samples"]
+    return samples
+
+
+def run_bisect(
+    good: str,
+    bad: str,
+    kwargs: Kwargs,
+    logger: Callable[[str], None],
+    threshold: float = 0.05,
+) -> int:
+    """Searches for the first commit between `good` and `bad` which is slower.
+
+    `good` and `bad` are any git revisions, and `kwargs.keyword` must select a
+    single benchmark. Each measured revision is compared with `good`, and is
+    re-measured while the comparison is inconclusive.
+
+    Returns
+    -------
+    int
+        The exit code; 0 if a slower commit was found, else 1.
+    """
+    if not kwargs.keyword:
+        raise ValueError("`speedtest bisect` needs a benchmark, given with -k.")
+
+    repo = git("rev-parse", "--show-toplevel")
+    commits = list_commits(good, bad, cwd=repo)
+    kwargs = dataclasses.replace(kwargs, nreps=max(kwargs.nreps, _MIN_SAMPLES))
+    logger(
+        f"bisecting `{kwargs.keyword}` across {len(commits) - 1} commits, "
+        f"{commits[0][:8]}..{commits[-1][:8]}, best of {kwargs.nreps}:\n"
+    )
+
+    samples: Dict[str, List[float]] = {}
+    name: Optional[str] = None
+
+    with tempfile.TemporaryDirectory(prefix="speedtest-bisect-") as outdir:
+
+        def measure(rev: str) -> List[float]:
+            nonlocal name
+            results = _measure(repo, rev, kwargs, outdir)
+            if len(results) != 1:
+                raise ValueError(
+                    f"-k `{kwargs.keyword}` must select exactly one benchmark, "
+                    f"but selected {len(results)} at {rev[:8]}: {sorted(results)}"
+                )
+            ((found, new),) = results.items()
+            if name is not None and found != name:
+                raise ValueError(
+                    f"-k `{kwargs.keyword}` selected `{found}` at {rev[:8]}, "
+                    f"but `{name}` before."
+                )
+            name = found
+            samples.setdefault(rev, []).extend(new)
+            return samples[rev]
+
+        def slower(rev: str) -> bool:
+            baseline, verdict = samples.get(commits[0]) or measure(commits[0]), None
+            for _ in range(_MAX_ROUNDS):
+                verdict = is_slower(baseline, measure(rev), threshold)
+                if verdict is not None:
+                    break
+                # inconclusive; add samples to both sides.
+                baseline = measure(commits[0])
+            ratio = statistics.median(samples[rev]) / statistics.median(baseline)
+            lhs_print = git("log", "-1", "--format=%h %s", rev, cwd=repo)[:60]
+            logger(
+                "{} {} per loop ({:+.1%}, {})".format(
+                    f"{lhs_print} ".ljust(kwargs.print_pad_width, "-"),
+                    stringify_time(min(samples[rev])),
+                    ratio - 1,
+                    "slower" if verdict else "not slower",
+                )
+            )
+            return bool(verdict)
+
+        if not slower(commits[-1]):
+            logger(f"\n`{bad}` is not significantly slower than `{good}`.")
+            return 1
+
+        # commits[lo] is as fast as good, and commits[hi] is slower.
+        lo, hi = 0, len(commits) - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if slower(commits[mid]):
+                hi = mid
+            else:
+                lo = mid
+
+    logger(
+        "\nfirst slower commit of {}:\n{}".format(
+            name,
+            git("log", "-1", "--format=%H%n%an%n%ad%n%n    %s", commits[hi], cwd=repo),
+        )
+    )
+    return 0
@@ -0,0 +1,201 @@
+"""Stores the cache as one JSON shard per speed file, under `.speedtest_cache/shards`.
+
+Shards are read lazily, so that a worker process only loads the shard of the file it
+times, and written atomically under a lock, so that concurrent sessions do not
+corrupt or drop each other's results. The monolithic `cache.json` of earlier
+versions is still read for files without a shard.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # not available on Windows, where writes are still atomic, but not locked.
+    fcntl = None  # type: ignore[assignment]
+
+_SHARD_DIR = "shards"
+
+# the umask of the process, read once; see _chmod_default().
+_UMASK: Optional[int] = None
+
+
+def default_cache_dir() -> str:
+    """The `.speedtest_cache` directory of the working directory."""
+    return os.path.join(os.getcwd(), ".speedtest_cache")
+
+
+def shard_name(src: str) -> str:
+    """The file name of the shard of a speed file; its name and a hash of its path."""
+    src = os.path.abspath(src)
+    digest = hashlib.sha1(src.encode("utf-8")).hexdigest()[:12]
+    stem = re.sub(r"[^\w-]+", "_", os.path.splitext(os.path.basename(src))[0])
+    return f"{stem}-{digest}.json"
+
+
+def _chmod_default(fname: str) -> None:
+    """Gives a temporary file the permissions of a file created with open().
+
+    tempfile.mkstemp() creates files readable by their owner alone, which the
+    rename into place would otherwise keep, e.g. in a cache shared by a team.
+    """
+    global _UMASK
+    if _UMASK is None:
+        # the umask can only be read by setting it.
+        _UMASK = os.umask(0)
+        os.umask(_UMASK)
+    os.chmod(fname, 0o666 & ~_UMASK)
+
+
+def write_json_atomic(data: Any, fname: str, indent: Optional[int] = None) -> None:
+    """Writes JSON to a temporary file next to `fname`, then renames it into place.
+
+    Readers see either the old or the new file, never a partial one.
+    """
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{os.path.basename(fname)}.", suffix=".tmp", dir=os.path.dirname(fname)
+    )
+    try:
+        with os.fdopen(fd, "wt", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+        _chmod_default(tmp)
+        os.replace(tmp, fname)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+@contextmanager
+def _locked(fname: str) -> Iterator[None]:
+    """Holds an exclusive lock on `fname`.lock, where file locks are available."""
+    if fcntl is None:  # pragma: no cover
+        yield
+        return
+    with open(fname + ".lock", "a", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_shard(fname: str) -> Optional[Dict[str, Any]]:
+    """Reads a shard, or None if it does not exist or is unreadable."""
+    try:
+        with open(fname, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ShardedCache(Mapping):
+    """A read-only mapping of speed files onto their cached results, loaded lazily.
+
+    Pickles as its directory alone, so that it is cheap to send to worker processes,
+    which then read only the shards they use.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self._shards: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._legacy: Optional[Dict[str, Any]] = None
+
+    def __reduce__(self):
+        return ShardedCache, (self.cache_dir,)
+
+    def _shard_dir(self) -> str:
+        return os.path.join(self.cache_dir, _SHARD_DIR)
+
+    def _legacy_cache(self) -> Dict[str, Any]:
+        if self._legacy is None:
+            self._legacy = _read_shard(os.path.join(self.cache_dir, "cache.json")) or {}
+        return self._legacy
+
+    def _shard(self, src: str) -> Optional[Dict[str, Any]]:
+        if src not in self._shards:
+            shard = _read_shard(os.path.join(self._shard_dir(), shard_name(src)))
+            self._shards[src] = shard["results"] if shard is not None else None
+        return self._shards[src]
+
+    def __getitem__(self, src: str) -> Dict[str, Any]:
+        shard = self._shard(src)
+        if shard is not None:
+            return shard
+        return self._legacy_cache()[src]
+
+    def __contains__(self, src: object) -> bool:
+        if not isinstance(src, str):
+            return False
+        return self._shard(src) is not None or src in self._legacy_cache()
+
+    def __iter__(self) -> Iterator[str]:
+        srcs = dict.fromkeys(self._legacy_cache())
+        if os.path.isdir(self._shard_dir()):
+            for fname in sorted(os.listdir(self._shard_dir())):
+                if fname.endswith(".json"):
+                    shard = _read_shard(os.path.join(self._shard_dir(), fname))
+                    if shard is not None:
+                        self._shards[shard["src"]] = shard["results"]
+                        srcs[shard["src"]] = None
+        return iter(srcs)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        shard_dir = self._shard_dir()
+        if os.path.isdir(shard_dir) and any(
+            fname.endswith(".json") for fname in os.listdir(shard_dir)
+        ):
+            return True
+        return bool(self._legacy_cache())
+
+
+def write_shards(
+    results: Dict[str, Dict[str, Any]], cache_dir: Optional[str] = None
+) -> None:
+    """Merges the results of each speed file into its shard.
+
+    The results of benchmarks which were not run, e.g. deselected using -k, are
+    kept. Each shard is updated under its lock, and written atomically.
+    """
+    cache = ShardedCache(cache_dir)
+    shard_dir = cache._shard_dir()
+    os.makedirs(shard_dir, exist_ok=True)
+    for src, items in results.items():
+        fname = os.path.join(shard_dir, shard_name(src))
+        with _locked(fname):
+            # a new shard starts from the results of the legacy cache.json, if any.
+            shard = _read_shard(fname) or {
+                "src": src,
+                "results": dict(cache._legacy_cache().get(src, {})),
+            }
+            shard["results"].update(items)
+            write_json_atomic(shard, fname)
+
+
+def clear_cache(cache_dir: Optional[str] = None) -> None:
+    """Removes every shard, and the legacy cache.json, e.g. once invalidated.
+
+    Results are otherwise merged into their shards, so that the stale results of
+    files which are not run again would outlive a new fingerprint.
+    """
+    cache = ShardedCache(cache_dir)
+    shard_dir = cache._shard_dir()
+    if os.path.isdir(shard_dir):
+        for fname in os.listdir(shard_dir):
+            if fname.endswith(".json"):
+                path = os.path.join(shard_dir, fname)
+                with _locked(path):
+                    os.remove(path)
+    legacy = os.path.join(cache.cache_dir, "cache.json")
+    if os.path.isfile(legacy):
+        os.remove(legacy)
@@ -0,0 +1,136 @@
+"""Built-in calibration kernels and system noise checks run before a session."""
+
+import glob
+import math
+import os
+import statistics
+import timeit
+from functools import partial
+from typing import Dict, List
+
+from speedtest._environment import _cpu_freq_mhz, _read_sysfile
+
+# a session is noisy if the 1-minute load average exceeds this fraction per core.
+_LOAD_PER_CORE = 0.5
+# a calibration kernel is unstable if its median exceeds its best by this fraction.
+_KERNEL_SPREAD = 0.25
+# a thermal zone is considered hot within this many degrees of its first trip point.
+_THERMAL_MARGIN_C = 5.0
+
+_COPY_BUFFER_SIZE = 8 * 1048576
+
+
+def _kernel_python_loop() -> None:
+    """Pure-Python interpreter loop."""
+    total = 0
+    for i in range(200_000):
+        total += i
+
+
+def _kernel_memcopy(src: bytearray, dst: bytearray) -> None:
+    """Copies a large buffer, bound by memory bandwidth."""
+    dst[:] = src
+
+
+def _kernel_alloc() -> None:
+    """Allocates and frees many small objects."""
+    _ = [{"i": i} for i in range(50_000)]
+
+
+def run_calibration_suite(nreps: int = 5) -> Dict[str, List[float]]:
+    """Times each built-in calibration kernel.
+
+    Returns
+    -------
+    Dict[str, List[float]]
+        Mapping of kernel name onto the seconds taken by each repeat.
+    """
+    kernels = {
+        "python_loop": _kernel_python_loop,
+        "memcopy": partial(
+            _kernel_memcopy,
+            bytearray(_COPY_BUFFER_SIZE),
+            bytearray(_COPY_BUFFER_SIZE),
+        ),
+        "alloc": _kernel_alloc,
+    }
+    suite = {}
+    for name, kernel in kernels.items():
+        # untimed call, to fault in fresh buffers and warm the allocator.
+        kernel()
+        suite[name] = timeit.Timer(kernel).repeat(repeat=nreps, number=1)
+    return suite
+
+
+def calibration_reference(suite: Dict[str, List[float]]) -> float:
+    """Geometric mean of the best time of each calibration kernel, in seconds."""
+    best = [min(times) for times in suite.values()]
+    return math.exp(sum(math.log(t) for t in best) / len(best))
+
+
+def throttle_count() -> int:
+    """Total number of thermal throttling events across all cores since boot."""
+    total = 0
+    pattern = "/sys/devices/system/cpu/cpu*/thermal_throttle/*_throttle_count"
+    for path in glob.glob(pattern):
+        value = _read_sysfile(path)
+        if value is not None and value.isdigit():
+            total += int(value)
+    return total
+
+
+def _hot_thermal_zones() -> List[str]:
+    """Lists thermal zones running within a few degrees of their first trip point."""
+    hot = []
+    for zone in sorted(glob.glob("/sys/class/thermal/thermal_zone*")):
+        temp = _read_sysfile(os.path.join(zone, "temp"))
+        trip = _read_sysfile(os.path.join(zone, "trip_point_0_temp"))
+        if not (temp and trip and temp.lstrip("-").isdigit() and trip.isdigit()):
+            continue
+        # reported in millidegrees Celsius.
+        if int(trip) > 0 and int(temp) >= int(trip) - _THERMAL_MARGIN_C * 1e3:
+            hot.append("{} at {:.0f}C".format(os.path.basename(zone), int(temp) / 1e3))
+    return hot
+
+
+def system_noise(throttles_before: int = -1) -> List[str]:
+    """Checks load average, CPU frequency scaling and thermal throttling.
+
+    Parameters
+    ----------
+    throttles_before : int, optional
+        A `throttle_count()` taken earlier; any increase since is reported.
+
+    Returns
+    -------
+    List[str]
+        Human-readable reasons why the system is noisy, empty when it is quiet.
+    """
+    reasons = []
+
+    ncores = os.cpu_count() or 1
+    if hasattr(os, "getloadavg"):
+        load = os.getloadavg()[0]
+        if load > _LOAD_PER_CORE * ncores:
+            reasons.append(f"load average {load:.2f} on {ncores} cores")
+
+    governor = _read_sysfile("/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor")
+    if governor is not None and governor != "performance":
+        cur, top = _cpu_freq_mhz("scaling_cur_freq"), _cpu_freq_mhz("cpuinfo_max_freq")
+        detail = f" ({cur:.0f}/{top:.0f} MHz)" if cur and top else ""
+        reasons.append(f"CPU frequency scaling governor '{governor}'{detail}")
+
+    if throttles_before >= 0 and throttle_count() > throttles_before:
+        reasons.append("thermal throttling occurred during calibration")
+    reasons.extend(f"thermal zone {z}" for z in _hot_thermal_zones())
+    return reasons
+
+
+def kernel_noise(suite: Dict[str, List[float]]) -> List[str]:
+    """Lists calibration kernels whose repeats are unstable."""
+    reasons = []
+    for name, times in suite.items():
+        spread = statistics.median(times) / min(times) - 1.0
+        if spread > _KERNEL_SPREAD:
+            reasons.append(f"calibration kernel '{name}' varies by {spread:.0%}")
+    return reasons
@@ -0,0 +1,156 @@
+"""Measures the import time and first-call latency of speed functions, from cold."""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from speedtest._timeout import BenchmarkTimeout
+
+# separates the output of -X importtime before and after importing the module.
+_MARKER = "--speedtest-cold-start--"
+
+# runs in a fresh interpreter; only sys and time are imported before the module,
+# so that none of its imports are already loaded.
+_CHILD = f"""
+import sys, time
+src, script_dir, name, label = sys.argv[1:5]
+sys.path.insert(0, script_dir)
+sys.stderr.write("{_MARKER}\\n")
+sys.stderr.flush()
+t0 = time.perf_counter()
+module_ = __import__(name)
+t1 = time.perf_counter()
+sys.stderr.write("{_MARKER}\\n")
+sys.stderr.flush()
+from speedtest._coldstart import first_call
+print(first_call(module_, src, label, t1 - t0))
+"""
+
+_IMPORTTIME = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\S.*)$")
+
+
+def first_call(module_, src: str, label: str, import_time: float) -> str:
+    """Times the first call of a case in a freshly imported module.
+
+    Called within the child interpreter, after the module has been imported.
+
+    Returns
+    -------
+    str
+        JSON of the import time and first-call latency, in seconds.
+    """
+    from speedtest._processor import _iter_cases
+    from speedtest._speedtree import parse_python_to_tree
+
+    for method in parse_python_to_tree(Path(src)).methods:
+        if not label.startswith(method.name):
+            continue
+        for case in _iter_cases(module_, method, select=label.__eq__):
+            args, kwargs = case.inputs() if case.inputs else ((), {})
+            t0 = time.perf_counter()
+            case.func(*args, **kwargs)
+            t1 = time.perf_counter()
+            return json.dumps({"import": import_time, "first_call": t1 - t0})
+    raise LookupError(f"speed function `{label}` not found in '{src}'.")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, float, float]]:
+    """Parses -X importtime output, after the marker, into (module, self, cumulative).
+
+    Times are in seconds.
+    """
+    sections = stderr.split(_MARKER)
+    lines = sections[1] if len(sections) > 1 else stderr
+    imports = []
+    for line in lines.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, name = match.groups()
+            imports.append(
+                (name.strip(), int(self_us) * 1e-6, int(cumulative_us) * 1e-6)
+            )
+    return imports
+
+
+def measure_cold_start(
+    src: str, label: str, nsamples: int = 3, timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Measures a case in a fresh interpreter per sample.
+
+    Parameters
+    ----------
+    src : str
+        Path to the speed file.
+    label : str
+        The label of the case, including any parameters.
+    nsamples : int
+        The number of fresh interpreters to start.
+    timeout : float, optional
+        Time limit of each interpreter, in seconds.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The median "import" time and "first_call" latency in seconds, each
+        interpreter's "samples", and the slowest "imports" as (module, self,
+        cumulative) seconds, by median cumulative time.
+    """
+    script_dir = os.path.dirname(os.path.abspath(src))
+    name = os.path.splitext(os.path.basename(src))[0]
+
+    samples = []
+    import_times: Dict[str, List[Tuple[float, float]]] = {}
+    for _ in range(nsamples):
+        try:
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    "-X",
+                    "importtime",
+                    "-c",
+                    _CHILD,
+                    src,
+                    script_dir,
+                    name,
+                    label,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise BenchmarkTimeout(f"{timeout:.3g} sec") from None
+        if proc.returncode != 0:
+            raise RuntimeError(
+                proc.stderr.strip().splitlines()[-1]
+                if proc.stderr.strip()
+                else f"exit code {proc.returncode}"
+            )
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        for module, self_time, cumulative in parse_importtime(proc.stderr):
+            if module != name:
+                import_times.setdefault(module, []).append((self_time, cumulative))
+
+    imports = sorted(
+        (
+            (
+                module,
+                statistics.median(t[0] for t in times),
+                statistics.median(t[1] for t in times),
+            )
+            for module, times in import_times.items()
+        ),
+        key=lambda m: -m[2],
+    )
+    return {
+        "import": statistics.median(s["import"] for s in samples),
+        "first_call": statistics.median(s["first_call"] for s in samples),
+        "samples": samples,
+        "imports": [list(m) for m in imports[:5]],
+    }
@@ -0,0 +1,135 @@
+"""Provides a datafile() fixture factory for large, generated benchmark inputs."""
+
+import hashlib
+import inspect
+import mmap
+import os
+import tempfile
+from typing import Any, Callable, Dict, Optional
+
+from speedtest._cache import _chmod_default, _locked, default_cache_dir
+
+
+def _source_hash(func: Callable) -> str:
+    """Hashes the source of a generator, else its bytecode if it has no source."""
+    try:
+        source = inspect.getsource(func).encode("utf-8")
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    return hashlib.sha1(source).hexdigest()
+
+
+class DataFile:
+    """A fixture serving the output of a seeded generator from a cached file.
+
+    The generator runs once, and its output is stored under `.speedtest_cache/data`
+    keyed by a hash of its source, seed and arguments. Each process then maps the
+    file read-only, so that parallel workers share it through the page cache.
+    """
+
+    def __init__(self, func: Callable, seed: int, params: Dict[str, Any]):
+        self.func = func
+        self.seed = seed
+        self.params = params
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+        self.__wrapped__ = func
+        self._view: Optional[Any] = None
+
+    def key(self) -> str:
+        """The hash of the generator's source, seed and arguments."""
+        digest = hashlib.sha1(_source_hash(self.func).encode("utf-8"))
+        digest.update(repr((self.seed, sorted(self.params.items()))).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def path(self, cache_dir: Optional[str] = None) -> str:
+        """The data file, which exists once generated, as .npy or raw bytes."""
+        data_dir = os.path.join(cache_dir or default_cache_dir(), "data")
+        stem = os.path.join(data_dir, f"{self.func.__name__}-{self.key()}")
+        if os.path.isfile(stem + ".npy"):
+            return stem + ".npy"
+        return stem + ".bin"
+
+    def generate(self, cache_dir: Optional[str] = None) -> str:
+        """Runs the generator, unless its file already exists, returning the file.
+
+        Generation happens under a lock, so that concurrent workers wait for the
+        first to finish instead of generating the data again. A generator taking a
+        `path` argument writes the file itself; else it returns bytes, a string, or
+        a numpy array.
+        """
+        fname = self.path(cache_dir)
+        if os.path.isfile(fname):
+            return fname
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        stem = os.path.splitext(fname)[0]
+        with _locked(stem):
+            fname = self.path(cache_dir)
+            if os.path.isfile(fname):
+                return fname
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".{os.path.basename(stem)}.", dir=os.path.dirname(stem)
+            )
+            os.close(fd)
+            try:
+                fname = self._write(tmp, stem)
+            except BaseException:
+                os.remove(tmp)
+                raise
+        return fname
+
+    def _write(self, tmp: str, stem: str) -> str:
+        """Writes the generator's output into `tmp`, then renames it into place."""
+        if "path" in inspect.signature(self.func).parameters:
+            self.func(path=tmp, seed=self.seed, **self.params)
+            data = None
+        else:
+            data = self.func(seed=self.seed, **self.params)
+
+        suffix = ".bin"
+        if data is not None and hasattr(data, "__array__") and hasattr(data, "dtype"):
+            import numpy
+
+            with open(tmp, "wb") as f:
+                numpy.save(f, data, allow_pickle=False)
+            suffix = ".npy"
+        elif data is not None:
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            with open(tmp, "wb") as f:
+                f.write(data)
+        _chmod_default(tmp)
+        os.replace(tmp, stem + suffix)
+        return stem + suffix
+
+    def __call__(self) -> Any:
+        """A read-only view of the data; a numpy.memmap or an mmap.mmap."""
+        if self._view is None:
+            fname = self.generate()
+            if fname.endswith(".npy"):
+                import numpy
+
+                self._view = numpy.load(fname, mmap_mode="r")
+            elif os.path.getsize(fname) == 0:
+                self._view = b""
+            else:
+                with open(fname, "rb") as f:
+                    self._view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._view
+
+
+def datafile(func: Optional[Callable] = None, *, seed: int = 0, **params: Any):
+    """@speedtest.datafile(seed=0, **params). Declares a fixture of generated data.
+
+    The generator is called as `func(seed=seed, **params)`, once across sessions,
+    and returns bytes, a string or a numpy array; or with a `path` argument, writes
+    the file itself. Speed functions receive a read-only mmap.mmap, or numpy.memmap
+    for arrays. The data is regenerated when the generator's source, seed or
+    arguments change."""
+
+    def decorator(f: Callable) -> DataFile:
+        return DataFile(f, seed, params)
+
+    if func is None:
+        return decorator
+    return decorator(func)
@@ -1,38 +1,305 @@
 """Provides a parametrize() decorator for running multiple speed-tests."""
 
-from typing import Any, Callable, Union, Tuple, List
+import importlib
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union, Tuple, List
 from functools import partial
 
+from speedtest._stringify import parse_time
 
-def parametrize(argnames: str, argvalues: List[Union[Any, Tuple[Any, ...]]]):
-    """Wraps a speed_ function with a parameter."""
+
+class _ParamBlock:
+    """The rows of values of one or more zipped argument names."""
+
+    def __init__(
+        self,
+        names: List[str],
+        rows: List[Tuple[Any, ...]],
+        ids: Optional[List[str]] = None,
+    ):
+        self.names = names
+        self.rows = rows
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def zip(self, other: "_ParamBlock") -> "_ParamBlock":
+        """Pairs the rows of two blocks of equal length."""
+        if len(self) != len(other):
+            raise ValueError(
+                f"cannot zip parameters {self.names} and {other.names} of "
+                f"lengths {len(self)} and {len(other)}."
+            )
+        ids = None
+        if self.ids is not None or other.ids is not None:
+            ids = [
+                "-".join(i for i in pair if i is not None)
+                for pair in zip(
+                    self.ids or [None] * len(self), other.ids or [None] * len(other)
+                )
+            ]
+        return _ParamBlock(
+            self.names + other.names,
+            [a + b for a, b in zip(self.rows, other.rows)],
+            ids,
+        )
+
+
+def _load_grid(module: str, qualname: str) -> "ParamGrid":
+    """Finds a parameter grid by name, when unpickling."""
+    obj = importlib.import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _load_case(module: str, qualname: str, index: int) -> "ParamCase":
+    """Rebuilds a case of a parameter grid from its index, when unpickling."""
+    return _load_grid(module, qualname)[index]
+
+
+class ParamCase(partial):
+    """A single parametrized call of a speed function, from a ParamGrid.
+
+    Pickles by reference to its grid and index, so that cases can be sent to
+    worker processes individually.
+    """
+
+    grid: "ParamGrid"
+    index: int
+    case_id: Optional[str]
+
+    def __reduce__(self):
+        return _load_case, (self.grid.module, self.grid.qualname, self.index)
+
+
+class ParamGrid:
+    """A lazy grid of the parametrized cases of a speed function.
+
+    Cases are the cartesian product of the blocks of parameters from stacked
+    parametrize() decorators, with the outermost decorator varying slowest. Only
+    the values of each block are stored, and each case is built on demand, so
+    that large grids can be indexed, filtered and iterated repeatedly without
+    being materialized.
+    """
+
+    def __init__(self, func: Callable, blocks: List[_ParamBlock]):
+        self.func = func
+        self.blocks = blocks
+        self.annotations: Dict[str, Any] = {}
+        self.module = func.__module__
+        self.qualname = func.__qualname__
+
+    def __len__(self) -> int:
+        return math.prod(len(block) for block in self.blocks)
+
+    def _rows(self, index: int) -> List[int]:
+        """Converts a case index into the row of each block, as a mixed radix."""
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"case {index} out of range for {len(self)} cases.")
+        index %= len(self)
+        rows = []
+        for block in reversed(self.blocks):
+            index, row = divmod(index, len(block))
+            rows.append(row)
+        return rows[::-1]
+
+    def params(self, index: int) -> Dict[str, Any]:
+        """The keyword arguments of a case, without building the case itself."""
+        params: Dict[str, Any] = {}
+        for block, row in zip(self.blocks, self._rows(index)):
+            params.update(zip(block.names, block.rows[row]))
+        return params
+
+    def case_id(self, index: int) -> Optional[str]:
+        """The label of a case from `ids=`, or None if no ids were given."""
+        if all(block.ids is None for block in self.blocks):
+            return None
+        labels = []
+        for block, row in zip(self.blocks, self._rows(index)):
+            if block.ids is not None:
+                labels.append(block.ids[row])
+            else:
+                labels.append(
+                    ",".join(f"{k}={v}" for k, v in zip(block.names, block.rows[row]))
+                )
+        return "-".join(labels)
+
+    def __getitem__(self, index: int) -> ParamCase:
+        case = ParamCase(self.func, **self.params(index))
+        case.grid = self
+        case.index = index % len(self)
+        case.case_id = self.case_id(index)
+        for attr, value in self.annotations.items():
+            setattr(case, attr, value)
+        return case
+
+    def __iter__(self) -> Iterator[ParamCase]:
+        return (self[i] for i in range(len(self)))
+
+    def __reduce__(self):
+        return _load_grid, (self.module, self.qualname)
+
+
+def parametrize(
+    argnames: str,
+    argvalues: Iterable[Union[Any, Tuple[Any, ...]]],
+    ids: Optional[Union[List[str], Callable[[Any], str]]] = None,
+    mode: str = "product",
+):
+    """Wraps a speed_ function with a parameter.
+
+    Stacked decorators form the cartesian product of their parameters, or with
+    `mode="zip"`, are paired element-wise with the decorator directly beneath.
+    `ids` labels each value, either as a list or a function of each value.
+    """
+    if mode not in ("product", "zip"):
+        raise ValueError(f"mode `{mode}` must be 'product' or 'zip'.")
 
     # split argnames into multiple if we can.
     arg_name_list = [s.strip() for s in argnames.split(",")]
 
-    def decorator(func: Callable):
-        # define our parameters, wrap with partial and return?
-        for args in argvalues:
-            if isinstance(args, (list, tuple)):
-                params = dict(zip(arg_name_list, args))
-            else:
-                params = {arg_name_list[0]: args}
+    rows = []
+    values = list(argvalues)
+    for args in values:
+        if len(arg_name_list) > 1 and isinstance(args, (list, tuple)):
+            rows.append(tuple(args))
+        else:
+            rows.append((args,))
 
-            # return the function wrapped in partial params.
-            yield partial(func, **params)
+    if callable(ids):
+        ids = [str(ids(v)) for v in values]
+    elif ids is not None:
+        ids = [str(i) for i in ids]
+        if len(ids) != len(rows):
+            raise ValueError(f"expected {len(rows)} ids, got {len(ids)}.")
+    block = _ParamBlock(arg_name_list, rows, ids)
+
+    def decorator(func: Union[Callable, ParamGrid]) -> ParamGrid:
+        if not isinstance(func, ParamGrid):
+            return ParamGrid(func, [block])
+
+        # stacked on another parametrize(); this decorator varies slowest.
+        if mode == "zip":
+            blocks = [block.zip(func.blocks[0])] + func.blocks[1:]
+        else:
+            blocks = [block] + func.blocks
+        grid = ParamGrid(func.func, blocks)
+        grid.annotations.update(func.annotations)
+        return grid
 
     return decorator
 
 
-def fixture(func: Callable):
+def fixture(func: Optional[Callable] = None, *, scope: str = "function"):
     """@speedtest.fixture. Declares method as a fixture for use in speedtesting.
 
-    Does nothing apart from inform AST."""
-    return func  # pragma: no cover
+    By default a fixture is called once per speed function. With
+    `@speedtest.fixture(scope="iteration")` it is called before every call instead,
+    outside of the timing, for speed functions which mutate their inputs."""
+    if scope not in ("function", "iteration"):
+        raise ValueError(f"scope `{scope}` must be 'function' or 'iteration'.")
+
+    def decorator(f: Callable) -> Callable:
+        f.__speedtest_scope__ = scope
+        return f
+
+    if func is None:
+        return decorator
+    return decorator(func)
 
 
-def mark(func: Callable):
+def mark(func: Optional[Callable] = None, *, line_profile: Optional[List[str]] = None):
     """@speedtest.mark. Marks the method for speedtesting even if it isn't called speed_*.
 
-    Does nothing apart from inform AST."""
-    return func  # pragma: no cover
+    @speedtest.mark(line_profile=["mypkg.module.func"]) also times each line of the
+    named functions during one untimed call; an empty list times the speed function
+    itself. Otherwise does nothing apart from inform AST."""
+    if func is not None:
+        return func  # pragma: no cover
+    return _annotator("__speedtest_line_profile__", line_profile)
+
+
+def group(name: str, baseline: bool = False):
+    """@speedtest.group(name, baseline=False). Groups competing implementations.
+
+    Members of a group are timed in interleaved rounds, and ranked by their speedup
+    relative to the baseline member. Does nothing apart from inform AST."""
+
+    def decorator(func: Callable):
+        return func  # pragma: no cover
+
+    return decorator
+
+
+@dataclass
+class Work:
+    """The amount of work done by one call of a speed function.
+
+    Return an instance from a speed function to report its throughput.
+    """
+
+    items: Optional[int] = None
+    bytes: Optional[int] = None
+
+
+def throughput(
+    items: Optional[Union[int, str]] = None, bytes: Optional[Union[int, str]] = None
+):
+    """@speedtest.throughput(items=..., bytes=...). Declares the work done per call.
+
+    Each argument is either a fixed count, or the name of a parameter from
+    parametrize() whose value (or length) is the count for that case."""
+
+    return _annotator("__speedtest_throughput__", {"items": items, "bytes": bytes})
+
+
+def timeout(limit: Union[str, float]):
+    """@speedtest.timeout("30s"). Kills the benchmark if it runs for longer than limit.
+
+    The limit is either a number of seconds, or a string such as '500ms' or '2m'."""
+
+    return _annotator("__speedtest_timeout__", parse_time(limit))
+
+
+def limit(
+    max_time: Optional[Union[str, float]] = None,
+    max_memory: Optional[Union[str, float]] = None,
+):
+    """@speedtest.limit(max_time="5ms", max_memory="50MB"). Declares a performance budget.
+
+    A session exits with a non-zero code if the time per loop, or the peak memory
+    allocated by one call, exceeds its limit."""
+
+    return _annotator(
+        "__speedtest_limit__", {"max_time": max_time, "max_memory": max_memory}
+    )
+
+
+def setup(func: Callable[..., Any]):
+    """@speedtest.setup(fn). Rebuilds the inputs of a speed function before every call.
+
+    `fn` is called outside of the timing, and returns a dict of keyword arguments, a
+    tuple of positional arguments, a single argument or None. It may accept any of
+    the parameters from parametrize() by name."""
+
+    return _annotator("__speedtest_setup__", func)
+
+
+def _annotator(attr: str, value: Any):
+    """Creates a decorator which attaches `value` to a function as `attr`."""
+
+    def annotate(func: Callable) -> Callable:
+        setattr(func, attr, value)
+        return func
+
+    def decorator(func):
+        # applied on top of parametrize(), annotate each parametrized case.
+        if isinstance(func, ParamGrid):
+            func.annotations[attr] = value
+            return func
+        return annotate(func)
+
+    return decorator
@@ -0,0 +1,162 @@
+"""Collects a fingerprint of the machine and interpreter running the speedtest."""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import platform
+import subprocess
+import sys
+import sysconfig
+from typing import Any, Dict, Iterable, List, Optional
+
+# fingerprint fields which change between otherwise identical runs, these are
+# recorded but never invalidate cached calibration.
+_VOLATILE_KEYS = ("cpu_freq_mhz", "git_commit", "executable", "calibration", "noise")
+
+
+def _read_sysfile(path: str) -> Optional[str]:
+    """Reads a small /proc or /sys file, returning None if it is unavailable."""
+    try:
+        with open(path, "rt", encoding="utf-8") as sysfile:
+            return sysfile.read().strip()
+    except OSError:
+        return None
+
+
+def _cpu_model() -> str:
+    """Extracts the CPU model name from /proc/cpuinfo."""
+    cpuinfo = _read_sysfile("/proc/cpuinfo")
+    if cpuinfo:
+        for line in cpuinfo.splitlines():
+            if line.startswith(("model name", "Hardware", "Model")):
+                return line.split(":", 1)[-1].strip()
+    return platform.processor() or platform.machine()
+
+
+def _cpu_freq_mhz(name: str) -> Optional[float]:
+    """Reads a cpufreq property of the first core, in MHz."""
+    value = _read_sysfile(f"/sys/devices/system/cpu/cpu0/cpufreq/{name}")
+    if value is None or not value.isdigit():
+        return None
+    # cpufreq reports in kHz.
+    return int(value) / 1e3
+
+
+def _memory_total() -> Optional[int]:
+    """Total physical memory in bytes."""
+    meminfo = _read_sysfile("/proc/meminfo")
+    if meminfo:
+        for line in meminfo.splitlines():
+            if line.startswith("MemTotal:"):
+                return int(line.split()[1]) * 1024
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):  # pragma: no cover
+        return None
+
+
+def _git_commit() -> Optional[str]:
+    """The git commit of the current working directory, if any."""
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+def _package_versions(modules: Iterable[str]) -> Dict[str, str]:
+    """Maps module (or distribution) names onto their installed distribution versions."""
+    top_level = {m.split(".", 1)[0] for m in modules}
+    try:
+        mapping = importlib.metadata.packages_distributions()
+    except AttributeError:  # pragma: no cover
+        mapping = {}
+    stdlib = getattr(sys, "stdlib_module_names", frozenset())
+
+    versions = {}
+    for name in sorted(top_level):
+        dists = mapping.get(name)
+        # names that are not importable modules may already be distribution names.
+        if dists is None:
+            dists = [] if name in stdlib or name.startswith("_") else [name]
+        for dist in dists:
+            try:
+                versions[dist] = importlib.metadata.version(dist)
+            except importlib.metadata.PackageNotFoundError:  # pragma: no cover
+                continue
+    return versions
+
+
+def collect_fingerprint(modules: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Collects a fingerprint of the current environment.
+
+    Parameters
+    ----------
+    modules : Iterable[str], optional
+        Module or distribution names whose installed versions are recorded. By
+        default, every module imported into the current interpreter is used.
+        Names which are not installed distributions are ignored.
+
+    Returns
+    -------
+    Dict[str, Any]
+        JSON-serializable description of the interpreter, machine and project.
+    """
+    if modules is None:
+        modules = list(sys.modules)
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "build": " ".join(platform.python_build()),
+        "compiler": platform.python_compiler(),
+        "gil_disabled": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+        "executable": sys.executable,
+        "platform": platform.platform(),
+        "cpu_model": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "cpu_governor": _read_sysfile(
+            "/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor"
+        ),
+        "cpu_max_freq_mhz": _cpu_freq_mhz("cpuinfo_max_freq"),
+        "cpu_freq_mhz": _cpu_freq_mhz("scaling_cur_freq"),
+        "memory_total": _memory_total(),
+        "packages": _package_versions(modules),
+        "git_commit": _git_commit(),
+    }
+
+
+def fingerprint_diff(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Lists the fingerprint fields that differ between two environments.
+
+    Volatile fields, such as the current frequency, git commit or calibration
+    timings, are ignored.
+    Packages are only compared when they are recorded in both fingerprints.
+    """
+    changed = []
+    for key in new:
+        if key in _VOLATILE_KEYS or key == "packages":
+            continue
+        if old.get(key) != new[key]:
+            changed.append(key)
+
+    old_packages = old.get("packages", {})
+    new_packages = new.get("packages", {})
+    for name in sorted(set(old_packages) & set(new_packages)):
+        if old_packages[name] != new_packages[name]:
+            changed.append(f"packages[{name}]")
+    return changed
+
+
+def fingerprint_id(fingerprint: Dict[str, Any]) -> str:
+    """Generates a short, stable identifier of the non-volatile fingerprint fields."""
+    stable = {k: v for k, v in fingerprint.items() if k not in _VOLATILE_KEYS}
+    payload = json.dumps(stable, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
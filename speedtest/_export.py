@@ -0,0 +1,416 @@
+"""Exports results to the formats of other benchmarking and CI tools.
+
+Every exporter streams one benchmark at a time from the cache into its file, rather
+than building the whole table in memory first.
+"""
+
+import csv
+import datetime
+import importlib
+import json
+import os
+import platform
+import statistics
+import warnings
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from speedtest._ioops import _get_cache_file_name
+
+# columns of the CSV, Parquet and Arrow tables, besides the `param__` columns. The
+# first four are those of the original CSV table; see table_columns().
+COLUMNS = [
+    "filepath",
+    "function_name",
+    "nloops",
+    "time_taken_ms",
+    "items_per_sec",
+    "bytes_per_sec",
+    "label",
+    "status",
+    "nreps",
+    "mean_ms",
+    "stdev_ms",
+    "peak_memory_bytes",
+    "profile",
+    "violations",
+    "instructions",
+    "calls",
+]
+
+# the number of columns of the original CSV table, which the `param__` columns follow.
+_ORIGINAL_COLUMNS = 4
+
+# the number of rows written per Parquet or Arrow record batch.
+_BATCH_SIZE = 1024
+
+
+def table_columns(params: List[str]) -> List[str]:
+    """The columns of a table, in order; the original columns and `params` come first,
+    where the original CSV table had them, and newer columns are appended."""
+    return COLUMNS[:_ORIGINAL_COLUMNS] + params + COLUMNS[_ORIGINAL_COLUMNS:]
+
+
+def iter_results(
+    writable_speedtest_cache: Dict[str, Any],
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Yields the (relative path, label, properties) of each benchmark."""
+    for file_path, items in writable_speedtest_cache.items():
+        file_path_rel = os.path.relpath(file_path)
+        for label, properties in items.items():
+            yield file_path_rel, label, properties
+
+
+def param_columns(writable_speedtest_cache: Dict[str, Any]) -> List[str]:
+    """Lists the unique `param__` keys of all benchmarks, sorted."""
+    return sorted(
+        {
+            key
+            for items in writable_speedtest_cache.values()
+            for properties in items.values()
+            for key in properties
+            if key.startswith("param__")
+        }
+    )
+
+
+def _samples(properties: Dict[str, Any]) -> List[float]:
+    """The time per loop of each repetition, or the best time of older results."""
+    if properties.get("samples"):
+        return properties["samples"]
+    return [properties["score"]] if properties.get("score") else []
+
+
+def iter_rows(
+    writable_speedtest_cache: Dict[str, Any], params: List[str]
+) -> Iterator[Dict[str, Any]]:
+    """Yields a flat row per benchmark, keyed by COLUMNS and `params`."""
+    for file_path_rel, label, properties in iter_results(writable_speedtest_cache):
+        samples = _samples(properties)
+        row = {
+            "filepath": file_path_rel,
+            # strip any [] brackets from the func name.
+            "function_name": label.split("[", 1)[0],
+            "nloops": properties.get("nloops"),
+            "time_taken_ms": properties.get("score", 0) * 1e3,
+            "items_per_sec": properties.get("items_per_sec"),
+            "bytes_per_sec": properties.get("bytes_per_sec"),
+            "label": label,
+            "status": properties.get("status", "ok"),
+            "nreps": len(samples),
+            "mean_ms": statistics.fmean(samples) * 1e3 if samples else None,
+            "stdev_ms": statistics.stdev(samples) * 1e3 if len(samples) > 1 else None,
+            "peak_memory_bytes": properties.get("peak_memory"),
+            "profile": properties.get("profile"),
+            "violations": "; ".join(properties.get("violations", [])) or None,
+            "instructions": properties.get("instructions"),
+            "calls": properties.get("calls"),
+        }
+        row.update({p: properties.get(p) for p in params})
+        yield row
+
+
+def write_csv(
+    writable_speedtest_cache: Dict[str, Any], fname: Optional[str] = None
+) -> str:
+    """Creates a CSV file, with a row per benchmark."""
+    cche_file = fname if fname is not None else _get_cache_file_name("run", ".csv")
+    params = param_columns(writable_speedtest_cache)
+
+    with open(os.path.join(os.getcwd(), cche_file), "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=table_columns(params))
+        writer.writeheader()
+        writer.writerows(iter_rows(writable_speedtest_cache, params))
+    return cche_file
+
+
+def _stream_json(
+    fid: TextIO, header: Dict[str, Any], key: str, items: Iterable[Any]
+) -> None:
+    """Writes `header` as a JSON object, with a list at `key` streamed from `items`."""
+    fid.write("{\n")
+    for k, v in header.items():
+        fid.write(f"  {json.dumps(k)}: {json.dumps(v)},\n")
+    fid.write(f"  {json.dumps(key)}: [")
+    for i, item in enumerate(items):
+        fid.write(("," if i else "") + "\n    " + json.dumps(item))
+    fid.write("\n  ]\n}\n")
+
+
+def _pyperf_benchmarks(
+    writable_speedtest_cache: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    """Yields each timed benchmark as a pyperf benchmark of one run."""
+    for file_path_rel, label, properties in iter_results(writable_speedtest_cache):
+        samples = _samples(properties)
+        if properties.get("status", "ok") != "ok" or not samples:
+            continue
+        metadata = {
+            "name": f"{file_path_rel}:{label}",
+            "unit": "second",
+            "loops": properties["nloops"],
+        }
+        if properties.get("profile"):
+            metadata["speedtest_profile"] = properties["profile"]
+        yield {"metadata": metadata, "runs": [{"values": samples}]}
+
+
+def write_pyperf(
+    writable_speedtest_cache: Dict[str, Any],
+    fingerprint: Optional[Dict[str, Any]] = None,
+    fname: Optional[str] = None,
+) -> str:
+    """Creates a pyperf-compatible JSON file, readable by `pyperf compare_to`.
+
+    Each benchmark holds a single run, whose values are the time per loop of each
+    repetition. Benchmarks which were not timed are left out.
+    """
+    cche_file = fname if fname is not None else _get_cache_file_name("pyperf", ".json")
+    fingerprint = fingerprint or {}
+    metadata = {
+        "python_version": fingerprint.get("python", platform.python_version()),
+        "python_implementation": fingerprint.get(
+            "implementation", platform.python_implementation()
+        ),
+        "platform": fingerprint.get("platform", platform.platform()),
+        "hostname": platform.node(),
+        "cpu_count": fingerprint.get("cpu_count", os.cpu_count()),
+    }
+    if fingerprint.get("cpu_model"):
+        metadata["cpu_model_name"] = fingerprint["cpu_model"]
+
+    with open(os.path.join(os.getcwd(), cche_file), "wt", encoding="utf-8") as jfile:
+        _stream_json(
+            jfile,
+            {"version": "1.0", "metadata": metadata},
+            "benchmarks",
+            _pyperf_benchmarks(writable_speedtest_cache),
+        )
+    return cche_file
+
+
+def _gbench_benchmarks(
+    writable_speedtest_cache: Dict[str, Any], clock: str = "wall"
+) -> Iterator[Dict[str, Any]]:
+    """Yields a Google Benchmark run per repetition, then the aggregates."""
+    # the wall clock is reported as `real_time`, the CPU-time clocks as `cpu_time`.
+    field = "real_time" if clock == "wall" else "cpu_time"
+    for file_path_rel, label, properties in iter_results(writable_speedtest_cache):
+        name = f"{file_path_rel}:{label}"
+        common = {
+            "name": name,
+            "run_name": name,
+            "threads": 1,
+            "iterations": properties.get("nloops", 0),
+            "time_unit": "ns",
+        }
+        if properties.get("status", "ok") != "ok":
+            yield dict(
+                common,
+                run_type="iteration",
+                error_occurred=True,
+                error_message=properties["status"],
+            )
+            continue
+
+        counters = {
+            f"{key}_per_second": properties[f"{key}_per_sec"]
+            for key in ("items", "bytes")
+            if properties.get(f"{key}_per_sec") is not None
+        }
+        samples = _samples(properties)
+        for i, sample in enumerate(samples):
+            yield dict(
+                common,
+                run_type="iteration",
+                repetitions=len(samples),
+                repetition_index=i,
+                **{field: sample * 1e9},
+                **counters,
+            )
+        if len(samples) > 1:
+            aggregates = {
+                "mean": statistics.fmean(samples),
+                "median": statistics.median(samples),
+                "stddev": statistics.stdev(samples),
+            }
+            for aggregate, value in aggregates.items():
+                yield dict(
+                    common,
+                    name=f"{name}_{aggregate}",
+                    run_type="aggregate",
+                    repetitions=len(samples),
+                    aggregate_name=aggregate,
+                    aggregate_unit="time",
+                    **{field: value * 1e9},
+                    **counters,
+                )
+
+
+def write_gbench(
+    writable_speedtest_cache: Dict[str, Any],
+    fingerprint: Optional[Dict[str, Any]] = None,
+    fname: Optional[str] = None,
+    clock: str = "wall",
+) -> str:
+    """Creates a Google Benchmark JSON file, readable by its `compare.py`.
+
+    Times are reported as `real_time` when measured with the wall clock, else as
+    `cpu_time` for the process or thread clock, given by --clock; the clock is also
+    recorded in the context. Benchmarks which were not timed are reported as errors.
+    """
+    cche_file = fname if fname is not None else _get_cache_file_name("gbench", ".json")
+    fingerprint = fingerprint or {}
+    context = {
+        "date": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "host_name": platform.node(),
+        "executable": fingerprint.get("executable", ""),
+        "num_cpus": fingerprint.get("cpu_count", os.cpu_count()),
+        "mhz_per_cpu": int(fingerprint.get("cpu_max_freq_mhz") or 0),
+        "caches": [],
+        "speedtest_clock": clock,
+    }
+
+    with open(os.path.join(os.getcwd(), cche_file), "wt", encoding="utf-8") as jfile:
+        _stream_json(
+            jfile,
+            {"context": context},
+            "benchmarks",
+            _gbench_benchmarks(writable_speedtest_cache, clock),
+        )
+    return cche_file
+
+
+def _junit_testcase(
+    classname: str, label: str, properties: Dict[str, Any]
+) -> Tuple[str, str]:
+    """Renders a benchmark as a JUnit <testcase>, with the kind of any failure."""
+    status = properties.get("status", "ok")
+    timed = sum(_samples(properties)) * properties.get("nloops", 0)
+    head = (
+        f"    <testcase classname={quoteattr(classname)} name={quoteattr(label)}"
+        f' time="{timed:.6f}"'
+    )
+    if status == "skipped":
+        return (
+            "skipped",
+            f'{head}>\n      <skipped message="not run"/>\n    </testcase>',
+        )
+    if status in ("failed", "timeout"):
+        return (
+            "error",
+            f'{head}>\n      <error type="{status}" message="{status}"/>\n'
+            "    </testcase>",
+        )
+    if properties.get("violations"):
+        violations = properties["violations"]
+        return (
+            "failure",
+            f'{head}>\n      <failure type="limit" message={quoteattr(violations[0])}>'
+            f"{escape(chr(10).join(violations))}</failure>\n    </testcase>",
+        )
+    return "ok", f"{head}/>"
+
+
+def write_junit(
+    writable_speedtest_cache: Dict[str, Any], fname: Optional[str] = None
+) -> str:
+    """Creates a JUnit XML file, with a testcase per benchmark and a suite per file.
+
+    Benchmarks exceeding their limits are failures, benchmarks which failed or timed
+    out are errors, and those skipped by the session budget are skipped.
+    """
+    cche_file = fname if fname is not None else _get_cache_file_name("junit", ".xml")
+
+    with open(os.path.join(os.getcwd(), cche_file), "wt", encoding="utf-8") as xfile:
+        xfile.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        xfile.write('<testsuites name="speedtest">\n')
+        for file_path, items in writable_speedtest_cache.items():
+            file_path_rel = os.path.relpath(file_path)
+            classname = os.path.splitext(file_path_rel)[0].replace(os.sep, ".")
+            # a suite is rendered whole, so its counts precede its testcases.
+            cases = [
+                _junit_testcase(classname, label, properties)
+                for label, properties in items.items()
+            ]
+            counts = {
+                kind: sum(1 for k, _ in cases if k == kind)
+                for kind in ("failure", "error", "skipped")
+            }
+            xfile.write(
+                f'  <testsuite name={quoteattr(file_path_rel)} tests="{len(cases)}"'
+                f' failures="{counts["failure"]}" errors="{counts["error"]}"'
+                f' skipped="{counts["skipped"]}">\n'
+            )
+            for _, testcase in cases:
+                xfile.write(testcase + "\n")
+            xfile.write("  </testsuite>\n")
+        xfile.write("</testsuites>\n")
+    return cche_file
+
+
+def write_arrow(
+    writable_speedtest_cache: Dict[str, Any],
+    fmt: str = "parquet",
+    fname: Optional[str] = None,
+) -> Optional[str]:
+    """Creates a Parquet or Arrow IPC file, if `pyarrow` is installed.
+
+    Rows are written in record batches. `param__` columns are stored as strings, as
+    their types may differ between benchmarks.
+
+    Returns
+    -------
+    str, optional
+        The file name, or None if `pyarrow` is not installed.
+    """
+    try:
+        pa = importlib.import_module("pyarrow")
+        pq = importlib.import_module("pyarrow.parquet") if fmt == "parquet" else None
+    except ImportError:
+        warnings.warn(
+            f"`pyarrow` is required to write {fmt} output; install it with "
+            "`pip install pyarrow`.",
+            UserWarning,
+        )
+        return None
+
+    cche_file = fname if fname is not None else _get_cache_file_name("run", f".{fmt}")
+    params = param_columns(writable_speedtest_cache)
+    types = {
+        "nloops": pa.int64(),
+        "nreps": pa.int64(),
+        "peak_memory_bytes": pa.int64(),
+        "instructions": pa.int64(),
+        "calls": pa.int64(),
+        "time_taken_ms": pa.float64(),
+        "items_per_sec": pa.float64(),
+        "bytes_per_sec": pa.float64(),
+        "mean_ms": pa.float64(),
+        "stdev_ms": pa.float64(),
+    }
+    schema = pa.schema(
+        [(column, types.get(column, pa.string())) for column in table_columns(params)]
+    )
+
+    def batches() -> Iterator[Any]:
+        rows: List[Dict[str, Any]] = []
+        for row in iter_rows(writable_speedtest_cache, params):
+            row.update({p: None if row[p] is None else str(row[p]) for p in params})
+            rows.append(row)
+            if len(rows) == _BATCH_SIZE:
+                yield pa.RecordBatch.from_pylist(rows, schema=schema)
+                rows = []
+        if rows:
+            yield pa.RecordBatch.from_pylist(rows, schema=schema)
+
+    path = os.path.join(os.getcwd(), cche_file)
+    if pq is not None:
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in batches():
+                writer.write_batch(batch)
+    else:
+        with pa.ipc.new_file(path, schema) as writer:
+            for batch in batches():
+                writer.write_batch(batch)
+    return cche_file
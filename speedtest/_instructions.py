@@ -0,0 +1,76 @@
+"""Counts the bytecode instructions and calls executed by a function.
+
+Unlike its time, the number of instructions a function executes does not depend on
+the machine or on noise, so any change is a change of code path. Requires the
+sys.monitoring API of Python 3.12+.
+"""
+
+import sys
+from typing import Any, Callable, Dict, List
+
+
+def instructions_available() -> bool:
+    """Whether instructions can be counted, on Python 3.12+."""
+    return sys.version_info >= (3, 12)
+
+
+def _free_tool_id() -> int:
+    """Finds a sys.monitoring tool id not in use, e.g. by a debugger or coverage."""
+    for tool_id in range(6):
+        if sys.monitoring.get_tool(tool_id) is None:
+            return tool_id
+    raise RuntimeError("all sys.monitoring tool ids are in use.")
+
+
+def _noop() -> None:
+    pass
+
+
+def count_instructions(func: Callable[[], Any]) -> Dict[str, int]:
+    """Counts the instructions and calls executed by one call of `func`.
+
+    Counts are net of the harness, measured by counting an empty function, so an
+    empty `func` executes 0 instructions and 0 calls.
+
+    Returns
+    -------
+    Dict[str, int]
+        The number of "instructions" (INSTRUCTION events) and "calls" (CALL events,
+        to Python and builtin functions alike).
+    """
+    if not instructions_available():
+        raise RuntimeError("counting instructions requires Python 3.12+.")
+    monitoring = sys.monitoring
+    events = monitoring.events
+    tool_id = _free_tool_id()
+    counts = [0, 0]
+
+    def on_instruction(code, offset):
+        counts[0] += 1
+
+    def on_call(code, offset, callable_, arg0):
+        counts[1] += 1
+
+    def count(f: Callable[[], Any]) -> List[int]:
+        counts[:] = [0, 0]
+        monitoring.set_events(tool_id, events.INSTRUCTION | events.CALL)
+        try:
+            f()
+        finally:
+            monitoring.set_events(tool_id, events.NO_EVENTS)
+        return list(counts)
+
+    monitoring.use_tool_id(tool_id, "speedtest")
+    try:
+        monitoring.register_callback(tool_id, events.INSTRUCTION, on_instruction)
+        monitoring.register_callback(tool_id, events.CALL, on_call)
+        overhead = count(_noop)
+        total = count(func)
+    finally:
+        monitoring.register_callback(tool_id, events.INSTRUCTION, None)
+        monitoring.register_callback(tool_id, events.CALL, None)
+        monitoring.free_tool_id(tool_id)
+    return {
+        "instructions": max(total[0] - overhead[0], 0),
+        "calls": max(total[1] - overhead[1], 0),
+    }
@@ -0,0 +1,241 @@
+"""Runs the same suite under several Python interpreters, compared side by side."""
+
+import math
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import speedtest
+from speedtest._ioops import read_json, write_json
+from speedtest._kwargs import Kwargs
+from speedtest._processor import _discover_source_files
+from speedtest._profiles import apply_profile, parse_warmup
+from speedtest._speedtree import parse_python_to_tree
+from speedtest._stringify import map_stringify_time
+
+# the width of each interpreter's column in the comparison table.
+_COLUMN_WIDTH = 22
+
+
+def parse_interpreters(spec: str) -> List[str]:
+    """Splits a comma-separated list of interpreters, keeping their order."""
+    interpreters = [s.strip() for s in spec.split(",") if s.strip()]
+    if not interpreters:
+        raise ValueError("--interpreters needs at least one interpreter.")
+    return interpreters
+
+
+def _child_command(
+    executable: str, srcs: List[str], kwargs: Kwargs, json_file: str
+) -> List[str]:
+    """The command timing `srcs` under `executable`, with the session's settings.
+
+    Time limits and the session budget apply to each interpreter in turn, so that a
+    hung benchmark is killed rather than hanging the whole matrix.
+    """
+    cmd = [executable, "-m", "speedtest", *srcs, "--no-cache", "--quiet"]
+    cmd += ["--nreps", str(kwargs.nreps), "--json-file", json_file]
+    if kwargs.profile != "default":
+        cmd.append(f"--{kwargs.profile}")
+    if kwargs.min_time is not None:
+        cmd += ["--min-time", str(kwargs.min_time)]
+    if kwargs.max_loops is not None:
+        cmd += ["--max-loops", str(kwargs.max_loops)]
+    if parse_warmup(kwargs.warmup) != 0:
+        cmd += ["--warmup", str(kwargs.warmup)]
+    if kwargs.clock != "wall":
+        cmd += ["--clock", kwargs.clock]
+    if kwargs.keyword:
+        cmd += ["-k", kwargs.keyword]
+    if kwargs.count_instructions:
+        cmd.append("--count-instructions")
+    if kwargs.max_time_per_benchmark:
+        cmd += ["--max-time-per-benchmark", str(kwargs.max_time_per_benchmark)]
+    if kwargs.session_budget:
+        cmd += ["--session-budget", str(kwargs.session_budget)]
+    if kwargs.rusage:
+        cmd.append("--rusage")
+    if kwargs.cold:
+        cmd.append("--cold")
+    if kwargs.interleave:
+        cmd.append("--interleave")
+    if kwargs.seed is not None:
+        cmd += ["--seed", str(kwargs.seed)]
+    if kwargs.no_precheck:
+        cmd.append("--no-precheck")
+    return cmd
+
+
+def run_interpreter(
+    executable: str, srcs: List[str], kwargs: Kwargs
+) -> Tuple[int, Dict[str, Any]]:
+    """Times `srcs` in a subprocess of `executable`.
+
+    This copy of speedtest is put first on the PYTHONPATH of the subprocess, so that
+    the interpreter needs nothing installed.
+
+    Returns
+    -------
+    Tuple[int, Dict[str, Any]]
+        The exit code, and the JSON output of the session.
+    """
+    env = dict(os.environ)
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(speedtest.__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(
+        [package_dir] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    with tempfile.TemporaryDirectory(prefix="speedtest-interpreters-") as tmpdir:
+        json_file = os.path.join(tmpdir, "run.json")
+        proc = subprocess.run(
+            _child_command(executable, srcs, kwargs, json_file),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if not os.path.isfile(json_file):
+            lines = proc.stderr.strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"exit code {proc.returncode}")
+        return proc.returncode, read_json(json_file)
+
+
+def interpreter_version(fingerprint: Dict[str, Any]) -> str:
+    """The Python version of a session, marking free-threaded builds with 't'."""
+    version = fingerprint.get("python", "?")
+    return version + "t" if fingerprint.get("gil_disabled") else version
+
+
+def geometric_mean(values: List[float]) -> float:
+    """The geometric mean of positive `values`, the average of speedup ratios."""
+    return math.exp(sum(math.log(v) for v in values) / len(values))
+
+
+def stringify_matrix(
+    columns: List[str],
+    results: List[Dict[str, Any]],
+    srcs: List[str],
+    kwargs: Kwargs,
+) -> List[str]:
+    """Tabulates the time per loop under each interpreter, with a row per benchmark.
+
+    Each time after the first column is followed by its speedup relative to the
+    first column, and the last row is the geometric mean of the speedups.
+    """
+    labels: Dict[Tuple[str, str], None] = {}
+    for src in srcs:
+        for cache in results:
+            for label in cache.get(src, {}):
+                labels[(src, label)] = None
+
+    lhs_width = max(kwargs.print_pad_width - _COLUMN_WIDTH * len(columns), 40)
+    lines = [
+        "".ljust(lhs_width) + "".join(c.rjust(_COLUMN_WIDTH) for c in columns),
+    ]
+    speedups: List[List[float]] = [[] for _ in columns]
+    for src, label in labels:
+        cells = []
+        timed = [cache.get(src, {}).get(label, {}) for cache in results]
+        timed = [p if p.get("status", "ok") == "ok" else {} for p in timed]
+        base = timed[0].get("score")
+        for i, properties in enumerate(timed):
+            if not properties.get("score"):
+                cells.append("-")
+                continue
+            cell = map_stringify_time(kwargs.unit, properties["score"])
+            if i > 0 and base:
+                speedup = base / properties["score"]
+                speedups[i].append(speedup)
+                cell += f" ({speedup:.2f}x)"
+            cells.append(cell)
+        lhs_print = f"{os.path.relpath(src)}:{label} ".ljust(lhs_width, "-")
+        lines.append(lhs_print + "".join(c.rjust(_COLUMN_WIDTH) for c in cells))
+
+    lines.append(
+        "geometric mean speedup".ljust(lhs_width)
+        + "".join(
+            (f"{geometric_mean(s):.2f}x" if s else "-").rjust(_COLUMN_WIDTH)
+            for s in [[1.0]] + speedups[1:]
+        )
+    )
+    return lines
+
+
+def run_interpreters(kwargs: Kwargs, logger: Callable[[str], None]) -> int:
+    """Runs the suite under each of `kwargs.interpreters`, and compares them.
+
+    The speed files are discovered and parsed once, here, and each interpreter is
+    given the same files. Interpreters run one after the other, so that they do not
+    compete for the machine.
+
+    Returns
+    -------
+    int
+        The exit code; 1 if any interpreter could not run, or any benchmark failed
+        or exceeded a limit, else 0.
+    """
+    interpreters = parse_interpreters(kwargs.interpreters or "")
+    # the profile's settings are forwarded to each interpreter explicitly.
+    apply_profile(kwargs)
+    # every interpreter times the rounds in the same order.
+    if kwargs.interleave and kwargs.seed is None:
+        kwargs.seed = random.randrange(2**32)
+    srcs = [
+        src
+        for src in sorted(_discover_source_files(kwargs.file_or_dir))
+        if parse_python_to_tree(Path(src)).methods
+    ]
+    logger(
+        "collected {} file{}, best of {}, under {} interpreters:\n".format(
+            len(srcs), "s" if len(srcs) != 1 else "", kwargs.nreps, len(interpreters)
+        )
+    )
+
+    exit_code = 0
+    columns: List[str] = []
+    results: List[Dict[str, Any]] = []
+    outputs: Dict[str, Any] = {}
+    for interpreter in interpreters:
+        executable: Optional[str] = shutil.which(interpreter)
+        if executable is None:
+            logger(f"WARNING: interpreter `{interpreter}` not found; skipped.")
+            exit_code = 1
+            continue
+        try:
+            returncode, output = run_interpreter(executable, srcs, kwargs)
+        except RuntimeError as e:
+            logger(f"WARNING: interpreter `{interpreter}` failed; skipped. {e}")
+            exit_code = 1
+            continue
+        version = interpreter_version(output["fingerprint"])
+        # columns are named by version, unless two interpreters share one.
+        label = version if version not in outputs else f"{interpreter} {version}"
+        logger(
+            f"{interpreter}: Python {version}, {output['fingerprint']['executable']}"
+        )
+        exit_code = max(exit_code, returncode)
+        columns.append(label)
+        results.append(output["results"])
+        outputs[label] = output
+
+    if results:
+        logger("")
+        for line in stringify_matrix(columns, results, srcs, kwargs):
+            logger(line)
+
+    if kwargs.tojson or kwargs.json_file:
+        jsonfile_name = write_json(
+            {label: output["results"] for label, output in outputs.items()},
+            metadata={
+                "interpreters": {
+                    label: output["fingerprint"] for label, output in outputs.items()
+                }
+            },
+            prefix="interpreters",
+            fname=kwargs.json_file,
+        )
+        logger(f"Success! Saved JSON output to '{jsonfile_name}'")
+    return exit_code
@@ -4,14 +4,13 @@ import importlib
 import os
 import sys
 import json
-import itertools as it
-import csv
 import configparser
 from pathlib import Path
 from typing import Any, Optional, Dict, Union
 import warnings
 
-from speedtest._stringify import stringify_time
+from speedtest._cache import write_json_atomic
+from speedtest._stringify import stringify_time, stringify_throughput
 
 
 def _get_cache_file_name(prefix: str = "run", suffix: str = ".csv") -> str:
@@ -62,9 +61,38 @@ def read_ini(
 
     results = {}
 
-    params_bool = ["parallel", "tocsv", "totxt", "ignore_cache", "no_cache"]
-    params_int = ["nreps", "print_pad_width"]
-    params_str = ["file_or_dir", "unit"]
+    params_bool = [
+        "parallel",
+        "tocsv",
+        "totxt",
+        "tojson",
+        "topyperf",
+        "togbench",
+        "tojunit",
+        "toparquet",
+        "toarrow",
+        "ignore_cache",
+        "no_cache",
+        "no_precheck",
+        "normalize",
+        "cold",
+        "rusage",
+        "interleave",
+        "count_instructions",
+    ]
+    params_int = ["nreps", "print_pad_width", "max_loops", "seed", "replicas"]
+    params_float = ["wait_quiet", "min_time"]
+    params_str = [
+        "file_or_dir",
+        "unit",
+        "max_time_per_benchmark",
+        "session_budget",
+        "profile",
+        "interpreters",
+        "clock",
+        "line_profile",
+        "warmup",
+    ]
 
     for p in params_bool:
         if p in cfg["speedtest"]:
@@ -72,6 +100,9 @@ def read_ini(
     for p in params_int:
         if p in cfg["speedtest"]:
             results[p] = cfg.getint("speedtest", p)
+    for p in params_float:
+        if p in cfg["speedtest"]:
+            results[p] = cfg.getfloat("speedtest", p)
     for p in params_str:
         if p in cfg["speedtest"]:
             results[p] = cfg.get("speedtest", p)
@@ -83,69 +114,19 @@ def write_cache(
     cache_name: str = "cache.json",
     indent: bool = True,
 ) -> None:
-    """Creates a cache directory at `.speedtest_cache`.
+    """Creates a cache directory at `.speedtest_cache`, and writes `cache_name` in it.
 
-    Stores data including function names, autorange values to accelerate repeated runs.
+    Stores data such as the environment fingerprint. Timing results are stored per
+    speed file using _cache.write_shards().
     """
     i = 4 if indent else None
     cache_dir = os.path.join(os.getcwd(), ".speedtest_cache")
     if not os.path.isdir(cache_dir):
         os.mkdir(cache_dir)
 
-    cche_file = os.path.join(cache_dir, cache_name)
-    with open(cche_file, "wt", encoding="utf-8") as cfile:
-        json.dump(writable_speedtest_cache, cfile, indent=i)
-
-
-def write_csv(writable_speedtest_cache: Dict[str, Any]) -> str:
-    """Creates a CSV file."""
-    cche_file = _get_cache_file_name("run", ".csv")
-
-    # extract all unique parameters.
-    params = [
-        [[k for k in j.keys() if k.startswith("param__")] for j in i.values()]
-        for i in writable_speedtest_cache.values()
-    ]
-    # flatten params into 1d list
-    for _ in range(2):
-        params = list(it.chain.from_iterable(params))
-    # unique set of parameters.
-    params_unique = sorted(set(params))
-
-    header = ["filepath", "function_name", "nloops", "time_taken_ms"] + params_unique
-
-    # now use csvfile to convert dict into csv.
-    with open(os.path.join(os.getcwd(), cche_file), "w", newline="") as csvfile:
-        writer = csv.writer(
-            csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL
-        )
-        # write header.
-        writer.writerow(header)
-        # write each row.
-        for file_path, items in writable_speedtest_cache.items():
-            # convert file_path to relative
-            file_path_rel = os.path.relpath(file_path)
-
-            for func_name, parameters in items.items():
-                # strip any [] brackets from the func name.
-                func_name_stripped = func_name.split("[", 1)[0]
-
-                # extract param__ arguments and map them to the correct location.
-                _params = [None] * len(params_unique)
-                # assign each parameter to to correct position within the unique parameter.
-                for p in filter(lambda s: s.startswith("param__"), parameters):
-                    _params[params_unique.index(p)] = parameters[p]
-
-                writer.writerow(
-                    [
-                        file_path_rel,
-                        func_name_stripped,
-                        parameters["nloops"],
-                        parameters["score"] * 1e3,
-                    ]
-                    + _params
-                )
-    return cche_file
+    write_json_atomic(
+        writable_speedtest_cache, os.path.join(cache_dir, cache_name), indent=i
+    )
 
 
 def write_txt(writable_speedtest_cache: Dict[str, Any]) -> str:
@@ -158,16 +139,46 @@ def write_txt(writable_speedtest_cache: Dict[str, Any]) -> str:
             file_path_rel = os.path.relpath(file_path)
             for func_name, parameters in items.items():
                 txtfile.write(
-                    "{}:{} | {} loops, {} / loop\n".format(
+                    "{}:{} | {} loops, {} / loop{}\n".format(
                         file_path_rel,
                         func_name,
                         parameters["nloops"],
                         stringify_time(parameters["score"]),
+                        stringify_throughput(parameters),
                     )
                 )
     return cche_file
 
 
+def write_json(
+    writable_speedtest_cache: Dict[str, Any],
+    fingerprint: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    prefix: str = "run",
+    fname: Optional[str] = None,
+) -> str:
+    """Creates a JSON file of the results, alongside the environment fingerprint.
+
+    The file is named `fname` if given, else `{prefix}X.json` is incremented until
+    it does not exist.
+    """
+    cche_file = fname if fname is not None else _get_cache_file_name(prefix, ".json")
+
+    content = dict(metadata or {})
+    content["fingerprint"] = fingerprint or {}
+    content["results"] = writable_speedtest_cache
+
+    with open(os.path.join(os.getcwd(), cche_file), "wt", encoding="utf-8") as jfile:
+        json.dump(content, jfile, indent=2)
+    return cche_file
+
+
+def read_json(fname: str) -> Dict[str, Any]:
+    """Loads a JSON file written by `write_json`."""
+    with open(fname, "rt", encoding="utf-8") as jfile:
+        return json.load(jfile)
+
+
 def read_toml(
     fname: str = "pyproject.toml", local_dir: Optional[Union[str, Path]] = None
 ) -> Dict[str, Any]:
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -10,7 +10,7 @@ class Kwargs:
     unit: str = "auto"
     no_cache: bool = False
     parallel: bool = False
-    nreps: int = 3
+    nreps: Optional[int] = None
     tocsv: bool = False
     totxt: bool = False
     ignore_cache: bool = False
@@ -18,3 +18,37 @@ class Kwargs:
     quiet: bool = False
     verbose: int = 0
     rich_installed: bool = False
+    no_precheck: bool = False
+    wait_quiet: float = 0.0
+    normalize: bool = False
+    calibration_ref: float = 0.0
+    nloops_pad_width: int = 0
+    shard: Optional[str] = None
+    shard_costs: Optional[str] = None
+    tojson: bool = False
+    json_file: Optional[str] = None
+    topyperf: bool = False
+    togbench: bool = False
+    tojunit: bool = False
+    toparquet: bool = False
+    toarrow: bool = False
+    max_time_per_benchmark: Optional[str] = None
+    session_budget: Optional[str] = None
+    deadline: float = 0.0
+    watch: bool = False
+    self_bench: bool = False
+    cold: bool = False
+    profile: str = "default"
+    min_time: Optional[float] = None
+    max_loops: Optional[int] = None
+    warmup: str = "0"
+    clock: str = "wall"
+    rusage: bool = False
+    interleave: bool = False
+    replicas: int = 1
+    count_instructions: bool = False
+    line_profile: Optional[str] = None
+    seed: Optional[int] = None
+    keyword: Optional[str] = None
+    interpreters: Optional[str] = None
+    limits: Dict[str, Dict[str, Any]] = field(default_factory=dict)
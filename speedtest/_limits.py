@@ -0,0 +1,110 @@
+"""Evaluates performance budgets declared on benchmarks against their results."""
+
+import fnmatch
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from speedtest._stats import mean_confidence_interval
+from speedtest._stringify import (
+    parse_bytes,
+    parse_time,
+    stringify_bytes,
+    stringify_time,
+)
+
+
+def parse_limits(spec: Dict[str, Any]) -> Dict[str, float]:
+    """Parses a table of limits into seconds and bytes, ignoring unset limits."""
+    limits = {}
+    if spec.get("max_time") is not None:
+        limits["max_time"] = parse_time(spec["max_time"])
+    if spec.get("max_memory") is not None:
+        limits["max_memory"] = parse_bytes(spec["max_memory"])
+    return limits
+
+
+def find_limits(
+    names: List[str],
+    table: Dict[str, Dict[str, Any]],
+    declared: Optional[Dict[str, Any]] = None,
+) -> Dict[str, float]:
+    """Finds the limits of a benchmark.
+
+    Parameters
+    ----------
+    names : List[str]
+        Names the benchmark is known by, e.g. 'path/speed_x.py:speed_a{..}' and
+        'speed_a{..}', matched against the patterns in `table`.
+    table : Dict[str, Dict[str, Any]]
+        The `[tool.speedtest.limits]` table, mapping glob patterns onto limits.
+        Later patterns take precedence over earlier ones.
+    declared : Dict[str, Any], optional
+        Limits from @speedtest.limit(...), which take precedence over the table.
+
+    Returns
+    -------
+    Dict[str, float]
+        The "max_time" in seconds and "max_memory" in bytes, where set.
+    """
+    limits: Dict[str, float] = {}
+    for pattern, spec in table.items():
+        if any(fnmatch.fnmatchcase(name, pattern) for name in names):
+            limits.update(parse_limits(spec))
+    limits.update(parse_limits(declared or {}))
+    return limits
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Measures the peak memory allocated during one call, using tracemalloc."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        else:
+            # reset_peak() is new in Python 3.9; restarting tracing also resets it.
+            tracemalloc.stop()
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        return max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def check_limits(properties: Dict[str, Any], limits: Dict[str, float]) -> List[str]:
+    """Compares a timed benchmark against its limits.
+
+    With repeated samples, the time limit is only exceeded when the lower bound of
+    the 95% confidence interval of the mean time per loop exceeds it, so that noise
+    alone does not fail a run; with a single sample, its time is compared directly.
+
+    Returns
+    -------
+    List[str]
+        A description of each exceeded limit, empty if all were met.
+    """
+    violations = []
+    if "max_time" in limits:
+        samples = properties.get("samples") or [properties["score"]]
+        mean, lower, upper = mean_confidence_interval(samples)
+        if lower > limits["max_time"]:
+            ci = (
+                f" (95% CI {stringify_time(lower)} to {stringify_time(upper)})"
+                if len(samples) > 1
+                else ""
+            )
+            violations.append(
+                f"time {stringify_time(mean)} > {stringify_time(limits['max_time'])}{ci}"
+            )
+    if "max_memory" in limits and "peak_memory" in properties:
+        if properties["peak_memory"] > limits["max_memory"]:
+            violations.append(
+                "memory {} > {}".format(
+                    stringify_bytes(properties["peak_memory"]),
+                    stringify_bytes(limits["max_memory"]),
+                )
+            )
+    return violations
@@ -0,0 +1,262 @@
+"""Times each line of the functions called by a benchmark, line_profiler-style.
+
+Lines are timed using the sys.monitoring LINE events of Python 3.12+, which are
+enabled only on the code of the target functions, else using sys.settrace(). The
+time of a line includes that of any functions it calls.
+"""
+
+import importlib
+import inspect
+import os
+import re
+import sys
+import time
+from functools import partial
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional
+
+from speedtest._instructions import _free_tool_id
+from speedtest._stringify import map_stringify_time
+
+# the hits and nanoseconds of each line number, of each profiled code object.
+LineStats = Dict[CodeType, Dict[int, List[int]]]
+
+
+def resolve_target(name: str, namespace: Optional[Dict[str, Any]] = None) -> Callable:
+    """Finds a function by its dotted name, e.g. 'mypkg.module.Class.method'.
+
+    The name is first looked up in `namespace`, e.g. the globals of a speed file,
+    then imported as the longest importable module followed by attributes.
+    """
+    parts = name.split(".")
+    if namespace is not None and parts[0] in namespace:
+        obj, rest = namespace[parts[0]], parts[1:]
+    else:
+        obj, rest = None, parts
+        for i in range(len(parts), 0, -1):
+            try:
+                obj, rest = importlib.import_module(".".join(parts[:i])), parts[i:]
+                break
+            except ImportError:
+                continue
+        if obj is None:
+            raise ValueError(f"line_profile target `{name}` cannot be imported.")
+    for attr in rest:
+        obj = getattr(obj, attr)
+    return obj
+
+
+def code_of(func: Any) -> CodeType:
+    """The code object of a function, through partial(), methods and decorators."""
+    while isinstance(func, partial):
+        func = func.func
+    func = inspect.unwrap(getattr(func, "__func__", func))
+    if not hasattr(func, "__code__"):
+        raise TypeError(f"cannot line profile {func!r}; it is not a Python function.")
+    return func.__code__
+
+
+def target_codes(func: Any, names: List[str]) -> List[CodeType]:
+    """The code objects of the functions `names`, looked up from the globals of the
+    speed function `func`; else that of `func` itself."""
+    if not names:
+        return [code_of(func)]
+    while isinstance(func, partial):
+        func = func.func
+    namespace = getattr(inspect.unwrap(func), "__globals__", None)
+    return [code_of(resolve_target(name, namespace)) for name in names]
+
+
+class _LineTimer:
+    """Accumulates the hits and time of each line, from start/line/stop events."""
+
+    def __init__(self):
+        self.stats: LineStats = {}
+        # the [code, current line, time it started] of each active call.
+        self.stack: List[List[Any]] = []
+
+    def start(self, code: CodeType) -> None:
+        self.stack.append([code, None, time.perf_counter_ns()])
+
+    def line(self, code: CodeType, lineno: int) -> None:
+        now = time.perf_counter_ns()
+        if not self.stack or self.stack[-1][0] is not code:
+            self.stack.append([code, None, now])
+        entry = self.stack[-1]
+        lines = self.stats.setdefault(code, {})
+        if entry[1] is not None:
+            lines[entry[1]][1] += now - entry[2]
+        lines.setdefault(lineno, [0, 0])[0] += 1
+        entry[1] = lineno
+        entry[2] = time.perf_counter_ns()
+
+    def stop(self, code: CodeType) -> None:
+        now = time.perf_counter_ns()
+        if self.stack and self.stack[-1][0] is code:
+            _, lineno, started = self.stack.pop()
+            if lineno is not None:
+                self.stats[code][lineno][1] += now - started
+
+
+def _profile_monitoring(func: Callable[[], Any], codes: List[CodeType]) -> LineStats:
+    """Profiles one call of `func` using sys.monitoring local events."""
+    monitoring = sys.monitoring
+    events = monitoring.events
+    tool_id = _free_tool_id()
+    timer = _LineTimer()
+    targets = set(codes)
+
+    def on_start(code, offset):
+        timer.start(code)
+
+    def on_line(code, lineno):
+        timer.line(code, lineno)
+
+    def on_stop(code, offset, value):
+        timer.stop(code)
+
+    def on_unwind(code, offset, exception):
+        if code in targets:
+            timer.stop(code)
+
+    callbacks = {
+        events.PY_START: on_start,
+        events.PY_RESUME: on_start,
+        events.LINE: on_line,
+        events.PY_RETURN: on_stop,
+        events.PY_YIELD: on_stop,
+        events.PY_UNWIND: on_unwind,
+    }
+    local_events = (
+        events.PY_START
+        | events.PY_RESUME
+        | events.LINE
+        | events.PY_RETURN
+        | events.PY_YIELD
+    )
+    monitoring.use_tool_id(tool_id, "speedtest")
+    try:
+        for event, callback in callbacks.items():
+            monitoring.register_callback(tool_id, event, callback)
+        for code in targets:
+            monitoring.set_local_events(tool_id, code, local_events)
+        # exceptions unwinding a frame are only available as a global event.
+        monitoring.set_events(tool_id, events.PY_UNWIND)
+        try:
+            func()
+        finally:
+            monitoring.set_events(tool_id, events.NO_EVENTS)
+            for code in targets:
+                monitoring.set_local_events(tool_id, code, events.NO_EVENTS)
+    finally:
+        for event in callbacks:
+            monitoring.register_callback(tool_id, event, None)
+        monitoring.free_tool_id(tool_id)
+    return timer.stats
+
+
+def _profile_settrace(func: Callable[[], Any], codes: List[CodeType]) -> LineStats:
+    """Profiles one call of `func` using sys.settrace(), before Python 3.12."""
+    timer = _LineTimer()
+    targets = set(codes)
+
+    def local_trace(frame, event, arg):
+        if event == "line":
+            timer.line(frame.f_code, frame.f_lineno)
+        elif event == "return":
+            timer.stop(frame.f_code)
+        return local_trace
+
+    def global_trace(frame, event, arg):
+        if frame.f_code not in targets:
+            return None
+        timer.start(frame.f_code)
+        return local_trace
+
+    previous = sys.gettrace()
+    sys.settrace(global_trace)
+    try:
+        func()
+    finally:
+        sys.settrace(previous)
+    return timer.stats
+
+
+def profile_lines(func: Callable[[], Any], codes: List[CodeType]) -> LineStats:
+    """Times each line of `codes` during one call of `func`.
+
+    Returns
+    -------
+    LineStats
+        For each code object which ran, the [hits, nanoseconds] of each line.
+    """
+    if sys.version_info >= (3, 12) and not sys.gettrace():
+        return _profile_monitoring(func, codes)
+    return _profile_settrace(func, codes)
+
+
+def annotate_source(stats: LineStats, codes: List[CodeType], unit: str) -> str:
+    """Annotates the source of each of `codes` with the hits and time of its lines."""
+    blocks = []
+    for code in codes:
+        lines = stats.get(code, {})
+        total = sum(ns for _, ns in lines.values())
+        try:
+            source, first = inspect.getsourcelines(code)
+        except OSError:
+            source, first = [], code.co_firstlineno
+        # co_qualname is new in Python 3.11.
+        qualname = getattr(code, "co_qualname", code.co_name)
+        header = "{:>6} {:>8} {:>12} {:>12} {:>7}  {}".format(
+            "Line", "Hits", "Time", "Per hit", "% Time", "Line contents"
+        )
+        rows = [
+            f"Function: {qualname} at {code.co_filename}:{code.co_firstlineno}",
+            "Total time: {}".format(map_stringify_time(unit, total * 1e-9)),
+            "",
+            header,
+            "=" * len(header),
+        ]
+        for lineno, text in enumerate(source, start=first):
+            text = text.rstrip("\n")
+            if lineno not in lines:
+                rows.append(f"{lineno:>6} {'':>8} {'':>12} {'':>12} {'':>7}  {text}")
+                continue
+            hits, ns = lines[lineno]
+            rows.append(
+                "{:>6} {:>8} {:>12} {:>12} {:>7}  {}".format(
+                    lineno,
+                    hits,
+                    map_stringify_time(unit, ns * 1e-9),
+                    map_stringify_time(unit, ns * 1e-9 / hits),
+                    "{:.1f}".format(100.0 * ns / total) if total else "",
+                    text,
+                )
+            )
+        blocks.append("\n".join(rows))
+    return "\n\n\n".join(blocks) + "\n"
+
+
+def line_profile_path(src: str, label: str, cache_dir: Optional[str] = None) -> str:
+    """The file under `.speedtest_cache/line_profile` storing a benchmark's listing."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.getcwd(), ".speedtest_cache")
+    stem = os.path.splitext(os.path.basename(src))[0]
+    name = re.sub(r"[^\w.=-]+", "_", f"{stem}.{label}").strip("_")
+    return os.path.join(cache_dir, "line_profile", f"{name}.txt")
+
+
+def hottest_line(stats: LineStats) -> Optional[Dict[str, Any]]:
+    """The line which took the most time, with its share of its function's time."""
+    best = None
+    for code, lines in stats.items():
+        total = sum(ns for _, ns in lines.values())
+        for lineno, (_, ns) in lines.items():
+            if total and (best is None or ns > best["ns"]):
+                best = {
+                    "file": code.co_filename,
+                    "line": lineno,
+                    "ns": ns,
+                    "fraction": ns / total,
+                }
+    return best
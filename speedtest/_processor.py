@@ -1,30 +1,109 @@
 """Processes Python files and generates speedtest results."""
 
 # from collections.abc import Callable
+import fnmatch
 import os
 import platform
+import random
 import sys
 import importlib
 import importlib.metadata
 import itertools as it
 import glob
 import inspect
+import dataclasses
+import math
+import statistics
+from dataclasses import dataclass
 from pathlib import Path
 from functools import partial
+import time
 import timeit
-from multiprocessing import Pool, cpu_count
-from typing import List, Callable
+from multiprocessing import Pool, cpu_count, get_context
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+from speedtest._decorators import ParamGrid, Work
 from speedtest._kwargs import Kwargs
-from speedtest._speedtree import parse_python_to_tree
+from speedtest._speedtree import SpMethod, parse_python_to_tree
+from speedtest._cache import ShardedCache, clear_cache, write_shards
+from speedtest._coldstart import measure_cold_start
+from speedtest._instructions import count_instructions, instructions_available
+from speedtest._lineprofile import (
+    annotate_source,
+    hottest_line,
+    line_profile_path,
+    profile_lines,
+    target_codes,
+)
+from speedtest._limits import check_limits, find_limits, peak_memory
+from speedtest._profiles import (
+    apply_profile,
+    autorange,
+    parse_warmup,
+    profile_label,
+    warm_up,
+)
+from speedtest._setup import SetupTimer, build_inputs
+from speedtest._regions import region_clock, region_totals, reset_regions, use_clock
+from speedtest._rusage import (
+    accumulate_rusage,
+    rusage_available,
+    rusage_snapshot,
+    summarize_rusage,
+)
+from speedtest._selfbench import SUITE_DIR
+from speedtest._stats import (
+    mean_confidence_interval,
+    paired_ratios,
+    variance_components,
+)
 from speedtest._log import log_output, optional_rich_status
-from speedtest._stringify import stringify_time, map_stringify_time
+from speedtest._stringify import (
+    map_stringify_time,
+    parse_time,
+    stringify_bytes,
+    stringify_instructions,
+    stringify_line_profile,
+    stringify_regions,
+    stringify_replicas,
+    stringify_result,
+    stringify_rusage,
+    stringify_warmup,
+)
+from speedtest._timeout import BenchmarkTimeout, call_with_alarm, run_with_timeout
+from speedtest._calibrate import (
+    calibration_reference,
+    kernel_noise,
+    run_calibration_suite,
+    system_noise,
+    throttle_count,
+)
+from speedtest._environment import (
+    collect_fingerprint,
+    fingerprint_diff,
+    fingerprint_id,
+)
+from speedtest._export import (
+    write_arrow,
+    write_csv,
+    write_gbench,
+    write_junit,
+    write_pyperf,
+)
 from speedtest._ioops import (
     read_cache,
     write_cache,
-    write_csv,
+    write_json,
     write_txt,
 )
+from speedtest._shard import (
+    assign_shards,
+    estimate_file_costs,
+    merge_results,
+    parse_shard,
+    prioritize_files,
+    read_shard_costs,
+)
 
 
 def _is_valid_python_file(path: str) -> bool:
@@ -75,6 +154,11 @@ def _discover_source_files(srcs: List[str]) -> List[str]:
                     os.path.join(file_or_dir_local, "**/*.py"), recursive=True
                 )
                 if _is_valid_python_file(f)
+                # the bundled self-bench suite only runs when given explicitly.
+                and (
+                    os.path.dirname(os.path.abspath(f)) != SUITE_DIR
+                    or os.path.abspath(file_or_dir_local) == SUITE_DIR
+                )
             ]
             all_parsable_files.extend(valid_files)
 
@@ -82,10 +166,693 @@ def _discover_source_files(srcs: List[str]) -> List[str]:
     return list(set(all_parsable_files))
 
 
-def _process_source_file(src: str, kwargs: Kwargs, cache_data):
+@dataclass
+class SpCase:
+    """A single timeable call of a speed method, after parametrization and fixtures."""
+
+    method: SpMethod
+    func: Callable
+    label: str
+    params: Dict[str, Any]
+    # builds the (args, kwargs) of each call, if inputs are rebuilt per iteration.
+    inputs: Optional[Callable[[], Tuple[Tuple[Any, ...], Dict[str, Any]]]] = None
+
+
+def _printable_parameters(
+    case_id: Optional[str], kwonlydefaults: Optional[Dict[str, Any]]
+) -> str:
+    """Formats the parameters of a case, as appended to its method name."""
+    if case_id is not None:
+        return f"[{case_id}]"
+    if kwonlydefaults:
+        return (
+            "{"
+            + ",".join(["'{}'={}".format(k, v) for k, v in kwonlydefaults.items()])
+            + "}"
+        )
+    return ""
+
+
+def _iter_cases(
+    module_,
+    method: SpMethod,
+    fixture_cache: Optional[Dict[str, Any]] = None,
+    select: Optional[Callable[[str], bool]] = None,
+) -> Iterator[SpCase]:
+    """Yields the parametrized cases of a speed method, with fixtures attached.
+
+    Fixture results are reused from, and stored in, `fixture_cache` if given. If
+    `select` is given, only cases whose label it accepts are yielded; the labels
+    of a parameter grid are found from its parameters, so that unselected cases
+    are never built.
+    """
+
+    # get function method as an object.
+    script_func = getattr(module_, method.name)
+
+    # fixtures scoped per iteration are called before every call, untimed.
+    iteration_fixtures = {
+        fix: getattr(module_, fix)
+        for fix in method.fixtures
+        if getattr(getattr(module_, fix), "__speedtest_scope__", None) == "iteration"
+    }
+
+    # if the function has any fixtures, run the fixtures first and collect the arguments to attach to the function.
+    if method.fixtures:
+        if fixture_cache is None:
+            fixture_cache = {}
+        for fix in method.fixtures:
+            if fix not in fixture_cache and fix not in iteration_fixtures:
+                fixture_cache[fix] = getattr(module_, fix)()
+        # map keyword arguments
+        fixture_kws = {
+            fix: fixture_cache[fix]
+            for fix in method.fixtures
+            if fix not in iteration_fixtures
+        }
+    else:
+        fixture_kws = {}
+
+    #   check if script_func is a parameter grid - this indicates that its part of a
+    #   parametrize() call.
+    if isinstance(script_func, ParamGrid):
+        indices = range(len(script_func))
+    else:
+        indices = [None]
+
+    for index in indices:
+        if index is not None and select is not None:
+            # label the case from its parameters, before building it.
+            case_id = script_func.case_id(index)
+            kwonlydefaults = None
+            if case_id is None:
+                kwonlydefaults = inspect.getfullargspec(
+                    partial(script_func.func, **script_func.params(index))
+                ).kwonlydefaults
+            if not select(method.name + _printable_parameters(case_id, kwonlydefaults)):
+                continue
+        script = script_func if index is None else script_func[index]
+
+        # use inspect to extract any parameters, and add them to the print statement.
+        sig = inspect.getfullargspec(script)
+        label = method.name + _printable_parameters(
+            getattr(script, "case_id", None), sig.kwonlydefaults
+        )
+        if index is None and select is not None and not select(label):
+            continue
+
+        # a setup function may take any of the parameters by name.
+        params = dict(sig.kwonlydefaults or {})
+        setup = _unwrap_attr(script, "__speedtest_setup__")
+        if setup is not None:
+            accepted = inspect.signature(setup).parameters
+            setup = partial(setup, **{k: v for k, v in params.items() if k in accepted})
+        inputs = None
+        if setup is not None or iteration_fixtures:
+            inputs = partial(build_inputs, setup, iteration_fixtures)
+
+        # if any fixtures are defined, attach them to script using partial(...)
+        if len(fixture_kws) > 0:
+            script = partial(script, **fixture_kws)
+
+        yield SpCase(
+            method=method,
+            func=script,
+            label=label,
+            params=params,
+            inputs=inputs,
+        )
+
+
+def _collect_cases(
+    module_, method: SpMethod, fixture_cache: Optional[Dict[str, Any]] = None
+) -> List[SpCase]:
+    """Expands a speed method into its parametrized cases, with fixtures attached.
+
+    Fixture results are reused from, and stored in, `fixture_cache` if given.
+    """
+    return list(_iter_cases(module_, method, fixture_cache))
+
+
+def _case_timer(case: SpCase) -> timeit.Timer:
+    """Creates the timer of a case, rebuilding its inputs per call if required."""
+    if case.inputs is not None:
+        return SetupTimer(case.func, case.inputs, timer=region_clock)
+    return timeit.Timer(case.func, timer=region_clock)
+
+
+def _calibrate_case(
+    case: SpCase, src: str, kwargs: Kwargs, cache_data
+) -> Dict[str, Any]:
+    """Warms up a case with --warmup, then fetches its number of loops from the
+    cache, or via autorange."""
+    try:
+        warmup = warm_up(
+            _case_timer(case), parse_warmup(kwargs.warmup), kwargs.min_time or 0.2
+        )
+    except Exception:
+        # raised again, and reported, when the case is timed.
+        warmup = None
+    properties = _calibrate_loops(case, src, kwargs, cache_data)
+    if warmup is not None:
+        properties["warmup"] = warmup
+    else:
+        properties.pop("warmup", None)
+    return properties
+
+
+def _calibrate_loops(
+    case: SpCase, src: str, kwargs: Kwargs, cache_data
+) -> Dict[str, Any]:
+    """Fetches the number of loops of a case from the cache, or via autorange."""
+
+    # check if the cache contains the function specified, and it last ran cleanly.
+    if (
+        (not kwargs.ignore_cache or not kwargs.no_cache)
+        and (src in cache_data and case.label in cache_data[src])
+        and cache_data[src][case.label].get("status") not in ("failed", "timeout")
+        # loops calibrated with another profile are not comparable.
+        and cache_data[src][case.label].get("profile", "default")
+        == profile_label(kwargs)
+    ):
+        # extract nloops from cache, skip step.
+        return dict(cache_data[src][case.label])
+
+    # compute using autorange.
+    try:
+        min_time = kwargs.min_time or 0.2
+        nloops, best_score = autorange(
+            _case_timer(case),
+            min_time,
+            kwargs.max_loops,
+            # CPU time may barely advance on functions which wait.
+            max_wall=10 * min_time if kwargs.clock != "wall" else None,
+        )
+        # append data to the cache.
+        properties = {
+            "nloops": nloops,
+            "score": best_score / nloops,
+            "profile": profile_label(kwargs),
+        }
+        properties.update({"param__" + k: v for k, v in case.params.items()})
+    except Exception:
+        properties = {"nloops": 5, "score": 0}
+    return properties
+
+
+def _unwrap_attr(func: Callable, name: str) -> Any:
+    """Looks up an attribute set by a decorator, through any layers of partial()."""
+    while True:
+        value = getattr(func, name, None)
+        if value is not None or not isinstance(func, partial):
+            return value
+        func = func.func
+
+
+def _count_work(value: Any, params: Dict[str, Any]) -> Optional[int]:
+    """Resolves a declared amount of work; a parameter name, sized object or count."""
+    if isinstance(value, str):
+        value = params[value]
+    if hasattr(value, "__len__"):
+        value = len(value)
+    return value
+
+
+def _attach_work(case: SpCase, properties: Dict[str, Any]) -> None:
+    """Stores the items and bytes processed per call of a case, if declared.
+
+    Work is declared using @speedtest.throughput(...), or by returning a
+    speedtest.Work(...), in which case the function is called once, untimed.
+    """
+    spec = _unwrap_attr(case.func, "__speedtest_throughput__")
+    if case.method.returns_work:
+        result = _call_case(case)
+        if isinstance(result, Work):
+            spec = {"items": result.items, "bytes": result.bytes}
+
+    for key in ("items", "bytes"):
+        if spec is not None and spec.get(key) is not None:
+            properties[key] = _count_work(spec[key], case.params)
+        else:
+            properties.pop(key, None)
+
+
+def _derive_rates(properties: Dict[str, Any], kwargs: Kwargs) -> None:
+    """Derives the throughput and normalized score from the best score."""
+
+    # derive throughput from any declared work per call.
+    for key in ("items", "bytes"):
+        if properties.get(key) and properties["score"] > 0:
+            properties[f"{key}_per_sec"] = properties[key] / properties["score"]
+        else:
+            properties.pop(f"{key}_per_sec", None)
+
+    # express the score in units of the calibration kernels.
+    if kwargs.normalize and kwargs.calibration_ref > 0:
+        properties["normalized"] = properties["score"] / kwargs.calibration_ref
+
+
+def _record_scores(
+    properties: Dict[str, Any],
+    scores: List[float],
+    kwargs: Kwargs,
+    regions: Optional[Dict[str, int]] = None,
+    usage: Optional[List[float]] = None,
+) -> None:
+    """Stores the per-loop samples and best score of repeated timings.
+
+    `regions` holds the nanoseconds spent in each speedtest.region() across all of
+    the repeats, which is stored as the mean time per loop. `usage` holds the
+    resource usage accumulated across the repeats, with --rusage.
+    """
+
+    # on recommendation of the timer.repeat docstrings - we take the min() of the scores as a lower-bound for best-case-scenario of speed.
+    properties["samples"] = [score / properties["nloops"] for score in scores]
+    properties["score"] = min(properties["samples"])
+
+    _derive_rates(properties, kwargs)
+
+    if regions:
+        ncalls = len(scores) * properties["nloops"]
+        properties["regions"] = {k: ns * 1e-9 / ncalls for k, ns in regions.items()}
+    else:
+        properties.pop("regions", None)
+    if usage is not None:
+        properties["rusage"] = summarize_rusage(
+            usage, len(scores) * properties["nloops"]
+        )
+    else:
+        properties.pop("rusage", None)
+    properties["status"] = "ok"
+
+
+def _stringify_failure(e: Exception, kwargs: Kwargs) -> str:
+    """Prints an exception raised whilst timing."""
+    if isinstance(e, BenchmarkTimeout):
+        return f"TIMEOUT ({e})"
+    if kwargs.verbose < 1:
+        return f"FAILED ({e.__class__.__name__})"
+    return f"FAILED ({e.__class__.__name__}): {e}"
+
+
+def _case_timeout(case: SpCase, kwargs: Kwargs) -> Optional[float]:
+    """Finds the time limit of a case; @speedtest.timeout, else the global limit."""
+    timeout = _unwrap_attr(case.func, "__speedtest_timeout__")
+    if timeout is None and kwargs.max_time_per_benchmark:
+        timeout = parse_time(kwargs.max_time_per_benchmark)
+    return timeout
+
+
+def _clamp_to_deadline(timeout: Optional[float], kwargs: Kwargs) -> Optional[float]:
+    """Shortens a time limit so that it does not run past the session budget."""
+    if kwargs.deadline <= 0:
+        return timeout
+    remaining = max(kwargs.deadline - time.time(), 0.0)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _failed_properties(
+    case: SpCase, src: str, cache_data, status: str
+) -> Dict[str, Any]:
+    """Properties stored for a case which was not timed; its cached entry if any."""
+    if src in cache_data and case.label in cache_data[src]:
+        properties = dict(cache_data[src][case.label])
+    else:
+        properties = {"nloops": 5, "score": 0}
+        properties.update({"param__" + k: v for k, v in case.params.items()})
+    properties["status"] = status
+    return properties
+
+
+def _run_case(case: SpCase, src: str, kwargs: Kwargs, cache_data) -> Dict[str, Any]:
+    """Calibrates and times a single case, returning its timing properties."""
+    properties = _calibrate_case(case, src, kwargs, cache_data)
+    _attach_work(case, properties)
+    # using best n-loops, repeat rep times.
+    reset_regions()
+    usage = [0.0] * 6 if kwargs.rusage and rusage_available() else None
+    before = rusage_snapshot() if usage is not None else None
+    scores = _case_timer(case).repeat(repeat=kwargs.nreps, number=properties["nloops"])
+    if usage is not None:
+        accumulate_rusage(usage, before, rusage_snapshot())
+    _record_scores(properties, scores, kwargs, region_totals(), usage)
+    _apply_limits(case, src, properties, kwargs)
+    _count_case(case, properties, kwargs)
+    _line_profile_case(case, src, properties, kwargs)
+    return properties
+
+
+def _call_case(case: SpCase) -> Any:
+    """Calls a case once, building its inputs if required."""
+    args, kw = case.inputs() if case.inputs is not None else ((), {})
+    return case.func(*args, **kw)
+
+
+def _apply_limits(
+    case: SpCase, src: str, properties: Dict[str, Any], kwargs: Kwargs
+) -> None:
+    """Checks a timed case against its limits, storing any violations.
+
+    Limits come from @speedtest.limit(...), else from [tool.speedtest.limits], whose
+    patterns are matched against 'path:label' and 'label'. The peak memory of one
+    call is only measured when a memory limit applies.
+    """
+    rel_path_to_script = os.path.relpath(src, os.getcwd())
+    limits = find_limits(
+        [f"{rel_path_to_script}:{case.label}", case.label],
+        kwargs.limits,
+        _unwrap_attr(case.func, "__speedtest_limit__"),
+    )
+    if "max_memory" in limits:
+        properties["peak_memory"] = peak_memory(partial(_call_case, case))
+    else:
+        properties.pop("peak_memory", None)
+
+    violations = check_limits(properties, limits)
+    if violations:
+        properties["violations"] = violations
+    else:
+        properties.pop("violations", None)
+
+
+def _stringify_violations(properties: Dict[str, Any], kwargs: Kwargs) -> List[str]:
+    """Prints each limit exceeded by a benchmark."""
+    lhs_print = "    limit ".ljust(kwargs.print_pad_width, "-")
+    return [f"{lhs_print} EXCEEDED {v}" for v in properties.get("violations", [])]
+
+
+def _stringify_details(
+    properties: Dict[str, Any],
+    kwargs: Kwargs,
+    previous: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Prints the warm-up, regions, resource usage, instruction counts, line
+    profile, replicas and exceeded limits below a benchmark. `previous` is its
+    cached result, if any."""
+    return (
+        stringify_warmup(properties, kwargs.unit, kwargs.print_pad_width)
+        + stringify_regions(properties, kwargs.unit, kwargs.print_pad_width)
+        + stringify_rusage(properties, kwargs.unit, kwargs.print_pad_width)
+        + stringify_instructions(properties, previous, kwargs.print_pad_width)
+        + stringify_line_profile(properties, kwargs.print_pad_width)
+        + stringify_replicas(properties, kwargs.unit, kwargs.print_pad_width)
+        + _stringify_violations(properties, kwargs)
+    )
+
+
+def _count_case(case: SpCase, properties: Dict[str, Any], kwargs: Kwargs) -> None:
+    """Counts the instructions and calls of one call of a case, with
+    --count-instructions. Its inputs are built before counting starts."""
+    if not kwargs.count_instructions or not instructions_available():
+        properties.pop("instructions", None)
+        properties.pop("calls", None)
+        return
+    args, kw = case.inputs() if case.inputs is not None else ((), {})
+    properties.update(count_instructions(partial(case.func, *args, **kw)))
+
+
+def _line_profile_case(
+    case: SpCase, src: str, properties: Dict[str, Any], kwargs: Kwargs
+) -> None:
+    """Times each line of the targets of a case during one untimed call, with
+    --line-profile or @speedtest.mark(line_profile=[...]).
+
+    The annotated source is saved under `.speedtest_cache/line_profile`, and its
+    path and hottest line are stored. A target which cannot be found is reported,
+    without failing the benchmark.
+    """
+    names = _unwrap_attr(case.func, "__speedtest_line_profile__")
+    if kwargs.line_profile is not None:
+        names = list(names or []) + [
+            name.strip() for name in kwargs.line_profile.split(",") if name.strip()
+        ]
+    if names is None:
+        properties.pop("line_profile", None)
+        return
+    try:
+        codes = target_codes(case.func, names)
+    except (AttributeError, TypeError, ValueError) as e:
+        properties["line_profile"] = {"error": str(e)}
+        return
+
+    args, kw = case.inputs() if case.inputs is not None else ((), {})
+    stats = profile_lines(partial(case.func, *args, **kw), codes)
+    fname = line_profile_path(src, case.label)
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    with open(fname, "w", encoding="utf-8") as f:
+        f.write(f"{os.path.relpath(src)}:{case.label}\n\n")
+        f.write(annotate_source(stats, codes, kwargs.unit))
+    properties["line_profile"] = {"file": os.path.relpath(fname)}
+    hottest = hottest_line(stats)
+    if hottest is not None:
+        properties["line_profile"]["hottest"] = "{}:{}".format(
+            os.path.relpath(hottest["file"]), hottest["line"]
+        )
+        properties["line_profile"]["fraction"] = hottest["fraction"]
+
+
+def _measure_cold(
+    case: SpCase, src: str, properties: Dict[str, Any], kwargs: Kwargs
+) -> List[str]:
+    """Measures a case from cold in fresh interpreters, storing the result."""
+    lhs_print = "    cold start ".ljust(kwargs.print_pad_width, "-")
+    try:
+        properties["cold"] = measure_cold_start(
+            src, case.label, kwargs.nreps, _case_timeout(case, kwargs)
+        )
+    except Exception as e:  # pragma: no cover
+        properties.pop("cold", None)
+        if isinstance(e, BenchmarkTimeout):
+            properties["status"] = "timeout"
+        return [f"{lhs_print} {_stringify_failure(e, kwargs)}"]
+    return [
+        "{} import {}, first call {}, warm {}".format(
+            lhs_print,
+            map_stringify_time(kwargs.unit, properties["cold"]["import"]),
+            map_stringify_time(kwargs.unit, properties["cold"]["first_call"]),
+            map_stringify_time(kwargs.unit, properties["score"]),
+        )
+    ]
+
+
+def _time_round(
+    timer: timeit.Timer,
+    nloops: int,
+    regions: Dict[str, int],
+    usage: Optional[List[float]],
+) -> float:
+    """Times one round of `nloops` calls, adding its regions and usage to the totals."""
+    reset_regions()
+    before = rusage_snapshot() if usage is not None else None
+    score = timer.timeit(nloops)
+    if usage is not None:
+        accumulate_rusage(usage, before, rusage_snapshot())
+    for name, ns in region_totals().items():
+        regions[name] = regions.get(name, 0) + ns
+    return score
+
+
+def _time_group(
+    members: List[Tuple[SpCase, Dict[str, Any]]], kwargs: Kwargs
+) -> List[Optional[Exception]]:
+    """Times the members of a group in interleaved rounds.
+
+    Each round runs every member once with its calibrated number of loops, rotating
+    which member goes first, so drift over time affects all members equally.
+
+    Returns
+    -------
+    List[Optional[Exception]]
+        The exception raised by each member, or None if it was timed successfully.
+    """
+    timers = [_case_timer(case) for case, _ in members]
+    scores: List[List[float]] = [[] for _ in members]
+    regions: List[Dict[str, int]] = [{} for _ in members]
+    usages: List[Optional[List[float]]] = [
+        [0.0] * 6 if kwargs.rusage and rusage_available() else None for _ in members
+    ]
+    errors: List[Optional[Exception]] = [None] * len(members)
+
+    for j, (case, properties) in enumerate(members):
+        try:
+            _attach_work(case, properties)
+        except Exception as e:  # pragma: no cover
+            errors[j] = e
+
+    for rnd in range(kwargs.nreps):
+        for k in range(len(members)):
+            j = (rnd + k) % len(members)
+            if errors[j] is not None:
+                continue
+            try:
+                scores[j].append(
+                    _time_round(
+                        timers[j], members[j][1]["nloops"], regions[j], usages[j]
+                    )
+                )
+            except Exception as e:  # pragma: no cover
+                errors[j] = e
+
+    for (_, properties), member_scores, member_regions, usage, error in zip(
+        members, scores, regions, usages, errors
+    ):
+        if error is None:
+            _record_scores(properties, member_scores, kwargs, member_regions, usage)
+    return errors
+
+
+def _run_group(
+    cases: List[SpCase], src: str, kwargs: Kwargs, cache_data
+) -> Tuple[List[Dict[str, Any]], List[Optional[Exception]]]:
+    """Calibrates and times the members of a group, returning their properties."""
+    members = [(case, _calibrate_case(case, src, kwargs, cache_data)) for case in cases]
+    errors = _time_group(members, kwargs)
+    for (case, properties), error in zip(members, errors):
+        if error is None:
+            _apply_limits(case, src, properties, kwargs)
+            _count_case(case, properties, kwargs)
+            _line_profile_case(case, src, properties, kwargs)
+    return [properties for _, properties in members], errors
+
+
+def _stringify_group(
+    name: str,
+    members: List[Tuple[SpCase, Dict[str, Any]]],
+    errors: List[Optional[Exception]],
+    kwargs: Kwargs,
+    nloops_pad_width: int,
+    previous: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Ranks the members of a timed group, and prints their speedup to the baseline.
+
+    The baseline is the member marked `baseline=True`, else the first member. Its
+    speedup over each member is computed per interleaved round, and summarized with
+    its 95% confidence interval. `previous` maps labels onto cached results.
+    """
+    failed = [
+        f"     {case.label} ".ljust(kwargs.print_pad_width, "-")
+        + f" {_stringify_failure(e, kwargs)}"
+        for (case, _), e in zip(members, errors)
+        if e is not None
+    ]
+    timed = [(c, p) for (c, p), e in zip(members, errors) if e is None]
+    baseline = next((c.label for c, _ in timed if c.method.baseline), None)
+    return _stringify_ranking(
+        name,
+        [(c.label, p) for c, p in timed],
+        baseline,
+        kwargs,
+        nloops_pad_width,
+        previous,
+    ) + (failed if timed else [])
+
+
+def _stringify_ranking(
+    name: str,
+    members: List[Tuple[str, Dict[str, Any]]],
+    baseline: Optional[str],
+    kwargs: Kwargs,
+    nloops_pad_width: int,
+    previous: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Ranks the timed members of a group, given as (label, properties).
+
+    `baseline` is the label of the baseline member, else the first member is used.
+    The samples of each member are paired with those of the baseline by round, so
+    members must hold the same rounds, in the same order.
+    """
+    if not members:
+        return []
+
+    baseline_label, baseline_properties = next(
+        (m for m in members if m[0] == baseline), members[0]
+    )
+    rounds = f"{kwargs.nreps} interleaved round{'s' if kwargs.nreps != 1 else ''}"
+    if kwargs.replicas > 1:
+        rounds += f" in each of {kwargs.replicas} replicas"
+    lines = [f"\ngroup '{name}' ranked against '{baseline_label}' ({rounds}):"]
+
+    for rank, (label, properties) in enumerate(
+        sorted(members, key=lambda m: m[1]["score"]), start=1
+    ):
+        properties["group"] = name
+        ratios = paired_ratios(baseline_properties["samples"], properties["samples"])
+        speedup, lower, upper = mean_confidence_interval(ratios)
+        properties["speedup"] = speedup
+        properties["speedup_ci"] = [lower, upper]
+
+        if label == baseline_label:
+            rhs = "baseline"
+        elif len(ratios) > 1:
+            rhs = f"{speedup:.2f}x [{lower:.2f}x, {upper:.2f}x]"
+        else:
+            rhs = f"{speedup:.2f}x"
+
+        lhs = f"  {rank}. {label} ".ljust(kwargs.print_pad_width, "-")
+        time_print = stringify_result(properties, kwargs.unit, nloops_pad_width)
+        lines.append(f"{lhs} {time_print}, {rhs}")
+        lines += _stringify_details(properties, kwargs, (previous or {}).get(label))
+    return lines
+
+
+def matches_keyword(name: str, keyword: str) -> bool:
+    """Whether the benchmark `name`, as 'path:label', is selected by `-k keyword`.
+
+    The keyword selects names containing it, or matching it as a glob pattern.
+    """
+    return keyword in name or fnmatch.fnmatchcase(name, keyword)
+
+
+def _matches_in_file(rel_path: str, keyword: str, label: str) -> bool:
+    """Whether the case `label` of the file at `rel_path` is selected by `-k`."""
+    return matches_keyword(f"{rel_path}:{label}", keyword)
+
+
+def _import_source(src: str):
+    """Imports a speed file as a module, adding its directory to sys.path."""
+    script_name = os.path.splitext(os.path.basename(src))[0]
+    # absolute, as a relative entry would resolve against whatever the working
+    # directory is at the time of a later import.
+    dir_shift_to_script = os.path.dirname(os.path.abspath(src))
+
+    # -------------------------------------------------------------
+    #   Include the current script on the system PATH
+    # -------------------------------------------------------------
+    if dir_shift_to_script not in sys.path:
+        # insert path into sys.path
+        sys.path.append(dir_shift_to_script)
+
+    # import module
+    return importlib.import_module(script_name)
+
+
+def _nloops_pad_width(cache_data) -> int:
+    """Configures the spacing of the {} loops, text on the print out."""
+    if not cache_data:
+        return 10  # default
+    # collect 'nloops' property across the cache.
+    loopies = list(
+        it.chain.from_iterable(
+            [[cache_data[y][x]["nloops"] for x in cache_data[y]] for y in cache_data]
+        )
+    )
+    # the length of the integer + 6 is set to the new pad width (always correct.)
+    return 6 + max(map(len, map(str, loopies)), default=4)
+
+
+def _process_source_file(
+    src: str,
+    kwargs: Kwargs,
+    cache_data,
+    only: Optional[Set[str]] = None,
+    fixture_cache: Optional[Dict[str, Any]] = None,
+):
     """
     Processes a given source file and times all detected methods within.
 
+    Members of a group are timed last, interleaved with each other, and reported
+    as a ranked table.
+
     Parameters
     ----------
     src : str
@@ -95,12 +862,18 @@ def _process_source_file(src: str, kwargs: Kwargs, cache_data):
         cache usage, and output formatting.
     cache_data : dict
         Cacheable data containing previously computed timing results.
+    only : set of str, optional
+        Names of the speed methods to time; all methods if None.
+    fixture_cache : dict, optional
+        Fixture results to reuse, and to store any newly computed fixtures in.
 
     Returns
     -------
     writable_speedtest_cache : dict
         Writable items to store in cache files, mapping source files and method
         signatures to timing properties.
+    prints : list of str
+        The lines printed for this file.
     """
 
     # -------------------------------------------------------------
@@ -109,174 +882,623 @@ def _process_source_file(src: str, kwargs: Kwargs, cache_data):
     children = parse_python_to_tree(Path(src))
 
     log = partial(log_output, kwargs=kwargs)
+    # selected here, as well as in the session, for worker processes.
+    use_clock(kwargs.clock)
 
     # load the Python script as a module first.
-    # firstly, add the Python script into the sys.path field.
     script_name = os.path.splitext(os.path.basename(src))[0]
     rel_path_to_script = os.path.relpath(src, os.getcwd())
-    dir_shift_to_script = os.path.dirname(rel_path_to_script)
+    module_ = _import_source(src)
+
+    # computed once per session, across every file, unless timing a single file.
+    nloops_pad_width = kwargs.nloops_pad_width or _nloops_pad_width(cache_data)
+
+    writable_speedtest_cache = {}
+    prints = []
+
+    def emit(print_str: str) -> None:
+        if not kwargs.parallel:
+            log(print_str)
+        prints.append(print_str)
 
     # -------------------------------------------------------------
-    #   Include the current script on the system PATH
+    #       Loop over every function name that was detected
+    #       and time it.
     # -------------------------------------------------------------
-    if dir_shift_to_script != "" and dir_shift_to_script not in sys.path:
-        # insert path into sys.path
-        sys.path.append(dir_shift_to_script)
+    # cases are streamed through the -k filter, so unselected cases are never built.
+    select = None
+    if kwargs.keyword:
+        select = partial(_matches_in_file, rel_path_to_script, kwargs.keyword)
+    cases = it.chain.from_iterable(
+        _iter_cases(module_, m, fixture_cache, select)
+        for m in children.methods
+        if only is None or m.name in only
+    )
+    # group members, keyed on the group name and parameters.
+    groups: Dict[str, List[SpCase]] = {}
 
-    # import module
-    module_ = importlib.import_module(script_name)
+    for i, case in enumerate(cases):
+        # defer group members, so that they can be timed interleaved.
+        if case.method.group is not None:
+            key = case.method.group + case.label[len(case.method.name) :]
+            groups.setdefault(key, []).append(case)
+            continue
+
+        lhs_print = f"{rel_path_to_script}:{case.label} ".ljust(
+            kwargs.print_pad_width, "-"
+        )
+
+        # once the session budget is spent, keep any previous result.
+        if kwargs.deadline > 0 and time.time() >= kwargs.deadline:
+            if src in cache_data and case.label in cache_data[src]:
+                writable_speedtest_cache.setdefault(src, {})[case.label] = (
+                    _failed_properties(case, src, cache_data, "skipped")
+                )
+            emit(f"{lhs_print} SKIPPED (session budget)")
+            continue
+
+        # benchmarks with a time limit run in a child process, which is killed
+        # if it hangs; otherwise the case is timed in this process.
+        timeout = _clamp_to_deadline(_case_timeout(case, kwargs), kwargs)
+        run_case = partial(_run_case, case, src, kwargs, cache_data)
+        if timeout is not None:
+            timer_func = partial(run_with_timeout, run_case, timeout)
+        else:
+            timer_func = run_case
+        if not kwargs.parallel:
+            timer_func = optional_rich_status(
+                f"Processing '{script_name}.py' ({i + 1}: {case.label})..."
+            )(timer_func)
+
+        # wrap the function call in try-catch.
+        try:
+            properties = timer_func()
+            rhs_print = stringify_result(properties, kwargs.unit, nloops_pad_width)
+
+        except Exception as e:  # pragma: no cover
+            # print the exception.
+            status = "timeout" if isinstance(e, BenchmarkTimeout) else "failed"
+            properties = _failed_properties(case, src, cache_data, status)
+            rhs_print = _stringify_failure(e, kwargs)
+
+        writable_speedtest_cache.setdefault(src, {})[case.label] = properties
+        emit(f"{lhs_print} {rhs_print}")
+        if properties.get("status") == "ok":
+            for line in _stringify_details(
+                properties, kwargs, cache_data.get(src, {}).get(case.label)
+            ):
+                emit(line)
+            if kwargs.cold:
+                for line in _measure_cold(case, src, properties, kwargs):
+                    emit(line)
 
     # -------------------------------------------------------------
-    #   Configures the spacing of the {} loops, text on the
-    #       print out
+    #       Time each group interleaved, and rank its members.
     # -------------------------------------------------------------
-    nloops_pad_width = 10  # default
-    if cache_data:
-        # collect 'nloops' property across the cache.
-        loopies = list(
-            it.chain.from_iterable(
-                [
-                    [cache_data[y][x]["nloops"] for x in cache_data[y]]
-                    for y in cache_data
-                ]
+    for name, group_cases in groups.items():
+        lhs_print = f"{rel_path_to_script}:{name} ".ljust(kwargs.print_pad_width, "-")
+
+        if kwargs.deadline > 0 and time.time() >= kwargs.deadline:
+            for case in group_cases:
+                if src in cache_data and case.label in cache_data[src]:
+                    writable_speedtest_cache.setdefault(src, {})[case.label] = (
+                        _failed_properties(case, src, cache_data, "skipped")
+                    )
+            emit(f"{lhs_print} SKIPPED (session budget)")
+            continue
+
+        # a group is limited to the combined time limits of its members.
+        timeouts = [_case_timeout(case, kwargs) for case in group_cases]
+        timeout = _clamp_to_deadline(
+            sum(timeouts) if None not in timeouts else None, kwargs
+        )
+        run_group = partial(_run_group, group_cases, src, kwargs, cache_data)
+        if timeout is not None:
+            timer_func = partial(run_with_timeout, run_group, timeout)
+        else:
+            timer_func = run_group
+        if not kwargs.parallel:
+            timer_func = optional_rich_status(
+                f"Processing '{script_name}.py' group '{name}'..."
+            )(timer_func)
+
+        try:
+            all_properties, errors = timer_func()
+        except Exception as e:  # pragma: no cover
+            status = "timeout" if isinstance(e, BenchmarkTimeout) else "failed"
+            for case in group_cases:
+                writable_speedtest_cache.setdefault(src, {})[case.label] = (
+                    _failed_properties(case, src, cache_data, status)
+                )
+            emit(f"\ngroup {lhs_print} {_stringify_failure(e, kwargs)}")
+            continue
+
+        members = list(zip(group_cases, all_properties))
+        for (case, properties), error in zip(members, errors):
+            if error is not None:
+                properties["status"] = "failed"
+            writable_speedtest_cache.setdefault(src, {})[case.label] = properties
+        for line in _stringify_group(
+            f"{rel_path_to_script}:{name}",
+            members,
+            errors,
+            kwargs,
+            nloops_pad_width,
+            cache_data.get(src, {}),
+        ):
+            emit(line)
+        if kwargs.cold:
+            for (case, properties), error in zip(members, errors):
+                if error is None:
+                    for line in _measure_cold(case, src, properties, kwargs):
+                        emit(line)
+
+    # -------------------------------------------------------------
+    #       Report the slowest imports, from the cold starts.
+    # -------------------------------------------------------------
+    cold_imports = [
+        p["cold"]["imports"]
+        for p in writable_speedtest_cache.get(src, {}).values()
+        if "cold" in p and p.get("status") == "ok"
+    ]
+    if cold_imports:
+        emit(f"\nslowest imports of '{rel_path_to_script}' (median of {kwargs.nreps}):")
+        for module, self_time, cumulative in cold_imports[0]:
+            lhs_print = f"  {module} ".ljust(kwargs.print_pad_width, "-")
+            emit(
+                "{} {} cumulative, {} self".format(
+                    lhs_print,
+                    map_stringify_time(kwargs.unit, cumulative),
+                    map_stringify_time(kwargs.unit, self_time),
+                )
             )
+
+    return writable_speedtest_cache, prints
+
+
+def _run_interleaved(
+    srcs: List[str], kwargs: Kwargs, cache_data, logger: Callable[[str], None]
+) -> Dict[str, Any]:
+    """Times every benchmark of a session in rounds, run in a seeded random order.
+
+    Each case is calibrated, then each of its repeats becomes a round of `nloops`
+    calls. The rounds of all cases are shuffled together with `kwargs.seed`, so that
+    any drift over the session, such as turbo decay or throttling, is spread across
+    the benchmarks instead of being confounded with them. Results are printed once
+    all rounds have run; groups are ranked from their members' rounds.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Writable items to store in cache files, as for _process_source_file().
+    """
+    nloops_pad_width = kwargs.nloops_pad_width or _nloops_pad_width(cache_data)
+
+    # -------------------------------------------------------------
+    #       Collect and calibrate every case of every file.
+    # -------------------------------------------------------------
+    entries: List[Tuple[str, SpCase]] = []
+    for src in srcs:
+        module_ = _import_source(src)
+        rel_path_to_script = os.path.relpath(src, os.getcwd())
+        for method in parse_python_to_tree(Path(src)).methods:
+            select = None
+            if kwargs.keyword:
+                select = partial(_matches_in_file, rel_path_to_script, kwargs.keyword)
+            for case in _iter_cases(module_, method, select=select):
+                entries.append((src, case))
+
+    # benchmarks with a time limit are calibrated in a child process, which is
+    # killed if the case hangs, even inside C code. Their rounds are then timed in
+    # this process under an alarm, as forking per round would time each round cold.
+    budgets = [_case_timeout(case, kwargs) for _, case in entries]
+
+    def within_budget(
+        i: int,
+        func: Callable[[], Any],
+        limit: Callable[[Callable[[], Any], float], Any] = run_with_timeout,
+    ) -> Any:
+        timeout = _clamp_to_deadline(budgets[i], kwargs)
+        if timeout is None:
+            return func()
+        started = time.perf_counter()
+        try:
+            return limit(func, max(timeout, 0.0))
+        finally:
+            if budgets[i] is not None:
+                budgets[i] -= time.perf_counter() - started
+
+    all_properties: List[Dict[str, Any]] = []
+    errors: List[Optional[Exception]] = []
+    for i, (src, case) in enumerate(entries):
+        properties: Dict[str, Any] = {}
+        try:
+            properties = within_budget(
+                i, partial(_calibrate_case, case, src, kwargs, cache_data)
+            )
+            _attach_work(case, properties)
+            errors.append(None)
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+        all_properties.append(properties)
+
+    # -------------------------------------------------------------
+    #       Time the rounds of all cases in a random order.
+    # -------------------------------------------------------------
+    timers = [_case_timer(case) for _, case in entries]
+    scores: List[List[float]] = [[] for _ in entries]
+    regions: List[Dict[str, int]] = [{} for _ in entries]
+    usages: List[Optional[List[float]]] = [
+        [0.0] * 6 if kwargs.rusage and rusage_available() else None for _ in entries
+    ]
+    rounds = [i for i in range(len(entries)) for _ in range(kwargs.nreps)]
+    random.Random(kwargs.seed).shuffle(rounds)
+
+    def time_round(i: int) -> Tuple[float, Dict[str, int], Optional[List[float]]]:
+        # the totals are returned, in case the limit falls back to a child process.
+        score = _time_round(
+            timers[i], all_properties[i]["nloops"], regions[i], usages[i]
         )
-        # the length of the integer + 6 is set to the new pad width (always correct.)
-        nloops_pad_width = 6 + max(map(len, map(str, loopies)))
+        return score, regions[i], usages[i]
+
+    def time_rounds() -> None:
+        for i in rounds:
+            # once the session budget is spent, the remaining rounds are skipped.
+            if kwargs.deadline > 0 and time.time() >= kwargs.deadline:
+                break
+            if errors[i] is not None:
+                continue
+            try:
+                score, regions[i], usages[i] = within_budget(
+                    i, partial(time_round, i), call_with_alarm
+                )
+                scores[i].append(score)
+            except Exception as e:  # pragma: no cover
+                errors[i] = e
+
+    optional_rich_status(f"Timing {len(rounds)} interleaved rounds...")(time_rounds)()
 
-    writable_speedtest_cache = {}
-    prints = []
     # -------------------------------------------------------------
-    #       Loop over every function name that was detected
-    #       and time it.
+    #       Record and print the results, file by file.
     # -------------------------------------------------------------
-    for i, method in enumerate(children.methods):
-        # get function method as an object.
-        script_func = getattr(module_, method.name)
-
-        #   check if script_func is a generator - this indicates that its part of a
-        #   parametrize() call.
-        if inspect.isgenerator(script_func):
-            # loop over the functions.
-            funcs = [f for f in script_func]
+    writable_speedtest_cache: Dict[str, Any] = {}
+    for (src, case), properties, case_scores, case_regions, usage, error in zip(
+        entries, all_properties, scores, regions, usages, errors
+    ):
+        if error is None and case_scores:
+            _record_scores(properties, case_scores, kwargs, case_regions, usage)
+            _apply_limits(case, src, properties, kwargs)
+            _count_case(case, properties, kwargs)
+            _line_profile_case(case, src, properties, kwargs)
+            properties["seed"] = kwargs.seed
+        elif error is None:
+            if src not in cache_data or case.label not in cache_data[src]:
+                continue
+            properties = _failed_properties(case, src, cache_data, "skipped")
         else:
-            funcs = [script_func]
+            status = "timeout" if isinstance(error, BenchmarkTimeout) else "failed"
+            properties = _failed_properties(case, src, cache_data, status)
+        writable_speedtest_cache.setdefault(src, {})[case.label] = properties
+
+    for src in srcs:
+        rel_path_to_script = os.path.relpath(src, os.getcwd())
+        groups: Dict[str, List[Tuple[SpCase, Dict[str, Any]]]] = {}
+        group_errors: Dict[str, List[Optional[Exception]]] = {}
+        group_skipped: Dict[str, List[SpCase]] = {}
+        for (case_src, case), properties, case_scores, error in zip(
+            entries, all_properties, scores, errors
+        ):
+            if case_src != src:
+                continue
+            if case.method.group is not None:
+                key = case.method.group + case.label[len(case.method.name) :]
+                if error is None and not case_scores:
+                    group_skipped.setdefault(key, []).append(case)
+                    continue
+                groups.setdefault(key, []).append((case, properties))
+                group_errors.setdefault(key, []).append(error)
+                continue
+
+            lhs_print = f"{rel_path_to_script}:{case.label} ".ljust(
+                kwargs.print_pad_width, "-"
+            )
+            if error is not None:
+                logger(f"{lhs_print} {_stringify_failure(error, kwargs)}")
+                continue
+            if not case_scores:
+                logger(f"{lhs_print} SKIPPED (session budget)")
+                continue
+            logger(
+                f"{lhs_print} {stringify_result(properties, kwargs.unit, nloops_pad_width)}"
+            )
+            for line in _stringify_details(
+                properties, kwargs, cache_data.get(src, {}).get(case.label)
+            ):
+                logger(line)
+            if kwargs.cold:
+                for line in _measure_cold(case, src, properties, kwargs):
+                    logger(line)
+
+        for name in {**groups, **group_skipped}:
+            for line in _stringify_group(
+                f"{rel_path_to_script}:{name}",
+                groups.get(name, []),
+                group_errors.get(name, []),
+                kwargs,
+                nloops_pad_width,
+                cache_data.get(src, {}),
+            ):
+                logger(line)
+            for case in group_skipped.get(name, []):
+                lhs = f"     {case.label} ".ljust(kwargs.print_pad_width, "-")
+                logger(f"{lhs} SKIPPED (session budget)")
+
+    return writable_speedtest_cache
+
+
+def _method_of_label(methods: List[SpMethod], label: str) -> Optional[SpMethod]:
+    """Finds the speed method of a case label, which may be followed by parameters."""
+    for method in sorted(methods, key=lambda m: len(m.name), reverse=True):
+        if label == method.name or (
+            label.startswith(method.name) and label[len(method.name)] in "[{"
+        ):
+            return method
+    return None
+
+
+def _combine_replicas(
+    runs: List[Tuple[int, Dict[str, Any]]], kwargs: Kwargs
+) -> Dict[str, Any]:
+    """Pools the samples of a benchmark from each replica, given their hash seeds.
+
+    The variance of the samples is split into that within a process and that
+    between processes, and the confidence interval is that of the mean of the
+    replica means, as samples from one process are not independent of each other.
+    A benchmark which did not run cleanly in every replica takes its first status.
+    The speedup of a group member is dropped, as it is ranked again on the pooled
+    samples, which stay paired by round as every replica runs the same rounds.
+    """
+    for _, properties in runs:
+        if properties.get("status", "ok") != "ok":
+            return properties
+
+    properties = dict(runs[0][1])
+    for key in ("group", "speedup", "speedup_ci"):
+        properties.pop(key, None)
+    groups = [p["samples"] for _, p in runs]
+    properties["samples"] = [x for g in groups for x in g]
+    properties["score"] = min(properties["samples"])
+    _derive_rates(properties, kwargs)
+
+    means = [statistics.fmean(g) for g in groups]
+    _, lower, upper = mean_confidence_interval(means)
+    replicas: Dict[str, Any] = {
+        "hash_seeds": [seed for seed, _ in runs],
+        "means": means,
+        "ci": [lower, upper],
+    }
+    if len(groups) > 1 and len(properties["samples"]) > len(groups):
+        within, between = variance_components(groups)
+        replicas["within_stdev"] = math.sqrt(within)
+        replicas["between_stdev"] = math.sqrt(between)
+    properties["replicas"] = replicas
+    return properties
+
 
-        # if the function has any fixtures, run the fixtures first and collect the arguments to attach to the function.
-        if method.fixtures:
-            results = [getattr(module_, fix)() for fix in method.fixtures]
-            # map keyword arguments
-            fixture_kws = {fix: data for fix, data in zip(method.fixtures, results)}
+def _run_replicas(
+    srcs: List[str], kwargs: Kwargs, cache_data, logger: Callable[[str], None]
+) -> Dict[str, Any]:
+    """Times every file in `kwargs.replicas` fresh processes, and pools their samples.
+
+    Each replica times each file in a new spawned process, with its own
+    PYTHONHASHSEED, so that hash seeds, memory layout and allocator state vary
+    between replicas instead of being fixed for the session. Replicas run one after
+    the other, with their files in parallel with --parallel. The first replica
+    calibrates the number of loops, which the others reuse.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Writable items to store in cache files, as for _process_source_file().
+    """
+    rng = random.Random(kwargs.seed)
+    hash_seeds = [rng.randrange(2**32) for _ in range(kwargs.replicas)]
+    # workers collect their prints instead of printing; results are printed pooled.
+    child_kwargs = dataclasses.replace(kwargs, parallel=True, replicas=1)
+    num_processes = max(min(len(srcs), cpu_count() - 1), 1) if kwargs.parallel else 1
+
+    replicas: List[Dict[str, Any]] = []
+    previous_seed = os.environ.get("PYTHONHASHSEED")
+    try:
+        for r, hash_seed in enumerate(hash_seeds):
+            # inherited by the processes spawned for this replica only.
+            os.environ["PYTHONHASHSEED"] = str(hash_seed)
+            mp_args = [
+                (src, child_kwargs, cache_data if r == 0 else replicas[0])
+                for src in srcs
+            ]
+            with get_context("spawn").Pool(
+                processes=num_processes, maxtasksperchild=1
+            ) as pool:
+                results = optional_rich_status(
+                    f"Timing replica {r + 1}/{len(hash_seeds)}..."
+                )(pool.starmap)(_process_source_file, mp_args)
+            replica: Dict[str, Any] = {}
+            for cache_, _ in results:
+                replica.update(cache_)
+            replicas.append(replica)
+    finally:
+        if previous_seed is None:
+            os.environ.pop("PYTHONHASHSEED", None)
         else:
-            fixture_kws = {}
-
-        # loop over the functions and apply them.
-        for script in funcs:
-            # use inspect to extract any parameters, and add them to the print statement.
-            sig = inspect.getfullargspec(script)
-            if sig.kwonlydefaults:
-                printable_parameters = (
-                    "{"
-                    + ",".join(
-                        ["'{}'={}".format(k, v) for k, v in sig.kwonlydefaults.items()]
-                    )
-                    + "}"
-                )
-            else:
-                printable_parameters = ""
+            os.environ["PYTHONHASHSEED"] = previous_seed
 
-            # if any fixtures are defined, attach them to script using partial(...)
-            if len(fixture_kws) > 0:
-                script = partial(script, **fixture_kws)
+    writable_speedtest_cache: Dict[str, Any] = {}
+    for src in srcs:
+        rel_path_to_script = os.path.relpath(src, os.getcwd())
+        methods = parse_python_to_tree(Path(src)).methods
+        labels = dict.fromkeys(
+            label for replica in replicas for label in replica.get(src, {})
+        )
+        # group members, keyed on the group name and parameters.
+        groups: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        group_baselines: Dict[str, str] = {}
+        group_failed: Dict[str, List[str]] = {}
+        for label in labels:
+            properties = _combine_replicas(
+                [
+                    (seed, replica[src][label])
+                    for seed, replica in zip(hash_seeds, replicas)
+                    if label in replica.get(src, {})
+                ],
+                kwargs,
+            )
+            writable_speedtest_cache.setdefault(src, {})[label] = properties
 
-            timer = timeit.Timer(script)
+            # groups are ranked on the samples pooled from every replica.
+            method = _method_of_label(methods, label)
+            if method is not None and method.group is not None:
+                key = method.group + label[len(method.name) :]
+                if properties.get("status", "ok") != "ok":
+                    lhs = f"     {label} ".ljust(kwargs.print_pad_width, "-")
+                    group_failed.setdefault(key, []).append(
+                        f"{lhs} {properties['status'].upper()}"
+                    )
+                    continue
+                groups.setdefault(key, []).append((label, properties))
+                if method.baseline:
+                    group_baselines[key] = label
+                continue
 
-            # check if the cache contains the function specified.
-            if (not kwargs.ignore_cache or not kwargs.no_cache) and (
-                src in cache_data
-                and (method.name + printable_parameters) in cache_data[src]
+            lhs_print = f"{rel_path_to_script}:{label} ".ljust(
+                kwargs.print_pad_width, "-"
+            )
+            if properties.get("status", "ok") != "ok":
+                logger(f"{lhs_print} {properties['status'].upper()}")
+                continue
+            logger(
+                f"{lhs_print} {stringify_result(properties, kwargs.unit, kwargs.nloops_pad_width)}"
+            )
+            for line in _stringify_details(
+                properties, kwargs, cache_data.get(src, {}).get(label)
             ):
-                # extract nloops from cache, skip step.
-                properties = cache_data[src][method.name + printable_parameters]
-            else:
-                # compute using autorange.
-                try:
-                    nloops, best_score = timer.autorange()
-                    # append data to the cache.
-                    properties = {"nloops": nloops, "score": best_score / nloops}
-                    if sig.kwonlydefaults:
-                        properties.update(
-                            {"param__" + k: v for k, v in sig.kwonlydefaults.items()}
-                        )
-                except Exception:
-                    properties = {"nloops": 5, "score": 0}
-
-            # using best n-loops, repeat rep times.
-            # on recommendation of the timer.repeat docstrings - we take the min() of the scores as a lower-bound for best-case-scenario of speed.
-            # wrap the function call in try-catch.
-            try:
-                if not kwargs.parallel:
-                    timer_func = optional_rich_status(
-                        f"Processing '{script_name}.py' ({i+1}/{len(children.methods)})..."
-                    )(timer.repeat)
-                else:
-                    timer_func = timer.repeat
-
-                # run the timer and collect the scores.
-                scores = timer_func(repeat=kwargs.nreps, number=properties["nloops"])
-                # scores = timer.repeat(repeat=kwargs.nreps, number=properties["nloops"])
-                best_time_loop = min(scores) / properties["nloops"]
-                # update the best score to store in the cache.
-                properties["score"] = best_time_loop
-
-                rhs_print = "{} loop{}".format(
-                    properties["nloops"], "s" if properties["nloops"] != 1 else ""
-                ).ljust(nloops_pad_width) + ", {} per loop".format(
-                    stringify_time(properties["score"])
-                    if kwargs.unit == "auto"
-                    else map_stringify_time(kwargs.unit, properties["score"])
-                )
+                logger(line)
 
-            except Exception as e:  # pragma: no cover
-                # print the exception.
-                if kwargs.verbose < 1:
-                    rhs_print = f"FAILED ({e.__class__.__name__})"
-                else:
-                    rhs_print = f"FAILED ({e.__class__.__name__}): {e}"
-
-            if src in writable_speedtest_cache:
-                writable_speedtest_cache[src][
-                    method.name + printable_parameters
-                ] = properties
-            else:
-                writable_speedtest_cache[src] = {
-                    method.name + printable_parameters: properties
-                }
-
-            # calculate the average time per loop
-            lhs_print = (
-                f"{rel_path_to_script}:{method.name}{printable_parameters} ".ljust(
-                    kwargs.print_pad_width, "-"
-                )
-            )
+        for key in {**groups, **group_failed}:
+            for line in _stringify_ranking(
+                f"{rel_path_to_script}:{key}",
+                groups.get(key, []),
+                group_baselines.get(key),
+                kwargs,
+                kwargs.nloops_pad_width,
+                cache_data.get(src, {}),
+            ) + group_failed.get(key, []):
+                logger(line)
+    return writable_speedtest_cache
 
-            print_str = f"{lhs_print} {rhs_print}"
 
-            if not kwargs.parallel:
-                log(print_str)
+def _run_precheck(
+    kwargs: Kwargs, logger: Callable[[str], None]
+) -> Tuple[Dict[str, List[float]], List[str]]:
+    """Times the calibration kernels and checks whether the system is noisy.
 
-            prints.append(print_str)
+    Optionally waits up to `kwargs.wait_quiet` seconds for the system to settle.
+
+    Returns
+    -------
+    suite : Dict[str, List[float]]
+        Repeat timings of each calibration kernel.
+    noise : List[str]
+        Reasons why the system is noisy, empty if it is quiet.
+    """
+    waited = 0.0
+    while True:
+        throttles = throttle_count()
+        suite = run_calibration_suite()
+        noise = system_noise(throttles) + kernel_noise(suite)
+        if not noise or waited >= kwargs.wait_quiet:
+            break
+        time.sleep(1.0)
+        waited += 1.0
+
+    for reason in noise:
+        logger(f"WARNING: noisy system, {reason}.")
+    return suite, noise
 
-    return writable_speedtest_cache, prints
 
+def _validate_cache(
+    cache_data: Dict[str, Any], logger: Callable[[str], None]
+) -> Dict[str, Any]:
+    """Discards the cache if it was written on a different environment.
+
+    Calibration is only valid on the environment which produced it, so the stale
+    shards are also removed from disk, including those of files not run again. A
+    cache without a fingerprint, written by an earlier version, is adopted by this
+    environment instead.
+    """
+    if not cache_data:
+        return cache_data
+
+    cached_fingerprint = read_cache("fingerprint.json")
+    changed = fingerprint_diff(
+        cached_fingerprint,
+        collect_fingerprint(cached_fingerprint.get("packages", {})),
+    )
+    if not cached_fingerprint:
+        logger("WARNING: cache has no environment fingerprint; adopting it.")
+        write_cache(collect_fingerprint([]), "fingerprint.json")
+        return cache_data
+    if changed:
+        logger(
+            "WARNING: environment changed since the cache was written ({}); "
+            "recalibrating.".format(", ".join(changed))
+        )
+        clear_cache(getattr(cache_data, "cache_dir", None))
+        return {}
+    return cache_data
 
-def run_session(kwargs: Kwargs, logger: Callable[[str], None]) -> None:
+
+def _exit_code(
+    writable_speedtest_cache: Dict[str, Any], logger: Callable[[str], None]
+) -> int:
+    """Summarizes failed benchmarks and exceeded limits into an exit code.
+
+    Returns 1 if any benchmark failed, timed out or exceeded a limit, else 0.
+    """
+    statuses = [
+        properties.get("status")
+        for items in writable_speedtest_cache.values()
+        for properties in items.values()
+    ]
+    failed = sum(status in ("failed", "timeout") for status in statuses)
+    exceeded = sum(
+        properties.get("status") == "ok" and bool(properties.get("violations"))
+        for items in writable_speedtest_cache.values()
+        for properties in items.values()
+    )
+    if failed or exceeded:
+        logger(
+            "\n{} benchmark{} failed, {} exceeded {} limits.".format(
+                failed,
+                "s" if failed != 1 else "",
+                exceeded,
+                "their" if exceeded != 1 else "its",
+            )
+        )
+        return 1
+    return 0
+
+
+def run_session(kwargs: Kwargs, logger: Callable[[str], None]) -> int:
     """Launches a speedtest session.
 
     Args:
         sources (list[str]): List of Python file sources.
         kwargs (Kwargs): keyword arguments.
         logger (Callable[[str], None]): Logging function.
+
+    Returns:
+        int: The exit code; 1 if any benchmark failed or exceeded a limit, else 0.
     """
 
     # display version and initial command prompt to user.
@@ -297,33 +1519,113 @@ def run_session(kwargs: Kwargs, logger: Callable[[str], None]) -> None:
     # --------------------------------------------------------------------------------------------
     #   Collect all Python files.
     # --------------------------------------------------------------------------------------------
-    parsable_files = _discover_source_files(kwargs.file_or_dir)
+    parsable_files = sorted(_discover_source_files(kwargs.file_or_dir))
+    # shards of the cache are read lazily, by the process timing each file.
+    read_speedtest_cache = ShardedCache() if not kwargs.no_cache else {}
+    apply_profile(kwargs)
+    use_clock(kwargs.clock)
+    if kwargs.rusage and not rusage_available():  # pragma: no cover
+        logger("WARNING: --rusage needs the `resource` module, unavailable here.")
+    if kwargs.count_instructions and not instructions_available():  # pragma: no cover
+        logger("WARNING: --count-instructions requires Python 3.12+; ignored.")
+    if kwargs.interleave and (kwargs.parallel or kwargs.replicas > 1):
+        logger(
+            "WARNING: --interleave times all rounds in this process; "
+            "--parallel and --replicas are ignored."
+        )
+
+    # restrict the session to this node's share of the files. Every node must
+    # compute the same assignment, so it depends on the files, and any shared cost
+    # file, but never on the node's own cache.
+    shard_print = ""
+    if kwargs.shard:
+        shard_index, nshards = parse_shard(kwargs.shard)
+        cost_data = (
+            read_shard_costs(kwargs.shard_costs, parsable_files)
+            if kwargs.shard_costs
+            else {}
+        )
+        costs = estimate_file_costs(parsable_files, cost_data, kwargs.nreps)
+        parsable_files = assign_shards(costs, nshards)[shard_index - 1]
+        shard_print = f" (shard {shard_index}/{nshards})"
+
+    # the seed is printed, and stored with each result, to reproduce the order.
+    if kwargs.interleave and kwargs.seed is None:
+        kwargs.seed = random.randrange(2**32)
 
     logger(
-        "collected {} file{}, best of {}:\n".format(
-            len(parsable_files), "s" if len(parsable_files) != 1 else "", kwargs.nreps
+        "collected {} file{}{}, best of {}{}{}{}:\n".format(
+            len(parsable_files),
+            "s" if len(parsable_files) != 1 else "",
+            shard_print,
+            kwargs.nreps,
+            f" ({profile_label(kwargs)} profile)"
+            if kwargs.profile != "default" or profile_label(kwargs) != "default"
+            else "",
+            f", interleaved (seed {kwargs.seed})" if kwargs.interleave else "",
+            f", {kwargs.replicas} replicas" if kwargs.replicas > 1 else "",
         )
     )
 
+    # spend a tight session budget on the files most likely to have changed speed.
+    if kwargs.session_budget:
+        budget = parse_time(kwargs.session_budget)
+        costs = estimate_file_costs(parsable_files, read_speedtest_cache, kwargs.nreps)
+        if sum(costs.values()) > budget:
+            parsable_files = prioritize_files(parsable_files, read_speedtest_cache)
+            logger(
+                "WARNING: estimated runtime {:.0f} sec exceeds the session budget "
+                "of {:g} sec; running recently changed and noisy files first.".format(
+                    sum(costs.values()), budget
+                )
+            )
+        kwargs.deadline = time.time() + budget
+
+    # --------------------------------------------------------------------------------------------
+    #   Check the system is quiet, and time the calibration kernels.
+    # --------------------------------------------------------------------------------------------
+    calibration, noise = {}, []
+    if not kwargs.no_precheck:
+        calibration, noise = _run_precheck(kwargs, logger)
+        kwargs.calibration_ref = calibration_reference(calibration)
+
     # --------------------------------------------------------------------------------------------
     #   Scan each Python file and find all speed_* methods within the script.
     # --------------------------------------------------------------------------------------------
     writable_speedtest_cache = {}
-    read_speedtest_cache = read_cache() if not kwargs.no_cache else {}
+
+    read_speedtest_cache = _validate_cache(read_speedtest_cache, logger)
+    kwargs.nloops_pad_width = _nloops_pad_width(
+        {
+            src: read_speedtest_cache[src]
+            for src in parsable_files
+            if src in read_speedtest_cache
+        }
+    )
+
+    # interleaved execution times the rounds of all files in one random order.
+    if kwargs.interleave:
+        writable_speedtest_cache = _run_interleaved(
+            parsable_files, kwargs, read_speedtest_cache, logger
+        )
+
+    # replicas time every file in fresh processes, with varied hash seeds.
+    elif kwargs.replicas > 1:
+        writable_speedtest_cache = _run_replicas(
+            parsable_files, kwargs, read_speedtest_cache, logger
+        )
 
     # in sequential execution, we process each file one at a time.
-    if not kwargs.parallel or len(parsable_files) <= 1:
+    elif not kwargs.parallel or len(parsable_files) <= 1:
         # execute sequentially.
-        for src in sorted(parsable_files):
+        for src in parsable_files:
             cache_, _ = _process_source_file(src, kwargs, read_speedtest_cache)
             writable_speedtest_cache.update(cache_)
 
     else:
         # determine number of cores.
         num_processes = max(min(len(parsable_files), cpu_count() - 1), 1)
-        mp_args = [
-            (src, kwargs, read_speedtest_cache) for src in sorted(parsable_files)
-        ]
+        mp_args = [(src, kwargs, read_speedtest_cache) for src in parsable_files]
 
         # execute and block in parallel.
         with Pool(processes=num_processes) as pool:
@@ -336,10 +1638,47 @@ def run_session(kwargs: Kwargs, logger: Callable[[str], None]) -> None:
             writable_speedtest_cache.update(cache_)
 
     # --------------------------------------------------------------------------------------------
-    #   Write cache.json / any other file outputs as a result of the speedtest run.
+    #   Fingerprint the environment, including any packages imported by the speed files.
     # --------------------------------------------------------------------------------------------
+    imported_modules = set(sys.modules)
+    for src in parsable_files:
+        imported_modules.update(parse_python_to_tree(Path(src)).imports)
+    fingerprint = collect_fingerprint(imported_modules)
+    fingerprint["calibration"] = {k: min(v) for k, v in calibration.items()}
+    fingerprint["noise"] = noise
+    env_id = fingerprint_id(fingerprint)
+    for items in writable_speedtest_cache.values():
+        for properties in items.values():
+            properties["env"] = env_id
+
+    if kwargs.verbose > 0:
+        logger(
+            "\nEnvironment {}: {} x{}, governor {}, {} RAM, git {}".format(
+                env_id,
+                fingerprint["cpu_model"],
+                fingerprint["cpu_count"],
+                fingerprint["cpu_governor"] or "n/a",
+                stringify_bytes(fingerprint["memory_total"] or 0),
+                (fingerprint["git_commit"] or "n/a")[:8],
+            )
+        )
+
+    _write_outputs(writable_speedtest_cache, fingerprint, kwargs, logger)
+    return _exit_code(writable_speedtest_cache, logger)
+
+
+def _write_outputs(
+    writable_speedtest_cache: Dict[str, Any],
+    fingerprint: Dict[str, Any],
+    kwargs: Kwargs,
+    logger: Callable[[str], None],
+    metadata: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Writes cache.json and any other file outputs requested for a run."""
+
     if not kwargs.no_cache and len(writable_speedtest_cache) > 0:
-        write_cache(writable_speedtest_cache)
+        write_shards(writable_speedtest_cache)
+        write_cache(fingerprint, "fingerprint.json")
 
     if kwargs.tocsv:
         # creates a CSV file from the cache.json content.
@@ -350,3 +1689,119 @@ def run_session(kwargs: Kwargs, logger: Callable[[str], None]) -> None:
         # creates .TXT log file
         txtfile_name = write_txt(writable_speedtest_cache)
         logger(f"Success! Saved TXT output to '{txtfile_name}'")
+
+    if kwargs.topyperf:
+        pyperffile_name = write_pyperf(writable_speedtest_cache, fingerprint)
+        logger(f"Success! Saved pyperf output to '{pyperffile_name}'")
+
+    if kwargs.togbench:
+        gbenchfile_name = write_gbench(
+            writable_speedtest_cache, fingerprint, clock=kwargs.clock
+        )
+        logger(f"Success! Saved Google Benchmark output to '{gbenchfile_name}'")
+
+    if kwargs.tojunit:
+        junitfile_name = write_junit(writable_speedtest_cache)
+        logger(f"Success! Saved JUnit XML output to '{junitfile_name}'")
+
+    for fmt, requested in (("parquet", kwargs.toparquet), ("arrow", kwargs.toarrow)):
+        if requested:
+            # skipped, with a warning, when pyarrow is not installed.
+            arrowfile_name = write_arrow(writable_speedtest_cache, fmt)
+            if arrowfile_name is not None:
+                logger(
+                    f"Success! Saved {fmt.capitalize()} output to '{arrowfile_name}'"
+                )
+
+    if kwargs.tojson or kwargs.json_file:
+        # creates a .JSON file of the results, which can be merged across shards.
+        metadata = dict(
+            metadata or {},
+            speedtest=importlib.metadata.version("speedtest"),
+            shard=kwargs.shard,
+        )
+        jsonfile_name = write_json(
+            writable_speedtest_cache,
+            fingerprint,
+            metadata,
+            prefix="shard{}".format(parse_shard(kwargs.shard)[0])
+            if kwargs.shard
+            else "run",
+            fname=kwargs.json_file,
+        )
+        logger(f"Success! Saved JSON output to '{jsonfile_name}'")
+
+
+def run_merge(inputs: List[str], kwargs: Kwargs, logger: Callable[[str], None]) -> int:
+    """Merges the JSON outputs of sharded sessions into one cache, report and files.
+
+    Args:
+        inputs (list[str]): JSON files, or glob patterns of JSON files, to merge.
+        kwargs (Kwargs): keyword arguments.
+        logger (Callable[[str], None]): Logging function.
+
+    Returns:
+        int: The exit code; 1 if any benchmark failed or exceeded a limit, else 0.
+    """
+    paths = sorted(set(it.chain.from_iterable(glob.glob(p) or [p] for p in inputs)))
+    results, fingerprints = merge_results(paths)
+
+    logger(
+        "merged {} file{}, {} benchmark{}:\n".format(
+            len(paths),
+            "s" if len(paths) != 1 else "",
+            sum(map(len, results.values())),
+            "s" if sum(map(len, results.values())) != 1 else "",
+        )
+    )
+
+    # comparing shards run on different machines may be misleading.
+    for path, fingerprint in zip(paths[1:], fingerprints[1:]):
+        changed = fingerprint_diff(fingerprints[0], fingerprint)
+        if changed:
+            logger(
+                "WARNING: '{}' ran on a different environment to '{}' ({}).".format(
+                    path, paths[0], ", ".join(changed)
+                )
+            )
+
+    # quick runs must not be compared against rigorous baselines.
+    profiles = sorted(
+        {
+            p.get("profile", "default")
+            for items in results.values()
+            for p in items.values()
+        }
+    )
+    if len(profiles) > 1:
+        logger(
+            "WARNING: results were timed with different profiles ({}).".format(
+                ", ".join(profiles)
+            )
+        )
+
+    # report the combined results in the same format as a session.
+    loopies = [p["nloops"] for items in results.values() for p in items.values()]
+    nloops_pad_width = 6 + max(map(len, map(str, loopies))) if loopies else 10
+    for src in sorted(results):
+        rel_path_to_script = os.path.relpath(src, os.getcwd())
+        for name, properties in results[src].items():
+            lhs_print = f"{rel_path_to_script}:{name} ".ljust(
+                kwargs.print_pad_width, "-"
+            )
+            if properties.get("status", "ok") != "ok":
+                rhs_print = properties["status"].upper()
+            else:
+                rhs_print = stringify_result(properties, kwargs.unit, nloops_pad_width)
+            logger(f"{lhs_print} {rhs_print}")
+            for line in _stringify_violations(properties, kwargs):
+                logger(line)
+
+    _write_outputs(
+        results,
+        fingerprints[0] if fingerprints else {},
+        kwargs,
+        logger,
+        metadata={"merged": paths},
+    )
+    return _exit_code(results, logger)
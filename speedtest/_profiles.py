@@ -0,0 +1,157 @@
+"""Timing profiles, trading the precision of a session against its runtime."""
+
+import statistics
+import time
+import timeit
+from typing import Any, Dict, Optional, Tuple, Union
+
+from speedtest._kwargs import Kwargs
+from speedtest._stats import warmup_changepoint
+
+# the calibration target, cap on loops and number of repeats of each profile.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "quick": {"min_time": 0.01, "max_loops": 10_000, "nreps": 1},
+    "default": {"min_time": 0.2, "max_loops": None, "nreps": 3},
+    "rigorous": {"min_time": 1.0, "max_loops": None, "nreps": 10},
+}
+
+# the bounds on the number of calls timed by the automatic warm-up.
+_WARMUP_MIN_CALLS = 20
+_WARMUP_MAX_CALLS = 1000
+_WARMUP_BATCH = 5
+
+
+def apply_profile(kwargs: Kwargs) -> None:
+    """Fills in the calibration settings of `kwargs` from its profile.
+
+    Settings given explicitly, with --min-time, --max-loops or --nreps, are kept.
+    Raises a ValueError on an unknown profile, or an invalid --warmup.
+    """
+    parse_warmup(kwargs.warmup)
+    if kwargs.profile not in PROFILES:
+        raise ValueError(
+            f"profile `{kwargs.profile}` must be one of {', '.join(PROFILES)}."
+        )
+    spec = PROFILES[kwargs.profile]
+    if kwargs.min_time is None:
+        kwargs.min_time = spec["min_time"]
+    if kwargs.max_loops is None:
+        kwargs.max_loops = spec["max_loops"]
+    if kwargs.nreps is None:
+        kwargs.nreps = spec["nreps"]
+
+
+def profile_label(kwargs: Kwargs) -> str:
+    """Names the profile of a session, including any settings that override it, and
+    the clock if it is not the wall clock.
+
+    Results are only comparable with results of the same label.
+    """
+    spec = PROFILES[kwargs.profile]
+    overrides = []
+    if kwargs.min_time is not None and kwargs.min_time != spec["min_time"]:
+        overrides.append(f"min_time={kwargs.min_time:g}")
+    if kwargs.max_loops != spec["max_loops"]:
+        overrides.append(f"max_loops={kwargs.max_loops}")
+    if kwargs.clock != "wall":
+        overrides.append(f"clock={kwargs.clock}")
+    if overrides:
+        return "{}({})".format(kwargs.profile, ", ".join(overrides))
+    return kwargs.profile
+
+
+def autorange(
+    timer: timeit.Timer,
+    min_time: float = 0.2,
+    max_loops: Optional[int] = None,
+    max_wall: Optional[float] = None,
+) -> Tuple[int, float]:
+    """Finds the number of loops taking at least `min_time` seconds in total.
+
+    As timeit.Timer.autorange(), trying 1, 2, 5, 10, 20, 50, ... loops, but with a
+    configurable target, and stopping early at `max_loops`, or once a try takes
+    `max_wall` seconds of elapsed time. The latter bounds the calibration of a
+    CPU-time clock on functions which mostly wait.
+
+    Returns
+    -------
+    Tuple[int, float]
+        The number of loops, and the time they took.
+    """
+    i = 1
+    while True:
+        for j in 1, 2, 5:
+            number = i * j
+            if max_loops is not None and number >= max_loops:
+                number = max_loops
+            t0 = time.perf_counter()
+            time_taken = timer.timeit(number)
+            if (
+                time_taken >= min_time
+                or number == max_loops
+                or (max_wall is not None and time.perf_counter() - t0 >= max_wall)
+            ):
+                return number, time_taken
+        i *= 10
+
+
+def parse_warmup(value: Union[str, int]) -> Optional[int]:
+    """Parses --warmup into a number of warm-up calls, or None if 'auto'."""
+    if value == "auto":
+        return None
+    try:
+        ncalls = int(value)
+    except ValueError:
+        ncalls = -1
+    if ncalls < 0:
+        raise ValueError(f"warmup `{value}` must be 'auto', or a number of calls.")
+    return ncalls
+
+
+def warm_up(
+    timer: timeit.Timer, ncalls: Optional[int], min_time: float = 0.2
+) -> Optional[Dict[str, Any]]:
+    """Times calls one at a time, discarding those made before the steady state.
+
+    With `ncalls`, that many calls are discarded. With None, calls are timed for at
+    least `min_time` seconds, and between 20 and 1000 calls, and those before the
+    changepoint found by warmup_changepoint() on the medians of batches of 5
+    calls are discarded.
+
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        None if `ncalls` is 0. Else the number of "calls" discarded and their total
+        "cost" in seconds. In auto mode, also the "steady" time per call after the
+        changepoint, the "excess" cost of the discarded calls above it, and whether
+        a "steady_state" was found before the last half of the calls.
+    """
+    if ncalls == 0:
+        return None
+    series = []
+    t0 = time.perf_counter()
+    while len(series) < (ncalls or _WARMUP_MAX_CALLS):
+        series.append(timer.timeit(1))
+        if (
+            ncalls is None
+            and len(series) >= _WARMUP_MIN_CALLS
+            and time.perf_counter() - t0 >= min_time
+        ):
+            break
+    if ncalls is not None:
+        return {"calls": ncalls, "cost": sum(series)}
+
+    # the medians of batches of 5 calls are insensitive to single outliers.
+    batches = [
+        statistics.median(series[i : i + _WARMUP_BATCH])
+        for i in range(0, len(series) - _WARMUP_BATCH + 1, _WARMUP_BATCH)
+    ]
+    start = warmup_changepoint(batches) * _WARMUP_BATCH
+    steady = sum(series[start:]) / len(series[start:])
+    return {
+        "calls": start,
+        "cost": sum(series[:start]),
+        "steady": steady,
+        "excess": sum(series[:start]) - start * steady,
+        "steady_state": start < len(series) // 2,
+    }
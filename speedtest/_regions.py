@@ -0,0 +1,99 @@
+"""Timed regions and pauses inside a speed function."""
+
+import time
+from array import array
+from typing import Dict
+
+# the clocks which may time benchmarks, in nanoseconds.
+CLOCKS = {
+    "wall": time.perf_counter_ns,
+    "process": time.process_time_ns,
+    "thread": time.thread_time_ns,
+}
+
+_now = CLOCKS["wall"]
+
+# nanoseconds accumulated per region, indexed by the slot of each region.
+_slots: Dict[str, int] = {}
+_totals = array("q")
+# [nanoseconds spent paused, start of the current pause or 0].
+_paused = array("q", [0, 0])
+
+
+class _Region:
+    """Context manager which adds the time spent inside it to its region's slot."""
+
+    __slots__ = ("slot", "start")
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.start = 0
+
+    def __enter__(self) -> "_Region":
+        self.start = _now()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _totals[self.slot] += _now() - self.start
+
+
+_regions: Dict[str, _Region] = {}
+
+
+def region(name: str) -> _Region:
+    """with speedtest.region("encode"): Times a region inside a speed function.
+
+    The time spent in each region is reported per loop, below the benchmark. Region
+    objects are cached per name, so entering a region does not allocate; regions of
+    the same name should not be nested."""
+    r = _regions.get(name)
+    if r is None:
+        _slots[name] = len(_totals)
+        _totals.append(0)
+        r = _regions[name] = _Region(_slots[name])
+    return r
+
+
+def pause() -> None:
+    """speedtest.pause(). Stops counting time towards the benchmark, until resume()."""
+    if _paused[1] == 0:
+        _paused[1] = _now()
+
+
+def resume() -> None:
+    """speedtest.resume(). Resumes counting time towards the benchmark."""
+    if _paused[1] != 0:
+        _paused[0] += _now() - _paused[1]
+        _paused[1] = 0
+
+
+def region_clock() -> float:
+    """A performance counter in seconds, which stands still whilst paused.
+
+    Used as the timer of timeit.Timer, so that paused time is excluded."""
+    if _paused[1] != 0:
+        return (_paused[1] - _paused[0]) * 1e-9
+    return (_now() - _paused[0]) * 1e-9
+
+
+def use_clock(name: str) -> None:
+    """Selects the clock of region_clock(), regions and pauses.
+
+    "wall" is elapsed time, "process" the CPU time of all threads of the process,
+    and "thread" the CPU time of the calling thread.
+    """
+    global _now
+    if name not in CLOCKS:
+        raise ValueError(f"clock `{name}` must be one of {', '.join(CLOCKS)}.")
+    _now = CLOCKS[name]
+
+
+def reset_regions() -> None:
+    """Zeroes the time accumulated in every region."""
+    for i in range(len(_totals)):
+        _totals[i] = 0
+
+
+def region_totals() -> Dict[str, int]:
+    """The nanoseconds accumulated in each region entered since the last reset."""
+    return {name: _totals[slot] for name, slot in _slots.items() if _totals[slot]}
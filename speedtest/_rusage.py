@@ -0,0 +1,62 @@
+"""Accounts for the operating system resources used whilst timing a benchmark."""
+
+import sys
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # not available on Windows.
+    resource = None  # type: ignore[assignment]
+
+# the fields of resource.getrusage() which are accumulated across timed windows.
+_FIELDS = ("ru_utime", "ru_stime", "ru_nvcsw", "ru_nivcsw", "ru_minflt", "ru_majflt")
+
+
+def rusage_available() -> bool:
+    """Whether resource.getrusage() is available on this platform."""
+    return resource is not None
+
+
+def rusage_snapshot() -> Optional[List[float]]:
+    """The resource usage of this process so far, or None if unavailable."""
+    if resource is None:  # pragma: no cover
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return [float(getattr(usage, field)) for field in _FIELDS]
+
+
+def accumulate_rusage(
+    total: List[float], before: Optional[List[float]], after: Optional[List[float]]
+) -> None:
+    """Adds the usage between two snapshots onto `total`."""
+    if before is None or after is None:  # pragma: no cover
+        return
+    for i, (b, a) in enumerate(zip(before, after)):
+        total[i] += a - b
+
+
+def summarize_rusage(total: List[float], ncalls: int) -> Dict[str, float]:
+    """Summarizes accumulated usage over `ncalls` calls of a speed function.
+
+    Returns
+    -------
+    Dict[str, float]
+        The "user" and "system" CPU seconds per call; the totals of "voluntary" and
+        "involuntary" context switches, and "minor" and "major" page faults; and the
+        "max_rss" of the process so far, in bytes.
+    """
+    summary = {
+        "user": total[0] / max(ncalls, 1),
+        "system": total[1] / max(ncalls, 1),
+        "voluntary": int(total[2]),
+        "involuntary": int(total[3]),
+        "minor": int(total[4]),
+        "major": int(total[5]),
+        "ncalls": ncalls,
+    }
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS.
+        summary["max_rss"] = maxrss if sys.platform == "darwin" else maxrss * 1024
+    return summary
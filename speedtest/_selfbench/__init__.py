@@ -0,0 +1,74 @@
+"""A bundled suite timing speedtest's own stages, run with `speedtest --self-bench`.
+
+The suite is `speed_harness.py`, which is timed and reported like any other speed
+file. The helpers here generate the synthetic suites, caches and results it needs.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+from typing import Any, Dict
+
+# the directory of the bundled speed files.
+SUITE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# the number of speed files in each directory of a synthetic tree.
+_FILES_PER_DIR = 100
+
+
+def scratch_dir() -> str:
+    """A temporary directory, removed when the interpreter exits."""
+    path = tempfile.mkdtemp(prefix="speedtest-selfbench-")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+def synthetic_source(n_methods: int) -> str:
+    """The source of a speed file with `n_methods` speed functions, a fixture and a
+    parametrized function per 10 methods."""
+    lines = ["import speedtest", "", "", "@speedtest.fixture", "def data():"]
+    lines += ["    return list(range(100))", "", ""]
+    for i in range(n_methods):
+        if i % 10 == 0:
+            lines.append('@speedtest.parametrize("n", [1, 10, 100])')
+            lines += [f"def speed_method_{i}(data, n):", "    sum(data[:n])", "", ""]
+        else:
+            lines += [f"def speed_method_{i}(data):", "    sum(data)", "", ""]
+    return "\n".join(lines)
+
+
+def synthetic_tree(root: str, n_files: int, n_methods: int = 5) -> str:
+    """Writes `n_files` speed files into nested directories under `root`."""
+    source = synthetic_source(n_methods)
+    for i in range(n_files):
+        folder = os.path.join(root, f"pkg_{i // _FILES_PER_DIR}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"speed_file_{i}.py"), "wt") as f:
+            f.write(source)
+        # other files, which are not speed files, are skipped by discovery.
+        with open(os.path.join(folder, f"module_{i}.py"), "wt") as f:
+            f.write("x = 1\n")
+    return root
+
+
+def synthetic_results(
+    n_entries: int, n_params: int = 1, per_file: int = 100
+) -> Dict[str, Dict[str, Any]]:
+    """Results of `n_entries` benchmarks, `per_file` to a file, as stored in caches."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for i in range(n_entries):
+        src = f"/bench/pkg_{i // per_file // _FILES_PER_DIR}/speed_{i // per_file}.py"
+        params = {f"param__p{j}": (i + j) % 7 for j in range(n_params)}
+        label = "speed_method[{}]".format(
+            ",".join(f"p{j}={v}" for j, v in enumerate(params.values()))
+        )
+        results.setdefault(src, {})[f"{label}#{i}"] = {
+            "nloops": 1000 + i % 1000,
+            "score": 1e-6 * (1 + i % 13),
+            "samples": [1e-6 * (1 + i % 13)] * 3,
+            "profile": "default",
+            "status": "ok",
+            **params,
+        }
+    return results
@@ -0,0 +1,142 @@
+"""speedtest's own stages, timed on synthetic suites of growing size.
+
+Run with `speedtest --self-bench`. Inputs are generated once per session, outside
+of the timing, in a temporary directory.
+"""
+
+import contextlib
+import functools
+import json
+import os
+from multiprocessing import Pool
+
+import speedtest
+from speedtest import _regions
+from speedtest._cache import ShardedCache, write_shards
+from speedtest._export import write_csv
+from speedtest._ioops import read_cache
+from speedtest._kwargs import Kwargs
+from speedtest._log import log_output
+from speedtest._processor import _discover_source_files, run_session
+from speedtest._selfbench import (
+    scratch_dir,
+    synthetic_results,
+    synthetic_source,
+    synthetic_tree,
+)
+from speedtest._speedtree import parse_python_to_tree
+
+
+@functools.lru_cache(maxsize=None)
+def _tree(n_files: int) -> str:
+    return synthetic_tree(scratch_dir(), n_files)
+
+
+@functools.lru_cache(maxsize=None)
+def _source(n_methods: int) -> str:
+    return synthetic_source(n_methods)
+
+
+@functools.lru_cache(maxsize=None)
+def _results(n_entries: int, n_params: int = 1):
+    return synthetic_results(n_entries, n_params)
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_dir(n_entries: int) -> str:
+    """A cache of `n_entries` results, both sharded and as a legacy cache.json."""
+    cache_dir = scratch_dir()
+    write_shards(_results(n_entries), cache_dir)
+    with open(os.path.join(cache_dir, "cache.json"), "wt", encoding="utf-8") as f:
+        json.dump(_results(n_entries), f, indent=4)
+    return cache_dir
+
+
+@functools.lru_cache(maxsize=None)
+def _output_dir() -> str:
+    """A directory for written outputs, apart from the inputs of other benchmarks."""
+    return scratch_dir()
+
+
+def _current_clock() -> str:
+    """The clock selected for this session, passed on to nested sessions."""
+    return next(k for k, v in _regions.CLOCKS.items() if v is _regions._now)
+
+
+def _noop() -> None:
+    pass
+
+
+@speedtest.parametrize("n_files", [10, 100, 1000, 10000])
+@speedtest.setup(_tree)
+def speed_discover_source_files(root, n_files):
+    _discover_source_files([root])
+
+
+@speedtest.parametrize("n_methods", [10, 100, 1000])
+@speedtest.setup(_source)
+def speed_parse_python_to_tree(source, n_methods):
+    parse_python_to_tree(source)
+
+
+@speedtest.parametrize("n_entries", [1000, 10000, 100000])
+@speedtest.setup(_cache_dir)
+def speed_read_cache(cache_dir, n_entries):
+    # the legacy, monolithic cache.json.
+    read_cache(cache_dir=cache_dir)
+
+
+@speedtest.parametrize("n_entries", [1000, 10000, 100000])
+@speedtest.setup(_cache_dir)
+def speed_read_shards(cache_dir, n_entries):
+    dict(ShardedCache(cache_dir))
+
+
+@speedtest.parametrize("n_entries", [1000, 10000, 100000])
+@speedtest.setup(lambda n_entries: (_results(n_entries), _cache_dir(n_entries)))
+def speed_write_shards(results, cache_dir, n_entries):
+    write_shards(results, cache_dir)
+
+
+@speedtest.parametrize("n_rows", [100, 1000, 10000])
+@speedtest.parametrize("n_params", [1, 10])
+@speedtest.setup(
+    lambda n_rows, n_params: (
+        _results(n_rows, n_params),
+        os.path.join(_output_dir(), "run.csv"),
+    )
+)
+def speed_write_csv(results, fname, n_rows, n_params):
+    write_csv(results, fname)
+
+
+def speed_log_output():
+    with open(os.devnull, "wt") as devnull, contextlib.redirect_stdout(devnull):
+        log_output(
+            "speed_file.py:speed_method " + "-" * 80 + " 1000 loops, 1.0 μsec per loop",
+            Kwargs(file_or_dir=[]),
+        )
+
+
+@speedtest.parametrize("processes", [1, 2, 4])
+def speed_pool_startup(processes):
+    with Pool(processes=processes) as pool:
+        pool.starmap(_noop, [()] * processes)
+
+
+@speedtest.parametrize("n_files", [10, 100])
+@speedtest.setup(_tree)
+def speed_run_session(root, n_files):
+    # a whole session of trivial benchmarks, which is all harness overhead.
+    kwargs = Kwargs(
+        file_or_dir=[root],
+        no_cache=True,
+        no_precheck=True,
+        quiet=True,
+        nreps=1,
+        min_time=1e-9,
+        max_loops=1,
+        clock=_current_clock(),
+    )
+    with open(os.devnull, "wt") as devnull, contextlib.redirect_stdout(devnull):
+        run_session(kwargs, print)
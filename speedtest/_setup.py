@@ -0,0 +1,97 @@
+"""Times speed functions whose inputs are rebuilt, untimed, before every call."""
+
+import gc
+import timeit
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from speedtest._regions import region_clock
+
+# the number of inputs built at once, outside of the timed window. Larger batches
+# read the clock less often, but keep more inputs alive at once; for large inputs,
+# that costs memory, and moves them out of the CPU caches before they are used.
+_BATCH_SIZE = 16
+
+
+def build_inputs(
+    setup: Optional[Callable[[], Any]], fixtures: Dict[str, Callable[[], Any]]
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """Builds the (args, kwargs) of one call of a speed function.
+
+    Parameters
+    ----------
+    setup : Callable, optional
+        From @speedtest.setup(fn). Returns a dict of keyword arguments, a tuple of
+        positional arguments, a single positional argument, or None.
+    fixtures : Dict[str, Callable]
+        Fixtures with `scope="iteration"`, called to produce keyword arguments.
+
+    Returns
+    -------
+    Tuple[Tuple[Any, ...], Dict[str, Any]]
+        The positional and keyword arguments.
+    """
+    args: Tuple[Any, ...] = ()
+    kwargs = {name: fixture() for name, fixture in fixtures.items()}
+    if setup is not None:
+        result = setup()
+        if isinstance(result, dict):
+            kwargs.update(result)
+        elif isinstance(result, tuple):
+            args = result
+        elif result is not None:
+            args = (result,)
+    return args, kwargs
+
+
+class SetupTimer(timeit.Timer):
+    """A timeit.Timer which calls `inputs()` before every call, outside the timing.
+
+    Inputs are built in small batches, then the calls on a batch are timed in one
+    window, so the clock is read twice per batch rather than twice per call. autorange()
+    and repeat() are inherited, and are built on timeit().
+
+    Parameters
+    ----------
+    func : Callable
+        The speed function.
+    inputs : Callable[[], Tuple[tuple, dict]]
+        Builds the positional and keyword arguments of one call.
+    timer : Callable[[], float]
+        The clock, as for timeit.Timer.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        inputs: Callable[[], Tuple[Tuple[Any, ...], Dict[str, Any]]],
+        timer: Callable[[], float] = region_clock,
+    ):
+        super().__init__(func, timer=timer)
+        self.func = func
+        self.inputs = inputs
+
+    def timeit(self, number: int = timeit.default_number) -> float:
+        total = 0.0
+        done = 0
+        while done < number:
+            calls = [
+                partial(self.func, *args, **kwargs)
+                for args, kwargs in (
+                    self.inputs() for _ in range(min(_BATCH_SIZE, number - done))
+                )
+            ]
+            gcold = gc.isenabled()
+            gc.disable()
+            try:
+                t0 = self.timer()
+                for call in calls:
+                    call()
+                total += self.timer() - t0
+            finally:
+                if gcold:
+                    gc.enable()
+            done += len(calls)
+            # free the consumed inputs before the next batch, outside the window.
+            del calls
+        return total
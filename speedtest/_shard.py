@@ -0,0 +1,141 @@
+"""Splits speed files across CI nodes, and merges the results of each shard."""
+
+import os
+import statistics
+from typing import Any, Dict, List, Tuple
+
+from speedtest._ioops import read_json
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parses a shard specification of the form 'i/N', where 1 <= i <= N."""
+    try:
+        index, total = (int(s) for s in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard `{spec}` must be of the form 'i/N'.") from None
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"shard `{spec}` must satisfy 1 <= i <= N.")
+    return index, total
+
+
+def read_shard_costs(fname: str, srcs: List[str]) -> Dict[str, Any]:
+    """Reads the results of `srcs` from a JSON output shared by every node.
+
+    The file is the output of `--tojson` or `speedtest merge`, possibly written on
+    another machine, so each speed file is matched to the entry sharing the longest
+    trailing run of path components with it, e.g. 'bench/speed_a.py' wherever the
+    repository is checked out.
+    """
+    by_suffix: Dict[Tuple[str, ...], str] = {}
+    results = read_json(fname).get("results", {})
+    for path in sorted(results):
+        parts = tuple(os.path.normpath(path).split(os.sep))
+        for i in range(len(parts)):
+            by_suffix.setdefault(parts[i:], path)
+
+    matched = {}
+    for src in srcs:
+        parts = tuple(os.path.normpath(os.path.abspath(src)).split(os.sep))
+        for i in range(len(parts)):
+            if parts[i:] in by_suffix:
+                matched[src] = results[by_suffix[parts[i:]]]
+                break
+    return matched
+
+
+def estimate_file_costs(
+    srcs: List[str], cache_data: Dict[str, Any], nreps: int = 3
+) -> Dict[str, float]:
+    """Estimates the runtime of each speed file from its cached calibration, or from
+    the results of read_shard_costs().
+
+    Files without any cached entries are assigned the mean cost of the known files,
+    or a unit cost when nothing is known at all.
+    """
+    costs = {}
+    for src in srcs:
+        if src in cache_data and len(cache_data[src]) > 0:
+            # calibration plus `nreps` repeats of `nloops` calls.
+            costs[src] = sum(
+                p.get("nloops", 1) * p.get("score", 0.0) * (nreps + 1)
+                for p in cache_data[src].values()
+            )
+
+    default = sum(costs.values()) / len(costs) if costs else 1.0
+    return {src: costs.get(src, default) for src in srcs}
+
+
+def assign_shards(costs: Dict[str, float], nshards: int) -> List[List[str]]:
+    """Deterministically balances files across shards by estimated runtime.
+
+    Uses the longest-processing-time-first heuristic: files are taken in order of
+    decreasing cost and placed on the currently least loaded shard. Ties are broken
+    on the path relative to the working directory, so every node that sees the same
+    costs computes the same assignment.
+    """
+    shards: List[List[str]] = [[] for _ in range(nshards)]
+    loads = [0.0] * nshards
+
+    for src in sorted(costs, key=lambda s: (-costs[s], os.path.relpath(s))):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(src)
+        loads[lightest] += costs[src]
+    return [sorted(shard) for shard in shards]
+
+
+def _max_variation(items: Dict[str, Any]) -> float:
+    """The largest coefficient of variation among the cached samples of a file."""
+    cvs = [
+        statistics.stdev(p["samples"]) / statistics.fmean(p["samples"])
+        for p in items.values()
+        if len(p.get("samples", [])) > 1 and statistics.fmean(p["samples"]) > 0
+    ]
+    return max(cvs, default=0.0)
+
+
+def prioritize_files(srcs: List[str], cache_data: Dict[str, Any]) -> List[str]:
+    """Orders files so that a limited session budget is spent where it matters most.
+
+    Files without cached results come first. The remainder are ordered by their
+    better rank of either most recently modified, or highest variance of their
+    cached timings.
+    """
+    known = [src for src in srcs if cache_data.get(src)]
+    by_recency = sorted(known, key=lambda s: -os.path.getmtime(s))
+    by_variance = sorted(known, key=lambda s: -_max_variation(cache_data[s]))
+
+    def priority(src: str) -> Tuple[int, int, str]:
+        if src not in known:
+            return 0, 0, os.path.relpath(src)
+        rank = min(by_recency.index(src), by_variance.index(src))
+        return 1, rank, os.path.relpath(src)
+
+    return sorted(srcs, key=priority)
+
+
+def merge_results(
+    paths: List[str],
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Merges the JSON outputs of several speedtest runs.
+
+    Parameters
+    ----------
+    paths : List[str]
+        JSON files written using `--tojson`.
+
+    Returns
+    -------
+    results : Dict[str, Any]
+        Combined mapping of source files and method signatures to timing properties.
+        Later files take precedence over earlier ones.
+    fingerprints : List[Dict[str, Any]]
+        The environment fingerprint of each input file, in order.
+    """
+    results: Dict[str, Any] = {}
+    fingerprints = []
+    for path in paths:
+        data = read_json(path)
+        fingerprints.append(data.get("fingerprint", {}))
+        for src, items in data.get("results", {}).items():
+            results.setdefault(src, {}).update(items)
+    return results, fingerprints
@@ -1,9 +1,14 @@
 """Uses AST to analyse a speedtest Python file."""
 
 import ast
+import hashlib
 import pathlib
-from dataclasses import dataclass
-from typing import Union, List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+
+# decorators exported by speedtest which are recognised statically.
+_DECORATORS = ("mark", "parametrize", "fixture", "group", "datafile")
 
 
 @dataclass
@@ -12,6 +17,10 @@ class SpMethod:
 
     name: str
     fixtures: List[str]
+    group: Optional[str] = None
+    baseline: bool = False
+    returns_work: bool = False
+    code_hash: str = ""
 
 
 @dataclass
@@ -19,6 +28,66 @@ class SpeedTree:
     """Defines a parsed Python object into its defined speed methods, fixtures and other properties."""
 
     methods: List[SpMethod]
+    imports: List[str] = field(default_factory=list)
+    fixtures: Dict[str, str] = field(default_factory=dict)
+    context_hash: str = ""
+
+
+def _decorator_name(
+    dec: ast.expr, decorator_rel_import: Dict[str, str]
+) -> Optional[str]:
+    """Resolves a decorator node into the name of the speedtest decorator, if any.
+
+    Handles both `@speedtest.name` and `from speedtest import name; @name` forms,
+    with or without call arguments.
+    """
+    if isinstance(dec, ast.Call):
+        dec = dec.func
+    if (
+        isinstance(dec, ast.Attribute)
+        and isinstance(dec.value, ast.Name)
+        and dec.value.id == "speedtest"
+        and dec.attr in _DECORATORS
+    ):
+        return dec.attr
+    if isinstance(dec, ast.Name) and decorator_rel_import.get(dec.id) == "rel":
+        return dec.id
+    return None
+
+
+def _parse_group_call(dec: ast.Call) -> Tuple[Optional[str], bool]:
+    """Extracts the (name, baseline) arguments of a literal group(...) decorator."""
+    name, baseline = None, False
+    if dec.args and isinstance(dec.args[0], ast.Constant):
+        name = dec.args[0].value
+    if len(dec.args) > 1 and isinstance(dec.args[1], ast.Constant):
+        baseline = bool(dec.args[1].value)
+    for kw in dec.keywords:
+        if kw.arg == "name" and isinstance(kw.value, ast.Constant):
+            name = kw.value.value
+        elif kw.arg == "baseline" and isinstance(kw.value, ast.Constant):
+            baseline = bool(kw.value.value)
+    return name, baseline
+
+
+def _returns_work(node: ast.FunctionDef) -> bool:
+    """Whether the function returns a `Work(...)` or `speedtest.Work(...)` literal."""
+    for child in ast.walk(node):
+        if isinstance(child, ast.Return) and isinstance(child.value, ast.Call):
+            func = child.value.func
+            if (isinstance(func, ast.Name) and func.id == "Work") or (
+                isinstance(func, ast.Attribute) and func.attr == "Work"
+            ):
+                return True
+    return False
+
+
+def _hash_nodes(*nodes: ast.AST) -> str:
+    """Hashes the structure of AST nodes, ignoring formatting and line numbers."""
+    digest = hashlib.sha1()
+    for node in nodes:
+        digest.update(ast.dump(node).encode("utf-8"))
+    return digest.hexdigest()[:12]
 
 
 def parse_python_to_tree(src: Union[str, pathlib.Path]) -> SpeedTree:
@@ -39,7 +108,15 @@ def parse_python_to_tree(src: Union[str, pathlib.Path]) -> SpeedTree:
     speed_fs = []
     fixture_fs = []
 
-    decorator_rel_import = {"mark": "unk", "parametrize": "unk", "fixture": "unk"}
+    # collect every absolute module import, including those inside functions.
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            imports.add(node.module)
+
+    decorator_rel_import = {name: "unk" for name in _DECORATORS}
     # speedtest_direct_import = False
 
     # confirm whether 'speedtest' is imported.
@@ -51,57 +128,52 @@ def parse_python_to_tree(src: Union[str, pathlib.Path]) -> SpeedTree:
         if isinstance(node, ast.ImportFrom) and node.module == "speedtest":
             # loop through aliases and see if 'speedtest.mark' exist
             for alias in node.names:
-                if alias.name in ("mark", "parametrize", "fixture"):
+                if alias.name in _DECORATORS:
                     decorator_rel_import[alias.name] = "rel"
 
     # loop through the nodes and identify any speed / fixture functions.
     for node in tree.body:
         if isinstance(node, ast.FunctionDef):
-            if node.name.startswith("speed_"):
+            decorators = [
+                _decorator_name(dec, decorator_rel_import)
+                for dec in node.decorator_list
+            ]
+            # e.g import speedtest; @speedtest.mark
+            # or from speedtest import group; @group("square")
+            if (
+                node.name.startswith("speed_")
+                or "mark" in decorators
+                or "group" in decorators
+            ):
                 speed_fs.append(node.name)
 
             # else check if its a fixture
-            else:
-                for dec in node.decorator_list:
-                    # check for global import of fixture
-                    # e.g import speedtest; @speedtest.fixture
-                    if (
-                        isinstance(dec, ast.Attribute)
-                        and isinstance(dec.value, ast.Name)
-                        and dec.value.id == "speedtest"
-                        and dec.attr == "fixture"
-                    ):
-                        fixture_fs.append(node.name)
-                    # check for relative import of fixture
-                    # e.g from speedtest import fixture; @fixture
-                    elif (
-                        decorator_rel_import["fixture"] == "rel"
-                        and isinstance(dec, ast.Name)
-                        and dec.id == "fixture"
-                    ):
-                        fixture_fs.append(node.name)
-                    # check for global import of mark
-                    # e.g import speedtest; @speedtest.mark
-                    elif (
-                        isinstance(dec, ast.Attribute)
-                        and isinstance(dec.value, ast.Name)
-                        and dec.value.id == "speedtest"
-                        and dec.attr == "mark"
-                    ):
-                        speed_fs.append(node.name)
-                    # check for relative import of mark
-                    # e.g from speedtest import mark; @mark
-                    elif (
-                        decorator_rel_import["mark"] == "rel"
-                        and isinstance(dec, ast.Name)
-                        and dec.id == "mark"
-                    ):
-                        speed_fs.append(node.name)
+            # e.g import speedtest; @speedtest.fixture, or @speedtest.datafile(...)
+            elif "fixture" in decorators or "datafile" in decorators:
+                fixture_fs.append(node.name)
 
     # eliminate duplicates
     speed_fs = list(set(speed_fs))
     fixture_fs = list(set(fixture_fs))
 
+    # hash the code of each fixture, and of everything else in the module.
+    fixture_nodes = {
+        node.name: node
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name in fixture_fs
+    }
+    fixture_hashes = {name: _hash_nodes(node) for name, node in fixture_nodes.items()}
+    context_hash = _hash_nodes(
+        *(
+            node
+            for node in tree.body
+            if not (
+                isinstance(node, ast.FunctionDef)
+                and (node.name in speed_fs or node.name in fixture_fs)
+            )
+        )
+    )
+
     sp_methods = []
 
     # loop back again through the speed methods, and associate properties to each.
@@ -113,6 +185,27 @@ def parse_python_to_tree(src: Union[str, pathlib.Path]) -> SpeedTree:
                 if isinstance(a, ast.arg) and a.arg in fixture_fs:
                     node_fixtures.append(a.arg)
 
-            sp_methods.append(SpMethod(name=node.name, fixtures=node_fixtures))
-
-    return SpeedTree(methods=sp_methods)
+            sp_method = SpMethod(
+                name=node.name,
+                fixtures=node_fixtures,
+                returns_work=_returns_work(node),
+                # a method changes when its code, or that of its fixtures, changes.
+                code_hash=_hash_nodes(node, *(fixture_nodes[f] for f in node_fixtures)),
+            )
+
+            # attach group membership, e.g @speedtest.group("square", baseline=True)
+            for dec in node.decorator_list:
+                if (
+                    isinstance(dec, ast.Call)
+                    and _decorator_name(dec, decorator_rel_import) == "group"
+                ):
+                    sp_method.group, sp_method.baseline = _parse_group_call(dec)
+
+            sp_methods.append(sp_method)
+
+    return SpeedTree(
+        methods=sp_methods,
+        imports=sorted(imports),
+        fixtures=fixture_hashes,
+        context_hash=context_hash,
+    )
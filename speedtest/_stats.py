@@ -0,0 +1,98 @@
+"""Small statistics helpers used to summarize repeated timings."""
+
+import math
+import statistics
+from typing import List, Sequence, Tuple
+
+# two-sided 95% critical values of Student's t-distribution, for 1..30 dof.
+_T_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+
+
+def t_critical(dof: int) -> float:
+    """Two-sided 95% critical value of Student's t-distribution."""
+    if dof < 1:
+        raise ValueError("degrees of freedom must be at least 1.")
+    if dof <= len(_T_95):
+        return _T_95[dof - 1]
+    # close approximation beyond the table, converging onto the normal quantile.
+    return 1.960 + 2.5 / dof
+
+
+def mean_confidence_interval(samples: Sequence[float]) -> Tuple[float, float, float]:
+    """Computes the mean and its 95% confidence interval.
+
+    Returns
+    -------
+    Tuple[float, float, float]
+        The (mean, lower, upper) bounds. With fewer than two samples, the bounds
+        collapse onto the mean.
+    """
+    mean = statistics.fmean(samples)
+    if len(samples) < 2:
+        return mean, mean, mean
+    half_width = (
+        t_critical(len(samples) - 1)
+        * statistics.stdev(samples)
+        / math.sqrt(len(samples))
+    )
+    return mean, mean - half_width, mean + half_width
+
+
+def paired_ratios(baseline: Sequence[float], other: Sequence[float]) -> List[float]:
+    """Computes the per-round speedup of `other` relative to `baseline`."""
+    return [b / o for b, o in zip(baseline, other) if o > 0]
+
+
+def variance_components(groups: Sequence[Sequence[float]]) -> Tuple[float, float]:
+    """Splits the variance of samples from several processes into its components.
+
+    Uses a one-way random effects analysis of variance, with each group holding the
+    samples of one process.
+
+    Returns
+    -------
+    Tuple[float, float]
+        The variance within a process, and the variance of the mean of a process
+        between processes, which is 0 when it is smaller than expected by chance.
+    """
+    groups = [g for g in groups if len(g) > 0]
+    n = sum(len(g) for g in groups)
+    k = len(groups)
+    if k < 2 or n <= k:
+        raise ValueError("variance components need two groups, one with 2+ samples.")
+    grand = statistics.fmean([x for g in groups for x in g])
+    means = [statistics.fmean(g) for g in groups]
+    ss_within = sum((x - m) ** 2 for g, m in zip(groups, means) for x in g)
+    ss_between = sum(len(g) * (m - grand) ** 2 for g, m in zip(groups, means))
+    ms_within = ss_within / (n - k)
+    ms_between = ss_between / (k - 1)
+    # the effective number of samples per group, for unequal group sizes.
+    n0 = (n - sum(len(g) ** 2 for g in groups) / n) / (k - 1)
+    return ms_within, max((ms_between - ms_within) / n0, 0.0)
+
+
+def warmup_changepoint(series: Sequence[float]) -> int:
+    """Finds where a time series reaches its steady state.
+
+    Uses the marginal standard error rule (MSER): the steady state starts at the
+    index `d` which minimizes the sum of squared errors of `series[d:]` about its
+    mean, divided by `(n - d) ** 2`. The smallest such `d` is returned, and `d` is
+    at most half of the series, so that the steady state is estimated from at
+    least half of it.
+    """
+    n = len(series)
+    best, best_d = math.inf, 0
+    # the mean and SSE of series[d:], updated using Welford's algorithm.
+    mean = sse = 0.0
+    for d in range(n - 1, -1, -1):
+        m = n - d
+        delta = series[d] - mean
+        mean += delta / m
+        sse += delta * (series[d] - mean)
+        if d <= n // 2 and sse / m**2 <= best:
+            best, best_d = sse / m**2, d
+    return best_d
@@ -1,5 +1,7 @@
 """Printing helper methods to convert properties into pretty strings."""
 
+from typing import Any, Dict, List, Optional, Union
+
 
 def stringify_time(t: float, prec: int = 1) -> str:
     """Stringify time unit into printable time."""
@@ -31,13 +33,242 @@ def map_stringify_time(unit: str, t: float, prec: int = 1):
     return s
 
 
+_TIME_UNITS = {
+    "ns": 1e-9,
+    "us": 1e-6,
+    "\u03bcs": 1e-6,
+    "ms": 1e-3,
+    "s": 1.0,
+    "sec": 1.0,
+    "m": 60.0,
+    "min": 60.0,
+    "h": 3600.0,
+}
+
+
+def parse_time(s: Union[str, float]) -> float:
+    """Parses a duration such as '500ms', '30s' or '15m' into seconds.
+
+    Plain numbers are interpreted as seconds.
+    """
+    if isinstance(s, (int, float)):
+        return float(s)
+    text = s.strip().lower()
+    number = text.rstrip("abcdefghijklmnopqrstuvwxyz\u03bc")
+    unit = text[len(number) :].strip() or "s"
+    if unit not in _TIME_UNITS:
+        raise ValueError(f"time `{s}` has an unrecognised unit.")
+    try:
+        return float(number) * _TIME_UNITS[unit]
+    except ValueError:
+        raise ValueError(f"time `{s}` is not a number.") from None
+
+
+_BYTE_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+}
+
+
+def parse_bytes(s: Union[str, float]) -> float:
+    """Parses a size such as '512KiB' or '50MB' into bytes.
+
+    Plain numbers are interpreted as bytes.
+    """
+    if isinstance(s, (int, float)):
+        return float(s)
+    text = s.strip().lower()
+    number = text.rstrip("abcdefghijklmnopqrstuvwxyz")
+    unit = text[len(number) :].strip() or "b"
+    if unit not in _BYTE_UNITS:
+        raise ValueError(f"size `{s}` has an unrecognised unit.")
+    try:
+        return float(number) * _BYTE_UNITS[unit]
+    except ValueError:
+        raise ValueError(f"size `{s}` is not a number.") from None
+
+
 def stringify_bytes(b: float, prec: int = 1) -> str:
     """Stringify number of bytes into KiB, MiB, ..."""
     if b < 1024:
         return f"{round(b, prec)} B"
-    elif b < 100e3:
-        return f"{round(b * 1024, prec)} KiB"
-    elif b < 100e6:
-        return f"{round(b * 1048576, prec)} MiB"
+    elif b < 1048576:
+        return f"{round(b / 1024, prec)} KiB"
+    elif b < 1073741824:
+        return f"{round(b / 1048576, prec)} MiB"
     else:
-        return f"{round(b * 1.0737e9, prec)} GiB"
+        return f"{round(b / 1073741824, prec)} GiB"
+
+
+def stringify_result(
+    properties: Dict[str, Any], unit: str = "auto", nloops_pad_width: int = 10
+) -> str:
+    """Stringify the timing properties of a speed function into a printable result."""
+    nloops = properties["nloops"]
+    s = "{} loop{}".format(nloops, "s" if nloops != 1 else "").ljust(
+        nloops_pad_width
+    ) + ", {} per loop".format(map_stringify_time(unit, properties["score"]))
+
+    s += stringify_throughput(properties)
+    if "normalized" in properties:
+        s += ", {:.3g}x ref".format(properties["normalized"])
+    return s
+
+
+def stringify_warmup(
+    properties: Dict[str, Any], unit: str = "auto", print_pad_width: int = 100
+) -> List[str]:
+    """Stringify the warm-up calls discarded before timing a benchmark."""
+    if "warmup" not in properties:
+        return []
+    warmup = properties["warmup"]
+    line = "{} {} call{} discarded, {}".format(
+        "    warm-up ".ljust(print_pad_width, "-"),
+        warmup["calls"],
+        "s" if warmup["calls"] != 1 else "",
+        map_stringify_time(unit, warmup["cost"]),
+    )
+    if "steady" in warmup:
+        line += " ({} above a steady state of {} per call)".format(
+            map_stringify_time(unit, warmup["excess"]),
+            map_stringify_time(unit, warmup["steady"]),
+        )
+        if not warmup["steady_state"]:
+            line += ", NOT STEADY"
+    return [line]
+
+
+def stringify_regions(
+    properties: Dict[str, Any], unit: str = "auto", print_pad_width: int = 100
+) -> List[str]:
+    """Stringify the time per loop spent in each region of a speed function."""
+    lines = []
+    mean = sum(properties["samples"]) / len(properties["samples"])
+    for name, t in properties.get("regions", {}).items():
+        lhs = f"    region '{name}' ".ljust(print_pad_width, "-")
+        lines.append(
+            "{} {} per loop, {:.1f}%".format(
+                lhs, map_stringify_time(unit, t), 100.0 * t / mean if mean > 0 else 0.0
+            )
+        )
+    return lines
+
+
+def stringify_rusage(
+    properties: Dict[str, Any], unit: str = "auto", print_pad_width: int = 100
+) -> List[str]:
+    """Stringify the CPU time per loop, and other resource usage, of a benchmark."""
+    usage = properties.get("rusage")
+    if not usage:
+        return []
+    lines = [
+        "{} user {}, system {} per loop".format(
+            "    cpu ".ljust(print_pad_width, "-"),
+            map_stringify_time(unit, usage["user"]),
+            map_stringify_time(unit, usage["system"]),
+        ),
+        "{} {} voluntary, {} involuntary context switches; {} minor, {} major page "
+        "faults".format(
+            "    rusage ".ljust(print_pad_width, "-"),
+            usage["voluntary"],
+            usage["involuntary"],
+            usage["minor"],
+            usage["major"],
+        ),
+    ]
+    if "max_rss" in usage:
+        lines[-1] += f"; max RSS {stringify_bytes(usage['max_rss'])}"
+    return lines
+
+
+def stringify_instructions(
+    properties: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+    print_pad_width: int = 100,
+) -> List[str]:
+    """Stringify the instructions and calls executed by one call of a benchmark,
+    and their change since `previous`, if it was counted too."""
+    if "instructions" not in properties:
+        return []
+    line = "{} {:,} instructions, {:,} calls per call".format(
+        "    instructions ".ljust(print_pad_width, "-"),
+        properties["instructions"],
+        properties["calls"],
+    )
+    if previous and "instructions" in previous:
+        old = previous["instructions"]
+        if old == properties["instructions"]:
+            line += " (unchanged)"
+        else:
+            line += " (was {:,}, {:+.1%})".format(
+                old, properties["instructions"] / old - 1 if old else 1.0
+            )
+    return [line]
+
+
+def stringify_line_profile(
+    properties: Dict[str, Any], print_pad_width: int = 100
+) -> List[str]:
+    """Stringify where the line profile of a benchmark was saved, and its hottest
+    line."""
+    if "line_profile" not in properties:
+        return []
+    lhs_print = "    line profile ".ljust(print_pad_width, "-")
+    line_profile = properties["line_profile"]
+    if "error" in line_profile:
+        return [f"{lhs_print} FAILED: {line_profile['error']}"]
+    hottest = ""
+    if "hottest" in line_profile:
+        hottest = "hottest {} ({:.1%}), ".format(
+            line_profile["hottest"], line_profile["fraction"]
+        )
+    return [f"{lhs_print} {hottest}saved to '{line_profile['file']}'"]
+
+
+def stringify_replicas(
+    properties: Dict[str, Any], unit: str = "auto", print_pad_width: int = 100
+) -> List[str]:
+    """Stringify the spread of a benchmark between and within replica processes."""
+    if "replicas" not in properties:
+        return []
+    replicas = properties["replicas"]
+    line = "{} {} processes, mean {} (95% CI {} to {})".format(
+        "    replicas ".ljust(print_pad_width, "-"),
+        len(replicas["means"]),
+        map_stringify_time(unit, sum(replicas["means"]) / len(replicas["means"])),
+        map_stringify_time(unit, replicas["ci"][0]),
+        map_stringify_time(unit, replicas["ci"][1]),
+    )
+    if "within_stdev" in replicas:
+        line += ", stdev {} within, {} between processes".format(
+            map_stringify_time(unit, replicas["within_stdev"]),
+            map_stringify_time(unit, replicas["between_stdev"]),
+        )
+    return [line]
+
+
+def stringify_count(n: float, prec: int = 1) -> str:
+    """Stringify a count into k, M, G, ..."""
+    if n < 1e3:
+        return f"{round(n, prec)}"
+    elif n < 1e6:
+        return f"{round(n / 1e3, prec)}k"
+    elif n < 1e9:
+        return f"{round(n / 1e6, prec)}M"
+    else:
+        return f"{round(n / 1e9, prec)}G"
+
+
+def stringify_throughput(properties: Dict[str, Any]) -> str:
+    """Stringify the items/sec and bytes/sec of a result, if it declares any work."""
+    s = ""
+    if "items_per_sec" in properties:
+        s += ", {} items/sec".format(stringify_count(properties["items_per_sec"]))
+    if "bytes_per_sec" in properties:
+        s += ", {}/s".format(stringify_bytes(properties["bytes_per_sec"]))
+    return s
@@ -0,0 +1,143 @@
+"""Runs benchmarks in a child process which is killed when it exceeds its time limit."""
+
+import os
+import pickle
+import select
+import signal
+import sys
+import threading
+import time
+import warnings
+from typing import Any, Callable
+
+
+class BenchmarkTimeout(Exception):
+    """Raised when a benchmark exceeds its time limit and is killed."""
+
+
+def run_with_timeout(func: Callable[[], Any], timeout: float) -> Any:
+    """Calls `func()` in a forked child process, killing it after `timeout` seconds.
+
+    The child inherits the parent's memory, so `func` need not be picklable, but its
+    return value (or exception) is pickled back to the parent. Forking is used
+    directly rather than through multiprocessing, as the daemonic workers of
+    `--parallel` are not allowed to start child processes.
+
+    Parameters
+    ----------
+    func : Callable[[], Any]
+        The function to call.
+    timeout : float
+        Time limit in seconds.
+
+    Returns
+    -------
+    Any
+        The return value of `func()`.
+
+    Raises
+    ------
+    BenchmarkTimeout
+        If the child did not finish within `timeout` seconds.
+    """
+    if not hasattr(os, "fork"):  # pragma: no cover
+        warnings.warn(
+            "Benchmark time limits require os.fork(); running without a limit.",
+            UserWarning,
+        )
+        return func()
+
+    # avoid the child re-emitting any output still buffered in the parent.
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    rfd, wfd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:  # pragma: no cover
+        # child: run the benchmark and send back the pickled outcome.
+        os.close(rfd)
+        try:
+            payload = pickle.dumps((True, func()))
+        except BaseException as e:
+            try:
+                payload = pickle.dumps((False, e))
+            except Exception:
+                payload = pickle.dumps((False, RuntimeError(repr(e))))
+        with os.fdopen(wfd, "wb") as pipe:
+            pipe.write(payload)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
+
+    # parent: collect the outcome, until the deadline passes.
+    os.close(wfd)
+    deadline = time.monotonic() + timeout
+    chunks = []
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([rfd], [], [], remaining)[0]:
+                os.kill(pid, signal.SIGKILL)
+                raise BenchmarkTimeout(f"{timeout:.3g} sec")
+            chunk = os.read(rfd, 1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(rfd)
+        _, status = os.waitpid(pid, 0)
+
+    if not chunks:
+        raise RuntimeError(f"benchmark process died (wait status {status}).")
+    ok, value = pickle.loads(b"".join(chunks))
+    if not ok:
+        raise value
+    return value
+
+
+def call_with_alarm(func: Callable[[], Any], timeout: float) -> Any:
+    """Calls `func()` in this process, interrupting it after `timeout` seconds.
+
+    Unlike run_with_timeout(), `func` keeps any state warmed by earlier calls, and
+    pays no copy-on-write faults on memory shared with a forked parent, so that it
+    is timed as it would be without a limit. The limit is enforced by a SIGALRM,
+    which can only interrupt Python code between bytecodes: a call blocked inside
+    C code is not stopped until it returns. Falls back to run_with_timeout() where
+    SIGALRM is unavailable, or off the main thread.
+
+    Parameters
+    ----------
+    func : Callable[[], Any]
+        The function to call.
+    timeout : float
+        Time limit in seconds.
+
+    Returns
+    -------
+    Any
+        The return value of `func()`.
+
+    Raises
+    ------
+    BenchmarkTimeout
+        If `func()` did not finish within `timeout` seconds.
+    """
+    if (
+        not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):  # pragma: no cover
+        return run_with_timeout(func, timeout)
+    if timeout <= 0:
+        raise BenchmarkTimeout(f"{timeout:.3g} sec")
+
+    def expire(signum, frame):
+        raise BenchmarkTimeout(f"{timeout:.3g} sec")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -0,0 +1,364 @@
+"""Watches speed files and their local imports, re-timing only what changed."""
+
+import ctypes
+import ctypes.util
+import importlib
+import os
+import re
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from speedtest._cache import ShardedCache
+from speedtest._kwargs import Kwargs
+from speedtest._processor import (
+    _discover_source_files,
+    _process_source_file,
+    _validate_cache,
+)
+from speedtest._profiles import apply_profile
+from speedtest._speedtree import SpeedTree, parse_python_to_tree
+from speedtest._stringify import map_stringify_time
+
+# inotify flags, from <sys/inotify.h>.
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_EVENT = struct.Struct("iIII")
+
+
+class _PollingWatcher:
+    """Detects changed files by polling their modification times."""
+
+    def __init__(self, paths: Iterable[str], interval: float = 0.5):
+        self.interval = interval
+        self.mtimes: Dict[str, Optional[int]] = {}
+        self.update(paths)
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def update(self, paths: Iterable[str]) -> None:
+        """Watches any new paths, keeping the last seen state of existing ones."""
+        paths = set(paths)
+        self.mtimes = {
+            p: self.mtimes[p] if p in self.mtimes else self._mtime(p) for p in paths
+        }
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Blocks until a watched file changes, returning the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, mtime in self.mtimes.items():
+                new_mtime = self._mtime(path)
+                if new_mtime != mtime:
+                    self.mtimes[path] = new_mtime
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWatcher:
+    """Detects changed files using Linux inotify, watching their directories.
+
+    Directories are watched rather than files, as many editors save by replacing
+    the file, which would silently end a watch on the file itself.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths: Dict[str, str] = {}
+        self.dirs: Dict[int, str] = {}
+        self.update(paths)
+
+    def update(self, paths: Iterable[str]) -> None:
+        """Watches the directories of any new paths."""
+        # events name the real directory, which may be reached through several paths.
+        self.paths = {os.path.realpath(p): p for p in paths}
+        for directory in {os.path.dirname(p) for p in self.paths}:
+            if directory in self.dirs.values():
+                continue
+            wd = self.libc.inotify_add_watch(
+                self.fd,
+                os.fsencode(directory),
+                _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE,
+            )
+            if wd >= 0:
+                self.dirs[wd] = directory
+
+    def _read_events(self) -> Set[str]:
+        changed = set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = _IN_EVENT.unpack_from(data, offset)
+            offset += _IN_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            path = os.path.join(self.dirs.get(wd, ""), os.fsdecode(name))
+            if path in self.paths:
+                changed.add(self.paths[path])
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Blocks until a watched file changes, returning the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            if not select.select([self.fd], [], [], remaining)[0]:
+                return set()
+            changed = self._read_events()
+            if changed:
+                # an editor often saves in several steps; collect them together.
+                while select.select([self.fd], [], [], 0.05)[0]:
+                    changed |= self._read_events()
+                return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(paths: Iterable[str]):
+    """Watches files using inotify where available, else by polling."""
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher(paths)
+        except (OSError, AttributeError, TypeError):  # pragma: no cover
+            pass
+    return _PollingWatcher(paths)  # pragma: no cover
+
+
+def _local_dependencies(tree: SpeedTree, src: str) -> Set[str]:
+    """Finds the files of modules imported by a speed file, within the project.
+
+    Only modules that have already been imported are considered; installed packages
+    and speedtest itself are not watched.
+    """
+    root = os.getcwd()
+    deps = set()
+    for name in tree.imports:
+        if name == "speedtest" or name.startswith("speedtest."):
+            continue
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if path is None:
+            continue
+        path = os.path.realpath(path)
+        if (
+            path.startswith(root + os.sep)
+            and "site-packages" not in path
+            and path != os.path.realpath(src)
+        ):
+            deps.add(path)
+    return deps
+
+
+def _method_of(label: str) -> str:
+    """The name of the speed method that a (possibly parametrized) label belongs to."""
+    return re.split(r"[\[{]", label, maxsplit=1)[0]
+
+
+class WatchSession:
+    """Keeps speed files imported and timed, re-timing what changed on each refresh.
+
+    Parameters
+    ----------
+    kwargs : Kwargs
+        Command line keyword arguments.
+    logger : Callable[[str], None]
+        Logging function.
+    previous : dict, optional
+        Results to report deltas against on the first run, e.g. the cache.
+    """
+
+    def __init__(
+        self,
+        kwargs: Kwargs,
+        logger: Callable[[str], None],
+        previous: Optional[Dict[str, Any]] = None,
+    ):
+        apply_profile(kwargs)
+        self.kwargs = kwargs
+        self.logger = logger
+        self.results: Dict[str, Dict[str, Any]] = dict(previous or {})
+        self.trees: Dict[str, SpeedTree] = {}
+        self.deps: Dict[str, Set[str]] = {}
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+
+    def paths(self) -> Set[str]:
+        """Every speed file and local dependency being watched."""
+        return set(self.trees).union(*self.deps.values())
+
+    def _changed_methods(self, src: str, tree: SpeedTree, deps_changed: bool):
+        """Names of the methods of `src` to re-time; None to re-time all of them."""
+        old = self.trees.get(src)
+        if old is None or deps_changed or old.context_hash != tree.context_hash:
+            self.fixtures.pop(src, None)
+            return None
+
+        # drop the results of fixtures whose code changed.
+        for name, fixture_hash in tree.fixtures.items():
+            if old.fixtures.get(name) != fixture_hash:
+                self.fixtures.get(src, {}).pop(name, None)
+
+        old_hashes = {m.name: m.code_hash for m in old.methods}
+        only = {m.name for m in tree.methods if old_hashes.get(m.name) != m.code_hash}
+
+        # members of a group are only comparable when timed together.
+        groups = {m.group for m in tree.methods if m.name in only and m.group}
+        only |= {m.name for m in tree.methods if m.group in groups}
+        return only
+
+    def refresh(self, changed: Set[str]) -> None:
+        """Re-times benchmarks affected by the changed paths, and any new files.
+
+        Parameters
+        ----------
+        changed : Set[str]
+            Paths of the files that changed since the last refresh.
+        """
+        srcs = sorted(_discover_source_files(self.kwargs.file_or_dir))
+        changed_deps = {p for p in changed if p not in srcs}
+
+        # reload changed dependencies, so that speed files import their new code.
+        for module_ in list(sys.modules.values()):
+            path = getattr(module_, "__file__", None)
+            if path and os.path.realpath(path) in changed_deps:
+                importlib.reload(module_)
+
+        for src in set(self.trees) - set(srcs):
+            self.trees.pop(src)
+            self.deps.pop(src, None)
+            self.results.pop(src, None)
+
+        for src in srcs:
+            deps_changed = bool(self.deps.get(src, set()) & changed_deps)
+            if src in self.trees and src not in changed and not deps_changed:
+                continue
+            try:
+                self._retime(src, deps_changed)
+            except Exception as e:
+                self.logger(f"ERROR: could not time '{src}': {e!r}")
+
+    def _retime(self, src: str, deps_changed: bool) -> None:
+        tree = parse_python_to_tree(Path(src))
+        first_run = src not in self.trees
+        only = self._changed_methods(src, tree, deps_changed)
+        if only is not None and len(only) == 0:
+            self.trees[src] = tree
+            return
+
+        # keep the module warm, but pick up its new code.
+        script_name = os.path.splitext(os.path.basename(src))[0]
+        if not first_run and script_name in sys.modules:
+            importlib.reload(sys.modules[script_name])
+
+        # recalibrate the methods which changed.
+        previous = self.results.get(src, {})
+        cache_data = {
+            src: {
+                label: properties
+                for label, properties in previous.items()
+                if first_run or (only is not None and _method_of(label) not in only)
+            }
+        }
+        results, _ = _process_source_file(
+            src,
+            self.kwargs,
+            cache_data,
+            only=only,
+            fixture_cache=self.fixtures.setdefault(src, {}),
+        )
+        self._log_deltas(src, previous, results.get(src, {}))
+
+        if only is None:
+            self.results[src] = results.get(src, {})
+        else:
+            self.results.setdefault(src, {}).update(results.get(src, {}))
+        self.trees[src] = tree
+        self.deps[src] = _local_dependencies(tree, src)
+
+    def _log_deltas(
+        self, src: str, previous: Dict[str, Any], current: Dict[str, Any]
+    ) -> None:
+        """Prints the change in time per loop, and in instructions if counted, of
+        each re-timed benchmark."""
+        rel_path_to_script = os.path.relpath(src, os.getcwd())
+        for label, properties in current.items():
+            old = previous.get(label, {}).get("score", 0)
+            new = properties.get("score", 0)
+            if old <= 0 or new <= 0 or properties.get("status") != "ok":
+                continue
+            lhs_print = f"  Δ {rel_path_to_script}:{label} ".ljust(
+                self.kwargs.print_pad_width, "-"
+            )
+            instructions = ""
+            if "instructions" in previous[label] and "instructions" in properties:
+                instructions = ", {:,} -> {:,} instructions".format(
+                    previous[label]["instructions"], properties["instructions"]
+                )
+            self.logger(
+                "{} {} -> {} ({:+.1f}%){}".format(
+                    lhs_print,
+                    map_stringify_time(self.kwargs.unit, old),
+                    map_stringify_time(self.kwargs.unit, new),
+                    100.0 * (new / old - 1.0),
+                    instructions,
+                )
+            )
+
+
+def run_watch(kwargs: Kwargs, logger: Callable[[str], None]) -> None:
+    """Times every speed file, then re-times benchmarks as their code changes.
+
+    Args:
+        kwargs (Kwargs): keyword arguments.
+        logger (Callable[[str], None]): Logging function.
+    """
+    # the process is kept warm, so everything is timed in this process.
+    kwargs.parallel = False
+    previous = {} if kwargs.no_cache else _validate_cache(ShardedCache(), logger)
+    session = WatchSession(kwargs, logger, previous)
+    session.refresh(set())
+
+    watcher = make_watcher(session.paths())
+    try:
+        while True:
+            logger(
+                "\nwatching {} file{} for changes, press Ctrl+C to stop...".format(
+                    len(session.paths()), "s" if len(session.paths()) != 1 else ""
+                )
+            )
+            changed = watcher.wait()
+            logger(
+                "changed: {}\n".format(
+                    ", ".join(sorted(os.path.relpath(p) for p in changed))
+                )
+            )
+            session.refresh(changed)
+            watcher.update(session.paths())
+    except KeyboardInterrupt:
+        logger("stopped watching.")
+    finally:
+        watcher.close()
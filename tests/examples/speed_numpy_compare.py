@@ -2,13 +2,14 @@
 Example of a basic speedtest using the speedtest library.
 This file is used to test the speedtest functionality by comparing
     raw Python and NumPy implementations.
-It includes two functions that perform list comprehensions and a for loop.
+It includes two functions that perform list comprehensions and a for loop,
+grouped together so that they are ranked against the for loop baseline.
 This is a minimal example to demonstrate the speedtest capabilities.
 
 @MIT license.
 """
 
-from speedtest import fixture
+from speedtest import fixture, group
 
 
 @fixture
@@ -17,6 +18,7 @@ def number():
     return 100000
 
 
+@group("square", baseline=True)
 def speed_square_for_loop(number):
     """Performs a for loop to square numbers."""
     _ = []
@@ -24,11 +26,13 @@ def speed_square_for_loop(number):
         _ += [x**2]
 
 
+@group("square")
 def speed_square_list_comp(number):
     """Performs a list comprehension to square numbers."""
     _ = [x**2 for x in range(number)]
 
 
+@group("square")
 def speed_square_numpy(number):
     """Performs a numpy operation to square numbers."""
     import numpy as np
@@ -0,0 +1,78 @@
+"""Tests bisecting a regression across git commits."""
+
+import subprocess
+
+import pytest
+
+from speedtest._bisect import is_slower, list_commits, run_bisect
+from speedtest._kwargs import Kwargs
+from speedtest._processor import matches_keyword
+
+
+def test_is_slower():
+    baseline = [1.0, 1.1, 0.9, 1.0, 1.0]
+    assert is_slower(baseline, [2.0, 2.1, 1.9, 2.0, 2.0]) is True
+    assert is_slower(baseline, [1.0, 1.02, 0.98, 1.0, 1.0]) is False
+    # outliers do not make a revision slower.
+    assert is_slower(baseline, [1.0, 1.0, 1.0, 9.0, 9.0]) is False
+    # a slower median, but one fast sample; too noisy to tell.
+    assert is_slower(baseline, [0.9, 2.0, 2.1, 2.0, 2.0]) is None
+    # too few samples.
+    assert is_slower(baseline[:3], [2.0, 2.1, 1.9]) is None
+
+
+def test_matches_keyword():
+    assert matches_keyword("speed_x.py:speed_a[n=1]", "speed_a")
+    assert matches_keyword("speed_x.py:speed_a[n=1]", "*:speed_a[[]n=1]")
+    assert not matches_keyword("speed_x.py:speed_a[n=1]", "speed_b")
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A repository whose `work` becomes slower in its third commit."""
+    for key in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{key}_NAME", "speedtest")
+        monkeypatch.setenv(f"GIT_{key}_EMAIL", "speedtest@example.com")
+    monkeypatch.chdir(tmp_path)
+
+    def commit(body: str, message: str) -> None:
+        (tmp_path / "mylib.py").write_text(f"import time\n\n\ndef work():\n{body}\n")
+        subprocess.run(["git", "add", "-A"], check=True)
+        subprocess.run(["git", "commit", "-qm", message], check=True)
+
+    subprocess.run(["git", "init", "-q"], check=True)
+    (tmp_path / "speed_mylib.py").write_text(
+        "import mylib\n\n\ndef speed_work():\n    mylib.work()\n\n\n"
+        "def speed_other():\n    sum(range(1000))\n"
+    )
+    # the regression is orders of magnitude slower, far above any timer noise.
+    work = "    sum(range(100))"
+    slow = f"{work}\n    time.sleep(0.01)"
+    commit(work, "initial")
+    commit(f"{work}\n    # a comment", "comment")
+    commit(slow, "regression")
+    commit(f"{slow}\n    # a comment", "another comment")
+    commit(f"{slow}\n    # another", "yet another comment")
+    return tmp_path
+
+
+def test_bisect(repo, capsys):
+    commits = list_commits("HEAD~4", "HEAD")
+    assert len(commits) == 5
+
+    kwargs = Kwargs(file_or_dir=["."], keyword="speed_work", nreps=5, min_time=0.01)
+    # a large threshold, so that timer noise on a busy machine is not a regression.
+    assert run_bisect("HEAD~4", "HEAD", kwargs, print, threshold=10.0) == 0
+    out = capsys.readouterr().out
+    assert f"first slower commit of speed_mylib.py:speed_work:\n{commits[2]}" in out
+
+    # no worktrees are left behind.
+    worktrees = subprocess.run(
+        ["git", "worktree", "list"], capture_output=True, text=True, check=True
+    )
+    assert len(worktrees.stdout.strip().splitlines()) == 1
+
+
+def test_bisect_not_slower(repo):
+    kwargs = Kwargs(file_or_dir=["."], keyword="speed_other", nreps=5, min_time=0.01)
+    assert run_bisect("HEAD~4", "HEAD", kwargs, print, threshold=10.0) == 1
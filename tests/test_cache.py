@@ -0,0 +1,152 @@
+"""Tests the sharded cache."""
+
+import json
+import os
+import pickle
+from multiprocessing import get_context
+from pathlib import Path
+
+from speedtest._cache import ShardedCache, shard_name, write_shards
+
+
+def _write_many(cache_dir: str, src: str, start: int) -> None:
+    for i in range(start, start + 20):
+        write_shards({src: {f"speed_{i}": {"nloops": i, "score": 1.0}}}, cache_dir)
+
+
+def test_write_shards_merges(tmp_path):
+    cache_dir = str(tmp_path)
+    write_shards({"/a/speed_a.py": {"speed_x": {"nloops": 1}}}, cache_dir)
+    write_shards({"/a/speed_b.py": {"speed_y": {"nloops": 2}}}, cache_dir)
+    write_shards({"/a/speed_a.py": {"speed_z": {"nloops": 3}}}, cache_dir)
+
+    cache = ShardedCache(cache_dir)
+    assert cache["/a/speed_a.py"] == {
+        "speed_x": {"nloops": 1},
+        "speed_z": {"nloops": 3},
+    }
+    assert sorted(cache) == ["/a/speed_a.py", "/a/speed_b.py"]
+    assert "/a/speed_c.py" not in cache and cache.get("/a/speed_c.py") is None
+    # no temporary files are left behind.
+    shards = sorted(os.listdir(tmp_path / "shards"))
+    assert [f for f in shards if f.endswith(".json")] == sorted(
+        [shard_name("/a/speed_a.py"), shard_name("/a/speed_b.py")]
+    )
+    assert not [f for f in shards if f.endswith(".tmp")]
+
+
+def test_write_shards_permissions(tmp_path, monkeypatch):
+    import speedtest._cache
+
+    monkeypatch.setattr(speedtest._cache, "_UMASK", 0o022)
+    write_shards({"/a/speed_a.py": {"speed_x": {"nloops": 1}}}, str(tmp_path))
+    fname = tmp_path / "shards" / shard_name("/a/speed_a.py")
+    assert fname.stat().st_mode & 0o777 == 0o644
+
+
+def test_sharded_cache_lazy(tmp_path):
+    cache_dir = str(tmp_path)
+    assert not ShardedCache(cache_dir)
+    write_shards({"/a/speed_a.py": {"speed_x": {"nloops": 1}}}, cache_dir)
+    write_shards({"/a/speed_b.py": {"speed_y": {"nloops": 2}}}, cache_dir)
+
+    cache = ShardedCache(cache_dir)
+    assert cache
+    assert cache["/a/speed_a.py"]
+    assert list(cache._shards) == ["/a/speed_a.py"]
+    # pickles without its loaded shards.
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.cache_dir == cache_dir and clone._shards == {}
+
+
+def test_sharded_cache_legacy(tmp_path):
+    legacy = {"/a/speed_a.py": {"speed_x": {"nloops": 1}, "speed_y": {"nloops": 2}}}
+    (tmp_path / "cache.json").write_text(json.dumps(legacy))
+    cache = ShardedCache(str(tmp_path))
+    assert cache["/a/speed_a.py"] == legacy["/a/speed_a.py"]
+
+    # a new shard starts from the legacy results.
+    write_shards({"/a/speed_a.py": {"speed_x": {"nloops": 10}}}, str(tmp_path))
+    assert ShardedCache(str(tmp_path))["/a/speed_a.py"] == {
+        "speed_x": {"nloops": 10},
+        "speed_y": {"nloops": 2},
+    }
+
+
+def test_write_shards_concurrent(tmp_path):
+    ctx = get_context("spawn")
+    procs = [
+        ctx.Process(target=_write_many, args=(str(tmp_path), "/a/speed_a.py", start))
+        for start in (0, 20)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    assert len(ShardedCache(str(tmp_path))["/a/speed_a.py"]) == 40
+
+
+def test_run_session_keeps_deselected(tmp_path, monkeypatch):
+    from speedtest._kwargs import Kwargs
+    from speedtest._processor import run_session
+
+    monkeypatch.chdir(tmp_path)
+    path = str(Path(__file__).parent / "./examples/speed_basic.py")
+    kwargs = dict(file_or_dir=[path], no_precheck=True, profile="quick")
+    assert run_session(Kwargs(**kwargs), print) == 0
+    assert run_session(Kwargs(**kwargs, keyword="comp2"), print) == 0
+    assert sorted(ShardedCache()[path]) == [
+        "speed_square_list_comp",
+        "speed_square_list_comp2",
+    ]
+
+
+def test_run_session_fingerprint_change(tmp_path, monkeypatch):
+    from speedtest._kwargs import Kwargs
+    from speedtest._processor import run_session
+
+    monkeypatch.chdir(tmp_path)
+    for name in ("a", "b"):
+        (tmp_path / f"speed_{name}.py").write_text(
+            f"def speed_{name}():\n    sum(range(10))\n"
+        )
+    path_a, path_b = str(tmp_path / "speed_a.py"), str(tmp_path / "speed_b.py")
+    kwargs = dict(file_or_dir=[path_a, path_b], no_precheck=True, profile="quick")
+    assert run_session(Kwargs(**kwargs), print) == 0
+    assert path_a in ShardedCache() and path_b in ShardedCache()
+
+    # the cache was written on another environment.
+    fname = tmp_path / ".speedtest_cache" / "fingerprint.json"
+    fingerprint = json.loads(fname.read_text())
+    fname.write_text(json.dumps({**fingerprint, "python": "0.0.0"}))
+    assert run_session(Kwargs(**kwargs, keyword="speed_a"), print) == 0
+
+    # the stale results of B are dropped, so that B is recalibrated when next run.
+    cache = ShardedCache()
+    assert path_a in cache and path_b not in cache
+    assert json.loads(fname.read_text())["python"] == fingerprint["python"]
+
+
+def test_run_session_legacy_cache(tmp_path, monkeypatch):
+    from speedtest._kwargs import Kwargs
+    from speedtest._processor import run_session
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "speed_x.py").write_text("def speed_a():\n    sum(range(10))\n")
+    path_x = str(tmp_path / "speed_x.py")
+    # a cache of an earlier version, without a fingerprint or shards.
+    legacy = {
+        path_x: {"speed_a": {"nloops": 7, "score": 1e-6}},
+        "/elsewhere/speed_y.py": {"speed_b": {"nloops": 3, "score": 1e-6}},
+    }
+    cache_dir = tmp_path / ".speedtest_cache"
+    cache_dir.mkdir()
+    (cache_dir / "cache.json").write_text(json.dumps(legacy))
+
+    assert run_session(Kwargs(file_or_dir=[path_x], no_precheck=True), print) == 0
+    # the legacy calibration is adopted, and the other files' results are kept.
+    cache = ShardedCache()
+    assert cache[path_x]["speed_a"]["nloops"] == 7
+    assert cache["/elsewhere/speed_y.py"] == legacy["/elsewhere/speed_y.py"]
+    assert (cache_dir / "cache.json").is_file()
+    assert (cache_dir / "fingerprint.json").is_file()
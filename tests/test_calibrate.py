@@ -0,0 +1,29 @@
+"""Tests the calibration kernels and system noise checks."""
+
+from speedtest._calibrate import (
+    calibration_reference,
+    kernel_noise,
+    run_calibration_suite,
+    system_noise,
+)
+
+
+def test_run_calibration_suite():
+    suite = run_calibration_suite(nreps=2)
+    assert set(suite) == {"python_loop", "memcopy", "alloc"}
+    assert all(len(times) == 2 and min(times) > 0 for times in suite.values())
+    assert calibration_reference(suite) > 0
+
+
+def test_calibration_reference():
+    suite = {"a": [1.0, 2.0], "b": [4.0]}
+    assert calibration_reference(suite) == 2.0
+
+
+def test_kernel_noise():
+    assert kernel_noise({"a": [1.0, 1.1]}) == []
+    assert len(kernel_noise({"a": [1.0, 2.0, 2.0]})) == 1
+
+
+def test_system_noise():
+    assert isinstance(system_noise(), list)
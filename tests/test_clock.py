@@ -0,0 +1,73 @@
+"""Tests selectable clocks and resource accounting."""
+
+import time
+import timeit
+from pathlib import Path
+
+import pytest
+
+from speedtest._kwargs import Kwargs
+from speedtest._processor import SpCase, _run_case
+from speedtest._profiles import autorange
+from speedtest._regions import region_clock, use_clock
+from speedtest._rusage import rusage_available
+from speedtest._speedtree import SpMethod
+from speedtest._stringify import stringify_rusage
+
+
+@pytest.fixture
+def process_clock():
+    use_clock("process")
+    yield
+    use_clock("wall")
+
+
+def test_use_clock(process_clock):
+    # sleeping uses no CPU time.
+    assert timeit.Timer(lambda: time.sleep(0.02), timer=region_clock).timeit(2) < 0.02
+    with pytest.raises(ValueError):
+        use_clock("sundial")
+
+
+def test_autorange_max_wall(process_clock):
+    timer = timeit.Timer(lambda: time.sleep(0.001), timer=region_clock)
+    t0 = time.perf_counter()
+    nloops, _ = autorange(timer, min_time=0.2, max_wall=0.05)
+    assert time.perf_counter() - t0 < 1.0
+    assert nloops >= 50
+
+
+@pytest.mark.skipif(not rusage_available(), reason="needs the resource module")
+def test_run_case_rusage():
+    case = SpCase(
+        SpMethod("speed_alloc", []), lambda: bytearray(1 << 20), "speed_alloc", {}
+    )
+    kwargs = Kwargs(file_or_dir=[], rusage=True, min_time=0.01, nreps=2)
+    properties = _run_case(case, "speed_x.py", kwargs, {})
+
+    usage = properties["rusage"]
+    assert usage["ncalls"] == 2 * properties["nloops"]
+    assert usage["user"] + usage["system"] > 0
+    assert usage["max_rss"] > 1 << 20
+
+    lines = stringify_rusage(properties, "auto", 40)
+    assert lines[0].startswith("    cpu ----") and "per loop" in lines[0]
+    assert "context switches" in lines[1] and "max RSS" in lines[1]
+
+
+def test_run_session_clock(capsys):
+    from speedtest._processor import run_session
+
+    path = str(Path(__file__).parent / "./examples/speed_basic.py")
+    kwargs = Kwargs(
+        file_or_dir=[path],
+        no_cache=True,
+        no_precheck=True,
+        clock="thread",
+        rusage=True,
+        profile="quick",
+    )
+    assert run_session(kwargs, print) == 0
+    out = capsys.readouterr().out
+    assert "clock=thread" in out
+    use_clock("wall")
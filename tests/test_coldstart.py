@@ -0,0 +1,41 @@
+"""Tests measuring speed functions from cold, in fresh interpreters."""
+
+from pathlib import Path
+
+import pytest
+
+from speedtest._coldstart import _MARKER, measure_cold_start, parse_importtime
+from speedtest._timeout import BenchmarkTimeout
+
+IMPORTTIME = f"""import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+{_MARKER}
+import time:       250 |        250 |   _json
+import time:       500 |        750 | json
+{_MARKER}
+import time:        90 |         90 | speedtest._processor
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(IMPORTTIME) == [
+        ("_json", pytest.approx(250e-6), pytest.approx(250e-6)),
+        ("json", pytest.approx(500e-6), pytest.approx(750e-6)),
+    ]
+
+
+def test_measure_cold_start():
+    src = str(Path(__file__).parent / "examples" / "speed_basic.py")
+    cold = measure_cold_start(src, "speed_square_list_comp2", nsamples=1)
+    assert cold["import"] > 0
+    assert cold["first_call"] > 0
+    assert len(cold["samples"]) == 1
+    # the imports of the speed file, excluding the file itself.
+    assert "speedtest" in [module for module, _, _ in cold["imports"]]
+    assert "speed_basic" not in [module for module, _, _ in cold["imports"]]
+
+    with pytest.raises(RuntimeError):
+        measure_cold_start(src, "speed_missing", nsamples=1)
+    # an interpreter exceeding the time limit is killed, and reported as a timeout.
+    with pytest.raises(BenchmarkTimeout):
+        measure_cold_start(src, "speed_square_list_comp2", nsamples=1, timeout=1e-3)
@@ -0,0 +1,94 @@
+"""Tests the cached, memory-mapped datafile() fixtures."""
+
+import mmap
+import random
+from pathlib import Path
+
+import pytest
+
+import speedtest
+from speedtest._datafile import DataFile
+from speedtest._kwargs import Kwargs
+from speedtest._processor import run_session
+from speedtest._speedtree import parse_python_to_tree
+
+CALLS = []
+
+
+def _random_bytes(seed, n):
+    CALLS.append((seed, n))
+    return random.Random(seed).randbytes(n)
+
+
+def test_datafile_cached(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(speedtest._cache, "_UMASK", 0o022)
+    CALLS.clear()
+    data = speedtest.datafile(seed=1, n=1000)(_random_bytes)
+    assert isinstance(data, DataFile) and data.__name__ == "_random_bytes"
+
+    view = data()
+    assert isinstance(view, mmap.mmap) and len(view) == 1000
+    assert view[:] == random.Random(1).randbytes(1000)
+    with pytest.raises(TypeError):
+        view[0] = 0
+    assert data() is view
+
+    # generated once across fixtures, keyed by the seed and arguments.
+    assert speedtest.datafile(seed=1, n=1000)(_random_bytes)()[:] == view[:]
+    assert CALLS == [(1, 1000)]
+    other = speedtest.datafile(seed=2, n=1000)(_random_bytes)
+    assert other.path() != data.path()
+    # readable by others, as if created with open().
+    assert Path(data.path()).stat().st_mode & 0o777 == 0o644
+    other()
+    assert CALLS == [(1, 1000), (2, 1000)]
+    assert Path(data.path()).parent == tmp_path / ".speedtest_cache" / "data"
+
+
+def test_datafile_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    @speedtest.datafile(lines=3)
+    def csv_blob(path, seed, lines):
+        with open(path, "w") as f:
+            for i in range(lines):
+                f.write(f"{i},{seed}\n")
+
+    assert csv_blob()[:] == b"0,0\n1,0\n2,0\n"
+
+
+def test_datafile_numpy(tmp_path, monkeypatch):
+    numpy = pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+
+    @speedtest.datafile(seed=3, n=100)
+    def array(seed, n):
+        return numpy.random.default_rng(seed).random(n)
+
+    view = array()
+    assert isinstance(view, numpy.memmap) and view.shape == (100,)
+    assert not view.flags.writeable
+    assert array.path().endswith(".npy")
+
+
+def test_datafile_is_fixture(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    src = tmp_path / "speed_data.py"
+    src.write_text(
+        "import speedtest\n\n\n"
+        "@speedtest.datafile(seed=0, n=4096)\n"
+        "def blob(seed, n):\n"
+        "    return bytes(range(256)) * (n // 256)\n\n\n"
+        "def speed_search(blob):\n"
+        "    blob.find(b'zz')\n"
+    )
+    tree = parse_python_to_tree(src)
+    assert tree.methods[0].fixtures == ["blob"]
+    assert list(tree.fixtures) == ["blob"]
+
+    kwargs = Kwargs(file_or_dir=[str(src)], no_precheck=True, profile="quick")
+    assert run_session(kwargs, print) == 0
+    out = capsys.readouterr().out
+    assert "speed_data.py:speed_search" in out and "FAILED" not in out
+    assert len(list((tmp_path / ".speedtest_cache" / "data").glob("blob-*.bin"))) == 1
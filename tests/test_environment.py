@@ -0,0 +1,35 @@
+"""Tests the environment fingerprint."""
+
+import json
+
+from speedtest._environment import (
+    collect_fingerprint,
+    fingerprint_diff,
+    fingerprint_id,
+)
+
+
+def test_collect_fingerprint():
+    fp = collect_fingerprint(["pytest", "json"])
+    for key in ("python", "build", "cpu_model", "cpu_count", "memory_total"):
+        assert key in fp
+    assert "pytest" in fp["packages"]
+    # must be storable within the cache.
+    json.dumps(fp)
+
+
+def test_fingerprint_diff():
+    fp = collect_fingerprint(["pytest"])
+    assert fingerprint_diff(fp, dict(fp)) == []
+
+    # volatile fields do not invalidate the fingerprint.
+    assert fingerprint_diff(fp, {**fp, "git_commit": "abc", "cpu_freq_mhz": 1}) == []
+
+    changed = {**fp, "python": "2.7.18", "packages": {"pytest": "0.0.1"}}
+    assert fingerprint_diff(fp, changed) == ["python", "packages[pytest]"]
+
+
+def test_fingerprint_id():
+    fp = collect_fingerprint([])
+    assert fingerprint_id(fp) == fingerprint_id({**fp, "git_commit": "abc"})
+    assert fingerprint_id(fp) != fingerprint_id({**fp, "cpu_count": 1024})
@@ -0,0 +1,127 @@
+"""Tests exporting results to other tools' formats."""
+
+import csv
+import json
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from speedtest._export import (
+    table_columns,
+    write_arrow,
+    write_csv,
+    write_gbench,
+    write_junit,
+    write_pyperf,
+)
+
+
+@pytest.fixture
+def results(tmp_path, monkeypatch):
+    """A cache of an ok, a violating, a timed-out and a skipped benchmark."""
+    monkeypatch.chdir(tmp_path)
+    src = os.path.join(str(tmp_path), "speed_x.py")
+    return {
+        src: {
+            "speed_a[n=1,s=a|b]": {
+                "nloops": 10,
+                "score": 1e-3,
+                "samples": [1e-3, 2e-3, 3e-3],
+                "items_per_sec": 1000.0,
+                "param__n": 1,
+                "param__s": "a|b",
+                "status": "ok",
+            },
+            "speed_b": {
+                "nloops": 5,
+                "score": 0.5,
+                "samples": [0.5, 0.6],
+                "status": "ok",
+                "violations": ["time 550 ms > 100 ms <&>"],
+            },
+            "speed_c": {"nloops": 5, "score": 0, "status": "timeout"},
+            "speed_d": {"nloops": 5, "score": 0, "status": "skipped"},
+        }
+    }
+
+
+def test_csv(results):
+    fname = write_csv(results)
+    with open(fname, newline="") as fid:
+        rows = list(csv.DictReader(fid))
+
+    # the original columns and parameters keep their positions.
+    assert list(rows[0]) == table_columns(["param__n", "param__s"])
+    assert list(rows[0])[:6] == [
+        "filepath",
+        "function_name",
+        "nloops",
+        "time_taken_ms",
+        "param__n",
+        "param__s",
+    ]
+    assert rows[0]["function_name"] == "speed_a"
+    assert rows[0]["param__s"] == "a|b"
+    assert float(rows[0]["mean_ms"]) == pytest.approx(2.0)
+    assert rows[1]["violations"].startswith("time 550 ms")
+    assert rows[2]["status"] == "timeout"
+
+
+def test_pyperf(results):
+    with open(write_pyperf(results, {"python": "3.13.0"})) as fid:
+        content = json.load(fid)
+
+    assert content["version"] == "1.0"
+    assert content["metadata"]["python_version"] == "3.13.0"
+    # only timed benchmarks are exported.
+    assert [b["metadata"]["name"] for b in content["benchmarks"]] == [
+        "speed_x.py:speed_a[n=1,s=a|b]",
+        "speed_x.py:speed_b",
+    ]
+    assert content["benchmarks"][0]["metadata"]["loops"] == 10
+    assert content["benchmarks"][0]["runs"][0]["values"] == [1e-3, 2e-3, 3e-3]
+
+
+def test_gbench(results):
+    with open(write_gbench(results)) as fid:
+        content = json.load(fid)
+
+    runs = [b for b in content["benchmarks"] if b["name"] == "speed_x.py:speed_b"]
+    assert [r["real_time"] for r in runs] == pytest.approx([5e8, 6e8])
+    assert runs[0]["iterations"] == 5
+    means = [b for b in content["benchmarks"] if b.get("aggregate_name") == "mean"]
+    assert means[0]["items_per_second"] == 1000.0
+    assert means[0]["real_time"] == pytest.approx(2e6)
+    errors = [b for b in content["benchmarks"] if b.get("error_occurred")]
+    assert [e["error_message"] for e in errors] == ["timeout", "skipped"]
+    assert content["context"]["speedtest_clock"] == "wall"
+    assert "cpu_time" not in runs[0]
+
+    # CPU-time clocks are reported as `cpu_time` alone.
+    with open(write_gbench(results, clock="process")) as fid:
+        content = json.load(fid)
+    runs = [b for b in content["benchmarks"] if b["name"] == "speed_x.py:speed_b"]
+    assert [r["cpu_time"] for r in runs] == pytest.approx([5e8, 6e8])
+    assert "real_time" not in runs[0]
+
+
+def test_junit(results):
+    suite = ET.parse(write_junit(results)).getroot().find("testsuite")
+
+    assert suite.get("name") == "speed_x.py"
+    assert (suite.get("tests"), suite.get("failures")) == ("4", "1")
+    assert (suite.get("errors"), suite.get("skipped")) == ("1", "1")
+    cases = suite.findall("testcase")
+    assert cases[0].get("classname") == "speed_x"
+    assert cases[1].find("failure").get("message") == "time 550 ms > 100 ms <&>"
+    assert cases[2].find("error").get("type") == "timeout"
+    assert cases[3].find("skipped") is not None
+
+
+def test_arrow(results):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pq.read_table(write_arrow(results, "parquet"))
+
+    assert table.num_rows == 4
+    assert table.column("param__n").to_pylist() == ["1", None, None, None]
@@ -0,0 +1,75 @@
+"""Tests counting the bytecode instructions and calls of a benchmark."""
+
+from pathlib import Path
+
+import pytest
+
+from speedtest._instructions import count_instructions, instructions_available
+from speedtest._kwargs import Kwargs
+from speedtest._processor import SpCase, _run_case
+from speedtest._speedtree import SpMethod
+from speedtest._stringify import stringify_instructions
+
+pytestmark = pytest.mark.skipif(
+    not instructions_available(), reason="needs sys.monitoring, Python 3.12+"
+)
+
+
+def _work(n: int) -> int:
+    return sum(abs(i) for i in range(n))
+
+
+def test_count_instructions():
+    assert count_instructions(lambda: None) == {"instructions": 0, "calls": 0}
+
+    small = count_instructions(lambda: _work(10))
+    large = count_instructions(lambda: _work(100))
+    # deterministic, and growing with the work done.
+    assert small == count_instructions(lambda: _work(10))
+    assert large["instructions"] > small["instructions"] > 0
+    assert large["calls"] - small["calls"] == 90
+
+
+def test_stringify_instructions():
+    properties = {"instructions": 1100, "calls": 20}
+    assert stringify_instructions({}, None, 40) == []
+    (line,) = stringify_instructions(properties, None, 40)
+    assert line.startswith("    instructions ----")
+    assert line.endswith("1,100 instructions, 20 calls per call")
+    (line,) = stringify_instructions(properties, {"instructions": 1000}, 40)
+    assert line.endswith("(was 1,000, +10.0%)")
+    (line,) = stringify_instructions(properties, properties, 40)
+    assert line.endswith("(unchanged)")
+
+
+def test_run_case_count_instructions():
+    case = SpCase(
+        SpMethod("speed_work", ["n"]),
+        _work,
+        "speed_work",
+        {},
+        lambda: ((), {"n": 10}),
+    )
+    kwargs = Kwargs(file_or_dir=[], count_instructions=True, min_time=0.01, nreps=2)
+    properties = _run_case(case, "speed_x.py", kwargs, {})
+    assert properties["instructions"] > 0
+    assert properties["calls"] >= 10
+
+    kwargs.count_instructions = False
+    assert "instructions" not in _run_case(case, "speed_x.py", kwargs, {})
+
+
+def test_run_session_count_instructions(capsys):
+    from speedtest._processor import run_session
+
+    path = str(Path(__file__).parent / "./examples/speed_basic.py")
+    kwargs = Kwargs(
+        file_or_dir=[path],
+        no_cache=True,
+        no_precheck=True,
+        count_instructions=True,
+        profile="quick",
+    )
+    assert run_session(kwargs, print) == 0
+    out = capsys.readouterr().out
+    assert out.count(" calls per call") == 2
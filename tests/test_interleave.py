@@ -0,0 +1,120 @@
+"""Tests timing the rounds of all benchmarks in a seeded random order."""
+
+import os
+import sys
+
+import pytest
+
+from speedtest._cache import ShardedCache
+from speedtest._kwargs import Kwargs
+from speedtest._processor import run_session
+
+
+@pytest.fixture
+def speed_file(tmpdir, monkeypatch):
+    """A speed file recording the order its functions are called in."""
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.delitem(sys.modules, "speed_order", raising=False)
+    with open(os.path.join(tmpdir, "speed_order.py"), "w") as fid:
+        fid.write(
+            "import speedtest\n\n"
+            "calls = []\n\n"
+            "def speed_a():\n"
+            "    calls.append('a')\n\n"
+            "@speedtest.group('pair')\n"
+            "def speed_b():\n"
+            "    calls.append('b')\n\n"
+            "@speedtest.group('pair')\n"
+            "def speed_c():\n"
+            "    calls.append('c')\n"
+        )
+    return tmpdir
+
+
+def _rounds(seed):
+    """Runs an interleaved session, returning the order of its timed rounds."""
+    import speed_order
+
+    kwargs = Kwargs(
+        file_or_dir=["."],
+        no_cache=True,
+        no_precheck=True,
+        interleave=True,
+        seed=seed,
+        nreps=4,
+        max_loops=1,
+    )
+    del speed_order.calls[:]
+    assert run_session(kwargs, print) == 0
+    # each case is first called once to calibrate it.
+    return "".join(speed_order.calls[3:])
+
+
+def test_interleave(speed_file, capsys):
+    order = _rounds(seed=3)
+    assert sorted(order) == sorted("aaaabbbbcccc")
+    assert order not in ("aaaabbbbcccc", "abcabcabcabc")
+    assert _rounds(seed=3) == order
+
+    out = capsys.readouterr().out
+    assert "interleaved (seed 3)" in out
+    assert "group 'speed_order.py:pair' ranked" in out
+
+
+def test_interleave_timeout(tmpdir, monkeypatch, capsys):
+    monkeypatch.chdir(tmpdir)
+    with open(os.path.join(tmpdir, "speed_hang.py"), "w") as fid:
+        fid.write(
+            "import time\n\nimport speedtest\n\n"
+            "def speed_fast():\n"
+            "    sum(range(10))\n\n"
+            "@speedtest.timeout(0.5)\n"
+            "def speed_hang():\n"
+            "    time.sleep(60)\n"
+        )
+    kwargs = Kwargs(
+        file_or_dir=["."],
+        no_precheck=True,
+        interleave=True,
+        parallel=True,
+        nreps=3,
+        max_loops=1,
+    )
+    # the hung benchmark is killed, and reported, instead of hanging the session.
+    assert run_session(kwargs, print) == 1
+    out = capsys.readouterr().out
+    assert "--parallel and --replicas are ignored" in out
+    assert "speed_hang.py:speed_hang" in out and "TIMEOUT" in out
+    results = ShardedCache()[os.path.join(str(tmpdir), "speed_hang.py")]
+    assert results["speed_hang"]["status"] == "timeout"
+    assert results["speed_fast"]["status"] == "ok"
+
+
+def test_interleave_timeout_unbiased(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open(os.path.join(tmpdir, "speed_touch.py"), "w") as fid:
+        fid.write(
+            "import speedtest\n\n"
+            "data = [[i] for i in range(100_000)]\n\n"
+            "def touch():\n"
+            "    for item in data:\n"
+            "        item[0] += 1\n\n"
+            "def speed_free():\n"
+            "    touch()\n\n"
+            "@speedtest.timeout(60)\n"
+            "def speed_limited():\n"
+            "    touch()\n"
+        )
+    kwargs = Kwargs(
+        file_or_dir=["."],
+        no_precheck=True,
+        interleave=True,
+        nreps=10,
+        max_loops=1,
+    )
+    assert run_session(kwargs, print) == 0
+    # the rounds of a case with a time limit are timed like those without one.
+    results = ShardedCache()[os.path.join(str(tmpdir), "speed_touch.py")]
+    free, limited = results["speed_free"]["score"], results["speed_limited"]["score"]
+    assert limited == pytest.approx(free, rel=0.1)
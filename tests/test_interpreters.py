@@ -0,0 +1,70 @@
+"""Tests comparing a suite across interpreters."""
+
+import sys
+from pathlib import Path
+
+from speedtest._interpreters import (
+    _child_command,
+    parse_interpreters,
+    run_interpreters,
+    stringify_matrix,
+)
+from speedtest._kwargs import Kwargs
+
+
+def test_parse_interpreters():
+    assert parse_interpreters("python3.12, python3.13,") == ["python3.12", "python3.13"]
+
+
+def test_child_command():
+    kwargs = Kwargs(
+        file_or_dir=[],
+        nreps=3,
+        max_time_per_benchmark="30s",
+        session_budget="15m",
+        rusage=True,
+        cold=True,
+        interleave=True,
+        seed=7,
+    )
+    cmd = _child_command("python3.13", ["speed_a.py"], kwargs, "out.json")
+    assert cmd[:4] == ["python3.13", "-m", "speedtest", "speed_a.py"]
+    assert cmd[cmd.index("--max-time-per-benchmark") + 1] == "30s"
+    assert cmd[cmd.index("--session-budget") + 1] == "15m"
+    assert cmd[cmd.index("--seed") + 1] == "7"
+    assert {"--rusage", "--cold", "--interleave"} <= set(cmd)
+
+    cmd = _child_command("python3.13", ["a.py"], Kwargs(file_or_dir=[], nreps=3), "o")
+    assert not {"--max-time-per-benchmark", "--interleave", "--seed"} & set(cmd)
+
+
+def test_stringify_matrix():
+    results = [
+        {"/x/speed_a.py": {"speed_f": {"score": 4e-3}, "speed_g": {"score": 2e-3}}},
+        {"/x/speed_a.py": {"speed_f": {"score": 2e-3}, "speed_g": {"score": 8e-3}}},
+    ]
+    lines = stringify_matrix(
+        ["3.12.1", "3.13.0"], results, ["/x/speed_a.py"], Kwargs(file_or_dir=[])
+    )
+
+    assert lines[0].split() == ["3.12.1", "3.13.0"]
+    assert lines[1].endswith("2.0 msec (2.00x)")
+    assert lines[2].endswith("8.0 msec (0.25x)")
+    assert lines[3].split()[-2:] == ["1.00x", "0.71x"]
+
+
+def test_run_interpreters(capsys):
+    path = str(Path(__file__).parent / "./examples/speed_basic.py")
+    kwargs = Kwargs(
+        file_or_dir=[path],
+        interpreters=f"{sys.executable},{sys.executable},missing-python",
+        profile="quick",
+        no_precheck=True,
+    )
+
+    # the missing interpreter is skipped, and fails the session.
+    assert run_interpreters(kwargs, print) == 1
+    out = capsys.readouterr().out
+    assert "`missing-python` not found" in out
+    assert f"{sys.executable} {sys.version.split()[0]}" in out
+    assert "geometric mean speedup" in out
@@ -0,0 +1,88 @@
+"""Tests performance budgets and the exit code of a session."""
+
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+from speedtest._kwargs import Kwargs
+from speedtest._limits import check_limits, find_limits, peak_memory
+from speedtest._processor import run_session
+from speedtest._stringify import parse_bytes
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("50MB", 50e6), ("512KiB", 524288), ("1gb", 1e9), (64, 64), ("10", 10)],
+)
+def test_parse_bytes(value, expected):
+    assert parse_bytes(value) == expected
+
+
+def test_find_limits():
+    table = {
+        "*": {"max_time": "1s"},
+        "speed_a*": {"max_time": "5ms"},
+        "bench/speed_x.py:*": {"max_memory": "1MB"},
+    }
+    names = ["bench/speed_x.py:speed_a{'n'=1}", "speed_a{'n'=1}"]
+    assert find_limits(names, table) == {"max_time": 5e-3, "max_memory": 1e6}
+    # limits declared on the speed function take precedence.
+    assert find_limits(names, table, {"max_time": "2ms", "max_memory": None}) == {
+        "max_time": 2e-3,
+        "max_memory": 1e6,
+    }
+    assert find_limits(["speed_b"], {"speed_a": {"max_time": 1}}) == {}
+
+
+def test_check_limits():
+    limits = {"max_time": 1.0}
+    assert check_limits({"score": 1.1, "samples": [1.1]}, limits)
+    assert not check_limits({"score": 0.9, "samples": [0.9]}, limits)
+    # noisy samples whose confidence interval spans the limit do not fail.
+    assert not check_limits({"score": 0.5, "samples": [0.5, 1.5, 1.4]}, limits)
+    assert check_limits({"score": 1.2, "samples": [1.2, 1.25, 1.3]}, limits)
+
+    assert check_limits({"peak_memory": 2048}, {"max_memory": 1024})
+    assert not check_limits({"peak_memory": 512}, {"max_memory": 1024})
+
+
+def test_peak_memory():
+    assert peak_memory(lambda: bytearray(1 << 20)) >= 1 << 20
+    assert peak_memory(lambda: None) < 1 << 16
+
+
+def test_peak_memory_without_reset_peak(monkeypatch):
+    # as on Python 3.8.
+    monkeypatch.delattr(tracemalloc, "reset_peak")
+    assert peak_memory(lambda: bytearray(1 << 20)) >= 1 << 20
+    assert peak_memory(lambda: None) < 1 << 16
+
+
+def test_run_session_exit_code(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.delitem(sys.modules, "speed_limited", raising=False)
+    with open(os.path.join(tmpdir, "speed_limited.py"), "w") as fid:
+        fid.write(
+            "import speedtest\n\n"
+            "@speedtest.limit(max_time='1ns')\n"
+            "def speed_slow():\n"
+            "    sum(range(1000))\n\n"
+            "def speed_ok():\n"
+            "    pass\n"
+        )
+    # enough repeats for a narrow confidence interval on a noisy machine.
+    kwargs = Kwargs(file_or_dir=["."], no_cache=True, no_precheck=True, nreps=5)
+    assert run_session(kwargs, print) == 1
+
+    # limits from pyproject.toml are overridden by the decorator.
+    kwargs.limits = {"speed_slow": {"max_time": "1s"}}
+    assert run_session(kwargs, print) == 1
+
+    kwargs.limits = {"speed_ok": {"max_time": "1s"}}
+    monkeypatch.setattr(
+        sys.modules["speed_limited"].speed_slow, "__speedtest_limit__", {}
+    )
+    assert run_session(kwargs, print) == 0
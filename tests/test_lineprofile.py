@@ -0,0 +1,107 @@
+"""Tests timing each line of the functions called by a benchmark."""
+
+import sys
+
+import pytest
+
+from speedtest._kwargs import Kwargs
+from speedtest._lineprofile import (
+    _profile_settrace,
+    annotate_source,
+    code_of,
+    hottest_line,
+    profile_lines,
+    resolve_target,
+    target_codes,
+)
+from speedtest._processor import SpCase, _run_case
+from speedtest._speedtree import SpMethod, parse_python_to_tree
+from speedtest._stringify import stringify_line_profile
+
+
+def _work(n: int) -> int:
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def _outer() -> int:
+    return _work(10) + _work(20)
+
+
+@pytest.mark.parametrize("backend", [profile_lines, _profile_settrace])
+def test_profile_lines(backend):
+    work, outer = code_of(_work), code_of(_outer)
+    stats = backend(_outer, [work, outer])
+
+    lineno = work.co_firstlineno
+    hits = {line - lineno: hits for line, (hits, _) in stats[work].items()}
+    # two calls; the loop header runs once more than its body.
+    assert hits == {1: 2, 2: 32, 3: 30, 4: 2}
+    # the line calling _work includes its time.
+    ((line, (_, ns)),) = stats[outer].items()
+    assert line == outer.co_firstlineno + 1
+    assert ns >= sum(ns for _, ns in stats[work].values())
+
+    listing = annotate_source(stats, [work, outer], "auto")
+    assert "Function: _work at " in listing
+    assert "total += i" in listing and "% Time" in listing
+    assert hottest_line(stats)["file"] == work.co_filename
+
+
+def test_resolve_target():
+    assert resolve_target("os.path.join") is __import__("os").path.join
+    assert resolve_target("_work", globals()) is _work
+    with pytest.raises(ValueError):
+        resolve_target("no_such_module_xyz.func")
+    assert target_codes(_outer, []) == [code_of(_outer)]
+    assert target_codes(_outer, ["_work"]) == [code_of(_work)]
+
+
+def test_run_case_line_profile(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    func = _outer
+    func.__speedtest_line_profile__ = ["_work"]
+    try:
+        case = SpCase(SpMethod("speed_outer", []), func, "speed_outer", {})
+        kwargs = Kwargs(file_or_dir=[], min_time=0.01, nreps=1)
+        properties = _run_case(case, "speed_x.py", kwargs, {})
+    finally:
+        del func.__speedtest_line_profile__
+
+    fname = tmp_path / properties["line_profile"]["file"]
+    assert fname.parent.name == "line_profile"
+    assert "Function: _work at " in fname.read_text()
+    (line,) = stringify_line_profile(properties, 40)
+    assert line.startswith("    line profile ----") and "hottest" in line
+
+    # a target which cannot be found is reported, without failing the benchmark.
+    kwargs.line_profile = "missing_function"
+    properties = _run_case(case, "speed_x.py", kwargs, {})
+    assert properties["status"] == "ok"
+    assert "FAILED" in stringify_line_profile(properties, 40)[0]
+
+
+def test_mark_line_profile():
+    tree = parse_python_to_tree(
+        "import speedtest\n\n"
+        "@speedtest.mark(line_profile=['mypkg.func'])\n"
+        "def bench():\n    pass\n"
+    )
+    assert [m.name for m in tree.methods] == ["bench"]
+
+    import speedtest
+
+    @speedtest.mark(line_profile=["mypkg.func"])
+    def bench():
+        pass
+
+    assert bench.__speedtest_line_profile__ == ["mypkg.func"]
+    assert speedtest.mark(_work) is _work
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="needs sys.monitoring")
+def test_profile_lines_frees_tool_id():
+    profile_lines(_outer, [code_of(_work)])
+    assert all(sys.monitoring.get_tool(i) != "speedtest" for i in range(6))
@@ -1,4 +1,12 @@
-from speedtest import parametrize
+import pickle
+import sys
+from functools import partial
+
+import pytest
+
+from speedtest import ParamGrid, parametrize, throughput, timeout
+from speedtest._processor import _collect_cases, _iter_cases, matches_keyword
+from speedtest._speedtree import SpMethod
 
 
 def test_parametrize():
@@ -17,3 +25,127 @@ def test_parametrize():
     # call with empty args and parametrize.
     for option, result in zip(f2, [1, 2, 3]):
         assert option() == result**2
+
+
+def test_throughput():
+    @throughput(items="a", bytes=64)
+    def f(a):
+        return a
+
+    assert f.__speedtest_throughput__ == {"items": "a", "bytes": 64}
+
+    # applied on top of parametrize, every case is annotated.
+    @throughput(items="a")
+    @parametrize("a", [1, 2])
+    def f2(a):
+        return a
+
+    for option in f2:
+        assert option.__speedtest_throughput__ == {"items": "a", "bytes": None}
+
+
+def test_timeout():
+    @timeout("2m")
+    def f():
+        pass
+
+    assert f.__speedtest_timeout__ == 120.0
+
+    @timeout(0.5)
+    @parametrize("a", [1, 2])
+    def f2(a):
+        return a
+
+    assert [option.__speedtest_timeout__ for option in f2] == [0.5, 0.5]
+
+
+def test_parametrize_stacked():
+    @parametrize("a", [1, 2])
+    @parametrize("b", [10, 20, 30])
+    def f(a, b):
+        return a + b
+
+    assert isinstance(f, ParamGrid)
+    assert len(f) == 6
+    assert [option() for option in f] == [11, 21, 31, 12, 22, 32]
+    # grids can be iterated more than once, and indexed.
+    assert [option() for option in f] == [11, 21, 31, 12, 22, 32]
+    assert f[4]() == 22
+    assert f[-1]() == 32
+    assert f.params(3) == {"a": 2, "b": 10}
+
+    with pytest.raises(IndexError):
+        f[6]
+
+
+def test_parametrize_zip_ids():
+    @parametrize("a", [1, 2], ids=["one", "two"], mode="zip")
+    @parametrize("b", [10, 20], ids=lambda b: f"b{b}")
+    def f(a, b):
+        return a + b
+
+    assert len(f) == 2
+    assert [option() for option in f] == [11, 22]
+    assert [option.case_id for option in f] == ["one-b10", "two-b20"]
+
+    with pytest.raises(ValueError):
+        parametrize("a", [1, 2], mode="zip")(parametrize("b", [1, 2, 3])(f.func))
+
+
+def test_parametrize_large_grid():
+    @parametrize("a", range(100))
+    @parametrize("b", range(100))
+    @parametrize("c", range(100))
+    def f(a, b, c):
+        return a * 10000 + b * 100 + c
+
+    # one million cases, never materialized.
+    assert len(f) == 1_000_000
+    assert f[123456]() == 123456
+
+
+@parametrize("n", [10, 100], ids=["small", "large"])
+@parametrize("k", [1, 2])
+def speed_grid(n, k):
+    return n * k
+
+
+def test_parametrize_pickle():
+    case = pickle.loads(pickle.dumps(speed_grid[3]))
+    assert case() == 200
+    assert case.case_id == "large-k=2"
+    assert len(pickle.loads(pickle.dumps(speed_grid))) == 4
+
+
+def test_parametrize_labels():
+    cases = _collect_cases(sys.modules[__name__], SpMethod("speed_grid", []))
+    assert [c.label for c in cases] == [
+        "speed_grid[small-k=1]",
+        "speed_grid[small-k=2]",
+        "speed_grid[large-k=1]",
+        "speed_grid[large-k=2]",
+    ]
+    assert pickle.loads(pickle.dumps(cases[1])).func() == 20
+
+
+@parametrize("n", range(20_000))
+def speed_large_grid(n):
+    return n
+
+
+def test_keyword_does_not_expand_grid(monkeypatch):
+    built = []
+    getitem = ParamGrid.__getitem__
+
+    def counting_getitem(self, index):
+        built.append(index)
+        return getitem(self, index)
+
+    monkeypatch.setattr(ParamGrid, "__getitem__", counting_getitem)
+    cases = _iter_cases(
+        sys.modules[__name__],
+        SpMethod("speed_large_grid", []),
+        select=partial(matches_keyword, keyword="speed_large_grid{'n'=12345}"),
+    )
+    assert [c.label for c in cases] == ["speed_large_grid{'n'=12345}"]
+    assert built == [12345]
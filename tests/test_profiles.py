@@ -0,0 +1,72 @@
+"""Tests timing profiles and the calibration of the number of loops."""
+
+import timeit
+
+import pytest
+
+from speedtest._kwargs import Kwargs
+from speedtest._processor import SpCase, _calibrate_case
+from speedtest._profiles import apply_profile, autorange, profile_label
+from speedtest._speedtree import SpMethod
+
+
+def test_autorange():
+    timer = timeit.Timer(lambda: None)
+    nloops, time_taken = autorange(timer, min_time=0.01)
+    assert time_taken >= 0.01
+    assert str(nloops)[0] in "125"
+
+    assert autorange(timer, min_time=10.0, max_loops=300)[0] == 300
+
+
+@pytest.mark.parametrize(
+    "profile,min_time,max_loops,nreps",
+    [
+        ("quick", 0.01, 10_000, 1),
+        ("default", 0.2, None, 3),
+        ("rigorous", 1.0, None, 10),
+    ],
+)
+def test_apply_profile(profile, min_time, max_loops, nreps):
+    kwargs = Kwargs(file_or_dir=[], profile=profile)
+    apply_profile(kwargs)
+    assert (kwargs.min_time, kwargs.max_loops, kwargs.nreps) == (
+        min_time,
+        max_loops,
+        nreps,
+    )
+    assert profile_label(kwargs) == profile
+
+    with pytest.raises(ValueError):
+        apply_profile(Kwargs(file_or_dir=[], profile="fast"))
+
+
+@pytest.mark.parametrize("profile", ["quick", "default", "rigorous"])
+def test_apply_profile_nreps(profile):
+    # an explicit --nreps is kept by every profile.
+    kwargs = Kwargs(file_or_dir=[], profile=profile, nreps=5)
+    apply_profile(kwargs)
+    assert kwargs.nreps == 5
+
+
+def test_profile_label_overrides():
+    kwargs = Kwargs(file_or_dir=[], profile="quick", max_loops=50)
+    apply_profile(kwargs)
+    assert kwargs.min_time == 0.01
+    assert profile_label(kwargs) == "quick(max_loops=50)"
+
+
+def test_calibrate_case_profile():
+    case = SpCase(SpMethod("speed_a", []), lambda: None, "speed_a", {})
+    cache = {"a.py": {"speed_a": {"nloops": 7, "score": 1.0, "profile": "rigorous"}}}
+
+    kwargs = Kwargs(file_or_dir=[], profile="rigorous")
+    apply_profile(kwargs)
+    assert _calibrate_case(case, "a.py", kwargs, cache)["nloops"] == 7
+
+    # loops calibrated by another profile are recalibrated.
+    kwargs = Kwargs(file_or_dir=[], profile="quick")
+    apply_profile(kwargs)
+    properties = _calibrate_case(case, "a.py", kwargs, cache)
+    assert properties["nloops"] == 10_000
+    assert properties["profile"] == "quick"
@@ -0,0 +1,35 @@
+"""Tests timed regions and pauses inside a speed function."""
+
+import time
+import timeit
+
+import speedtest
+from speedtest._regions import region_clock, region_totals, reset_regions
+
+
+def test_region():
+    reset_regions()
+    for _ in range(3):
+        with speedtest.region("sleep"):
+            time.sleep(0.01)
+    assert speedtest.region("sleep") is speedtest.region("sleep")
+    assert region_totals()["sleep"] >= 3e7
+
+    reset_regions()
+    assert "sleep" not in region_totals()
+
+
+def test_pause_resume():
+    def f():
+        speedtest.pause()
+        time.sleep(0.02)
+        speedtest.resume()
+
+    # the paused time is excluded by the clock.
+    assert timeit.Timer(f, timer=region_clock).timeit(5) < 0.02
+
+    t0 = region_clock()
+    speedtest.pause()
+    time.sleep(0.01)
+    assert region_clock() - t0 < 0.01
+    speedtest.resume()
@@ -0,0 +1,104 @@
+"""Tests timing benchmarks in replica processes."""
+
+import statistics
+
+import pytest
+
+from speedtest._cache import ShardedCache
+from speedtest._kwargs import Kwargs
+from speedtest._processor import _combine_replicas, run_session
+from speedtest._stats import variance_components
+from speedtest._stringify import stringify_replicas
+
+
+def test_variance_components():
+    # no variance between processes beyond that expected from within.
+    within, between = variance_components([[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]])
+    assert within == pytest.approx(1.0) and between == 0.0
+
+    # every process is offset from the others.
+    groups = [[x + offset for x in (1.0, 2.0, 3.0)] for offset in (0.0, 10.0, 20.0)]
+    within, between = variance_components(groups)
+    assert within == pytest.approx(1.0)
+    assert between == pytest.approx(statistics.variance([2.0, 12.0, 22.0]) - 1.0 / 3)
+
+    with pytest.raises(ValueError):
+        variance_components([[1.0, 2.0]])
+
+
+def test_combine_replicas():
+    kwargs = Kwargs(file_or_dir=[])
+    runs = [
+        (1, {"nloops": 10, "samples": [1.0, 1.2], "items": 10, "status": "ok"}),
+        (2, {"nloops": 10, "samples": [2.0, 2.2], "items": 10, "status": "ok"}),
+    ]
+    properties = _combine_replicas(runs, kwargs)
+    assert properties["samples"] == [1.0, 1.2, 2.0, 2.2]
+    assert properties["score"] == 1.0 and properties["items_per_sec"] == 10.0
+    replicas = properties["replicas"]
+    assert replicas["hash_seeds"] == [1, 2]
+    assert replicas["means"] == pytest.approx([1.1, 2.1])
+    assert replicas["between_stdev"] > replicas["within_stdev"] > 0
+
+    (line,) = stringify_replicas(properties, "s", 30)
+    assert line.startswith("    replicas ----") and "2 processes" in line
+    assert "within" in line and "between processes" in line
+
+    # a benchmark failing in any replica is failed.
+    runs[1][1]["status"] = "failed"
+    assert _combine_replicas(runs, kwargs)["status"] == "failed"
+
+
+def test_run_session_replicas(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    src = tmp_path / "speed_hash.py"
+    src.write_text(
+        "with open('hashes.txt', 'a') as f:\n"
+        "    f.write(str(hash('speedtest')) + '\\n')\n\n\n"
+        "def speed_sum():\n"
+        "    sum(range(100))\n"
+    )
+    kwargs = Kwargs(
+        file_or_dir=[str(src)], no_precheck=True, replicas=3, nreps=2, min_time=0.01
+    )
+    assert run_session(kwargs, print) == 0
+    out = capsys.readouterr().out
+    assert "3 replicas" in out and "3 processes" in out
+
+    # each replica imported the speed file with its own hash seed.
+    assert len(set((tmp_path / "hashes.txt").read_text().split())) == 3
+    properties = ShardedCache()[str(src)]["speed_sum"]
+    assert len(properties["samples"]) == 6
+    assert len(properties["replicas"]["hash_seeds"]) == 3
+
+
+def test_run_session_replicas_group(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    src = tmp_path / "speed_group.py"
+    src.write_text(
+        "import speedtest\n\n\n"
+        "@speedtest.group('total', baseline=True)\n"
+        "def speed_loop():\n"
+        "    t = 0\n"
+        "    for i in range(1000):\n"
+        "        t += i\n\n\n"
+        "@speedtest.group('total')\n"
+        "def speed_sum():\n"
+        "    sum(range(1000))\n"
+    )
+    kwargs = Kwargs(
+        file_or_dir=[str(src)], no_precheck=True, replicas=2, nreps=3, min_time=0.01
+    )
+    assert run_session(kwargs, print) == 0
+    out = capsys.readouterr().out
+    assert "group 'speed_group.py:total' ranked against 'speed_loop'" in out
+    assert "3 interleaved rounds in each of 2 replicas" in out
+
+    cache = ShardedCache()[str(src)]
+    baseline, member = cache["speed_loop"], cache["speed_sum"]
+    assert len(member["samples"]) == 6
+    # the speedup is that of the rounds pooled from both replicas.
+    ratios = [b / o for b, o in zip(baseline["samples"], member["samples"])]
+    assert member["speedup"] == pytest.approx(statistics.fmean(ratios))
+    assert baseline["speedup"] == pytest.approx(1.0)
+    assert member["group"] == "speed_group.py:total"
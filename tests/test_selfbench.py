@@ -0,0 +1,54 @@
+"""Tests the bundled self-benchmark suite."""
+
+import os
+
+from speedtest._kwargs import Kwargs
+from speedtest._processor import _discover_source_files, run_session
+from speedtest._selfbench import (
+    SUITE_DIR,
+    synthetic_results,
+    synthetic_source,
+    synthetic_tree,
+)
+from speedtest._speedtree import parse_python_to_tree
+
+
+def test_synthetic_inputs(tmp_path):
+    tree = parse_python_to_tree(synthetic_source(20))
+    assert len(tree.methods) == 20 and list(tree.fixtures) == ["data"]
+
+    synthetic_tree(str(tmp_path), 150)
+    assert len(_discover_source_files([str(tmp_path)])) == 150
+    assert len(os.listdir(tmp_path)) == 2
+
+    results = synthetic_results(250, n_params=3)
+    assert len(results) == 3
+    assert sum(len(items) for items in results.values()) == 250
+    properties = next(iter(next(iter(results.values())).values()))
+    assert {"param__p0", "param__p1", "param__p2"} <= set(properties)
+
+
+def test_self_bench_not_discovered():
+    # scanning the package itself skips the bundled suite.
+    package_dir = os.path.dirname(SUITE_DIR)
+    assert os.path.join(SUITE_DIR, "speed_harness.py") not in _discover_source_files(
+        [package_dir]
+    )
+
+
+def test_run_self_bench(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert _discover_source_files([SUITE_DIR]) == [
+        os.path.join(SUITE_DIR, "speed_harness.py")
+    ]
+    kwargs = Kwargs(
+        file_or_dir=[SUITE_DIR],
+        no_precheck=True,
+        profile="quick",
+        keyword="speed_parse_python_to_tree",
+    )
+    assert run_session(kwargs, print) == 0
+    out = capsys.readouterr().out
+    assert out.count("speed_harness.py:speed_parse_python_to_tree") == 3
+    # results are cached like those of any other speed file.
+    assert os.listdir(tmp_path / ".speedtest_cache" / "shards")
@@ -0,0 +1,82 @@
+"""Tests rebuilding the inputs of a speed function before every call."""
+
+import time
+import types
+
+import pytest
+
+import speedtest
+from speedtest._processor import _case_timer, _collect_cases
+from speedtest._setup import _BATCH_SIZE, SetupTimer, build_inputs
+from speedtest._speedtree import SpMethod
+
+
+def test_build_inputs():
+    assert build_inputs(None, {"a": lambda: 1}) == ((), {"a": 1})
+    assert build_inputs(lambda: {"b": 2}, {"a": lambda: 1}) == ((), {"a": 1, "b": 2})
+    assert build_inputs(lambda: (1, 2), {}) == ((1, 2), {})
+    assert build_inputs(lambda: [3], {}) == (([3],), {})
+    assert build_inputs(lambda: None, {}) == ((), {})
+
+
+def test_setup_timer():
+    calls = []
+
+    def inputs():
+        time.sleep(0.001)
+        return ([3, 2, 1],), {}
+
+    timer = SetupTimer(lambda x: calls.append(sorted(x)), inputs)
+    # the setup time is excluded from the measurement.
+    assert timer.timeit(20) < 0.02
+    assert calls == [[1, 2, 3]] * 20
+    assert len(timer.repeat(repeat=2, number=3)) == 2
+
+
+def test_setup_timer_batches():
+    built, used = [], []
+
+    def inputs():
+        built.append(len(built) - len(used))
+        return (bytearray(1 << 10),), {}
+
+    # only a small batch of inputs is kept alive before being used.
+    SetupTimer(lambda x: used.append(1), inputs).timeit(100)
+    assert len(used) == 100
+    assert max(built) < _BATCH_SIZE
+
+
+def test_fixture_scope():
+    with pytest.raises(ValueError):
+        speedtest.fixture(scope="module")
+
+
+def test_collect_cases_iteration():
+    module_ = types.ModuleType("speed_iteration")
+
+    @speedtest.fixture(scope="iteration")
+    def data():
+        return [3, 1, 2]
+
+    def speed_sort(data):
+        data.sort()
+        return data
+
+    @speedtest.parametrize("n", [2, 4])
+    @speedtest.setup(lambda n: list(range(n, 0, -1)))
+    def speed_setup(data, n):
+        return sorted(data) == data
+
+    module_.data = data
+    module_.speed_sort = speed_sort
+    module_.speed_setup = speed_setup
+
+    (case,) = _collect_cases(module_, SpMethod("speed_sort", ["data"]))
+    args, kw = case.inputs()
+    assert case.func(*args, **kw) == [1, 2, 3]
+    # each call receives a fresh, unsorted input.
+    assert case.inputs()[1]["data"] == [3, 1, 2]
+    assert isinstance(_case_timer(case), SetupTimer)
+
+    cases = _collect_cases(module_, SpMethod("speed_setup", []))
+    assert [c.inputs()[0] for c in cases] == [([2, 1],), ([4, 3, 2, 1],)]
@@ -0,0 +1,145 @@
+"""Tests sharding of speed files and merging of shard outputs."""
+
+import json
+import os
+
+import pytest
+
+from speedtest._cache import write_shards
+from speedtest._ioops import read_json, write_json
+from speedtest._kwargs import Kwargs
+from speedtest._processor import run_merge, run_session
+from speedtest._shard import (
+    assign_shards,
+    estimate_file_costs,
+    merge_results,
+    parse_shard,
+    prioritize_files,
+    read_shard_costs,
+)
+
+
+def test_parse_shard():
+    assert parse_shard("2/8") == (2, 8)
+
+    for spec in ("0/2", "3/2", "1", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_estimate_file_costs():
+    cache = {"a.py": {"speed_a": {"nloops": 10, "score": 0.1}}}
+    costs = estimate_file_costs(["a.py", "b.py"], cache, nreps=3)
+    assert costs["a.py"] == pytest.approx(4.0)
+    # unknown files are assigned the mean cost.
+    assert costs["b.py"] == pytest.approx(4.0)
+
+    assert estimate_file_costs(["c.py"], {}) == {"c.py": 1.0}
+
+
+def test_assign_shards():
+    costs = {"a.py": 10.0, "b.py": 6.0, "c.py": 5.0, "d.py": 1.0}
+    shards = assign_shards(costs, 2)
+
+    assert shards == assign_shards(dict(reversed(costs.items())), 2)
+    assert sorted(sum(shards, [])) == sorted(costs)
+    assert [sum(costs[s] for s in shard) for shard in shards] == [11.0, 11.0]
+
+
+def test_read_shard_costs(tmpdir):
+    # written from a checkout in another directory.
+    results = {
+        "/home/dev/repo/bench/speed_a.py": {"speed_a": {"nloops": 1, "score": 2.0}},
+        "/home/dev/repo/speed_a.py": {"speed_a": {"nloops": 1, "score": 1.0}},
+    }
+    fname = os.path.join(tmpdir, "costs.json")
+    write_json(results, fname=fname)
+
+    local = [os.path.join("/ci", "repo", "bench", "speed_a.py"), "/ci/speed_c.py"]
+    assert read_shard_costs(fname, local) == {
+        local[0]: results["/home/dev/repo/bench/speed_a.py"]
+    }
+
+
+def test_run_session_shards_ignore_cache(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    srcs = []
+    for name in "abcde":
+        srcs.append(os.path.join(tmpdir, f"speed_{name}.py"))
+        with open(srcs[-1], "w") as fid:
+            fid.write(f"def speed_{name}():\n    pass\n")
+
+    # each node has a cache of its own, with different runtimes.
+    ran = []
+    for index, slow in ((1, srcs[0]), (2, srcs[-1])):
+        write_shards(
+            {
+                src: {"speed_x": {"nloops": 10**6 if src == slow else 1, "score": 1.0}}
+                for src in srcs
+            }
+        )
+        kwargs = Kwargs(
+            file_or_dir=[str(tmpdir)],
+            shard=f"{index}/2",
+            no_precheck=True,
+            profile="quick",
+            json_file=os.path.join(tmpdir, f"shard{index}.json"),
+        )
+        assert run_session(kwargs, print) == 0
+        ran.append(set(read_json(kwargs.json_file)["results"]))
+
+    assert not ran[0] & ran[1]
+    assert ran[0] | ran[1] == set(srcs)
+
+
+def test_prioritize_files(tmpdir):
+    paths = []
+    for i, name in enumerate(["old.py", "noisy.py", "new.py", "uncached.py"]):
+        path = os.path.join(tmpdir, name)
+        open(path, "w").close()
+        os.utime(path, (1000 + i, 1000 + i))
+        paths.append(path)
+    old, noisy, new, uncached = paths
+
+    cache = {
+        old: {"speed_a": {"samples": [1.0, 1.0, 1.0]}},
+        noisy: {"speed_a": {"samples": [1.0, 2.0, 3.0]}},
+        new: {"speed_a": {"samples": [1.0, 1.0, 1.1]}},
+    }
+    assert prioritize_files(paths, cache) == [uncached, new, noisy, old]
+
+
+@pytest.fixture
+def shard_files(tmpdir):
+    paths = []
+    for i, name in enumerate(["speed_a", "speed_b"]):
+        path = os.path.join(tmpdir, f"shard{i + 1}.json")
+        with open(path, "wt", encoding="utf-8") as fid:
+            json.dump(
+                {
+                    "fingerprint": {"python": f"3.1{i}"},
+                    "results": {"speed_x.py": {name: {"nloops": 10, "score": 0.1}}},
+                },
+                fid,
+            )
+        paths.append(path)
+    return paths
+
+
+def test_merge_results(shard_files):
+    results, fingerprints = merge_results(shard_files)
+    assert sorted(results["speed_x.py"]) == ["speed_a", "speed_b"]
+    assert len(fingerprints) == 2
+
+
+def test_run_merge(shard_files, tmpdir):
+    lines = []
+    output = os.path.join(tmpdir, "combined.json")
+    run_merge(
+        [os.path.join(tmpdir, "shard*.json")],
+        Kwargs(file_or_dir=[], no_cache=True, json_file=output),
+        lines.append,
+    )
+    assert any(line.startswith("WARNING") for line in lines)
+    with open(output, "rt", encoding="utf-8") as fid:
+        assert len(json.load(fid)["results"]["speed_x.py"]) == 2
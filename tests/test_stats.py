@@ -0,0 +1,29 @@
+"""Tests the statistics helpers."""
+
+import pytest
+
+from speedtest._stats import (
+    mean_confidence_interval,
+    paired_ratios,
+    t_critical,
+)
+
+
+def test_t_critical():
+    assert t_critical(1) == pytest.approx(12.706)
+    assert t_critical(30) > t_critical(1000) > 1.96
+    with pytest.raises(ValueError):
+        t_critical(0)
+
+
+def test_mean_confidence_interval():
+    mean, lower, upper = mean_confidence_interval([1.0, 2.0, 3.0])
+    assert mean == 2.0
+    assert lower == pytest.approx(2.0 - 4.303 / 3**0.5)
+    assert upper == pytest.approx(2.0 + 4.303 / 3**0.5)
+
+    assert mean_confidence_interval([5.0]) == (5.0, 5.0, 5.0)
+
+
+def test_paired_ratios():
+    assert paired_ratios([2.0, 4.0], [1.0, 2.0]) == [2.0, 2.0]
@@ -1,5 +1,11 @@
 import pytest
-from speedtest._stringify import stringify_time, stringify_bytes, map_stringify_time
+from speedtest._stringify import (
+    map_stringify_time,
+    parse_time,
+    stringify_bytes,
+    stringify_throughput,
+    stringify_time,
+)
 
 
 @pytest.mark.parametrize("value", [2.0, 1e-2, 1e-5, 1e-8])
@@ -20,3 +26,36 @@ def test_stringify_map_time(unit):
 def test_exception_no_unit():
     with pytest.raises(ValueError):
         map_stringify_time("Not_a_unit", 1.0)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (512, "512 B"),
+        (2048, "2.0 KiB"),
+        (3 * 1048576, "3.0 MiB"),
+        (1073741824, "1.0 GiB"),
+    ],
+)
+def test_stringify_bytes_units(value, expected):
+    assert stringify_bytes(value) == expected
+
+
+def test_stringify_throughput():
+    assert stringify_throughput({"score": 1.0}) == ""
+    assert (
+        stringify_throughput({"items_per_sec": 2.5e6, "bytes_per_sec": 2048})
+        == ", 2.5M items/sec, 2.0 KiB/s"
+    )
+
+
+@pytest.mark.parametrize(
+    "value,expected", [("30s", 30.0), ("15m", 900.0), ("500ms", 0.5), ("2", 2.0)]
+)
+def test_parse_time(value, expected):
+    assert parse_time(value) == pytest.approx(expected)
+
+
+def test_parse_time_invalid():
+    with pytest.raises(ValueError):
+        parse_time("30 parsecs")
@@ -0,0 +1,42 @@
+"""Tests running benchmarks in a child process under a time limit."""
+
+import signal
+import time
+
+import pytest
+
+from speedtest._timeout import BenchmarkTimeout, call_with_alarm, run_with_timeout
+
+
+def test_run_with_timeout():
+    assert run_with_timeout(lambda: sum(range(10)), 10.0) == 45
+
+
+def test_run_with_timeout_exception():
+    def f():
+        raise ValueError("bad benchmark")
+
+    with pytest.raises(ValueError, match="bad benchmark"):
+        run_with_timeout(f, 10.0)
+
+
+def test_run_with_timeout_hang():
+    t0 = time.monotonic()
+    with pytest.raises(BenchmarkTimeout):
+        run_with_timeout(lambda: time.sleep(60), 0.2)
+    assert time.monotonic() - t0 < 10.0
+
+
+def test_call_with_alarm():
+    # runs in this process, so its side effects are kept.
+    calls = []
+    assert call_with_alarm(lambda: calls.append(1) or len(calls), 10.0) == 1
+    assert calls == [1]
+
+    handler = signal.getsignal(signal.SIGALRM)
+    t0 = time.monotonic()
+    with pytest.raises(BenchmarkTimeout):
+        call_with_alarm(lambda: time.sleep(60), 0.2)
+    assert time.monotonic() - t0 < 10.0
+    assert signal.getsignal(signal.SIGALRM) is handler
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
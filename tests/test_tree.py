@@ -78,3 +78,88 @@ def test_fixture():
     assert len(r.methods) == 1
     assert r.methods[0].name == "speed_basic"
     assert r.methods[0].fixtures[0] == "result"
+
+
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        textwrap.dedent("""\n
+    import speedtest
+    @speedtest.group("square", baseline=True)
+    def normal_basic():
+        _ = [x * 2 for x in range(1000)]
+
+    @speedtest.group("square")
+    def speed_basic2():
+        _ = [x + x for x in range(1000)]
+    """),
+        textwrap.dedent("""\n
+    from speedtest import group
+    @group(name="square", baseline=True)
+    def normal_basic():
+        _ = [x * 2 for x in range(1000)]
+
+    @group("square")
+    def speed_basic2():
+        _ = [x + x for x in range(1000)]
+    """),
+    ],
+)
+def test_group(inputs):
+    r = parse_python_to_tree(str(inputs))
+    assert [m.name for m in r.methods] == ["normal_basic", "speed_basic2"]
+    assert [m.group for m in r.methods] == ["square", "square"]
+    assert [m.baseline for m in r.methods] == [True, False]
+
+
+def test_returns_work():
+    inputs = textwrap.dedent("""\n
+    import speedtest
+
+    def speed_basic():
+        data = b"x" * 100
+        return speedtest.Work(bytes=len(data))
+
+    def speed_basic2():
+        return 42
+    """)
+
+    r = parse_python_to_tree(str(inputs))
+    assert [m.returns_work for m in r.methods] == [True, False]
+
+
+def test_code_hash():
+    src = """
+from speedtest import fixture
+
+LIMIT = 10
+
+@fixture
+def data():
+    return list(range(LIMIT))
+
+def speed_a(data):
+    sum(data)
+
+def speed_b():
+    pass
+"""
+    tree = parse_python_to_tree(src)
+    hashes = {m.name: m.code_hash for m in tree.methods}
+
+    # formatting and comments do not change the hash.
+    reformatted = parse_python_to_tree(src.replace("sum(data)", "sum( data )  # x"))
+    assert {m.name: m.code_hash for m in reformatted.methods} == hashes
+    assert reformatted.context_hash == tree.context_hash
+
+    # changing a fixture changes the methods which use it.
+    changed = parse_python_to_tree(src.replace("range(LIMIT)", "range(LIMIT + 1)"))
+    changed_hashes = {m.name: m.code_hash for m in changed.methods}
+    assert changed_hashes["speed_a"] != hashes["speed_a"]
+    assert changed_hashes["speed_b"] == hashes["speed_b"]
+    assert changed.fixtures["data"] != tree.fixtures["data"]
+
+    # other module-level code is part of the context.
+    assert parse_python_to_tree(src.replace("= 10", "= 11")).context_hash != (
+        tree.context_hash
+    )
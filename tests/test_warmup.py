@@ -0,0 +1,76 @@
+"""Tests the warm-up phase and steady-state detection."""
+
+from pathlib import Path
+
+import pytest
+
+from speedtest._kwargs import Kwargs
+from speedtest._processor import run_session
+from speedtest._profiles import apply_profile, parse_warmup, warm_up
+from speedtest._stats import warmup_changepoint
+from speedtest._stringify import stringify_warmup
+
+
+class _SeriesTimer:
+    """A timer replaying a series of times per call."""
+
+    def __init__(self, series):
+        self.series = list(series)
+        self.ncalls = 0
+
+    def timeit(self, number):
+        assert number == 1
+        self.ncalls += 1
+        return self.series.pop(0)
+
+
+def test_warmup_changepoint():
+    assert warmup_changepoint([10.0] * 5 + [1.0, 1.1, 0.9, 1.0] * 5) == 5
+    assert warmup_changepoint([1.0] * 10) == 0
+    assert warmup_changepoint([]) == 0
+    # at most half of the series is discarded.
+    assert warmup_changepoint([float(x) for x in range(10, 0, -1)]) <= 5
+
+
+def test_parse_warmup():
+    assert parse_warmup("auto") is None
+    assert parse_warmup("10") == 10 and parse_warmup(0) == 0
+    for value in ("-1", "soon"):
+        with pytest.raises(ValueError):
+            parse_warmup(value)
+    with pytest.raises(ValueError):
+        apply_profile(Kwargs(file_or_dir=[], warmup="soon"))
+
+
+def test_warm_up():
+    assert warm_up(_SeriesTimer([]), 0) is None
+
+    timer = _SeriesTimer([1.0, 2.0, 3.0, 4.0])
+    assert warm_up(timer, 3) == {"calls": 3, "cost": 6.0}
+    assert timer.ncalls == 3
+
+    # auto; the first 5 calls are slow, and at least 20 calls are timed.
+    timer = _SeriesTimer([1.0] * 5 + [0.01] * 100)
+    warmup = warm_up(timer, None, min_time=0.0)
+    assert timer.ncalls == 20
+    assert warmup["calls"] == 5 and warmup["steady_state"]
+    assert warmup["cost"] == pytest.approx(5.0)
+    assert warmup["steady"] == pytest.approx(0.01)
+    assert warmup["excess"] == pytest.approx(4.95)
+
+    (line,) = stringify_warmup({"warmup": warmup}, "s", 30)
+    assert line.startswith("    warm-up ----") and "5 calls discarded" in line
+    assert "above a steady state of" in line
+
+
+def test_run_session_warmup(capsys):
+    path = str(Path(__file__).parent / "./examples/speed_basic.py")
+    kwargs = Kwargs(
+        file_or_dir=[path],
+        no_cache=True,
+        no_precheck=True,
+        warmup="auto",
+        profile="quick",
+    )
+    assert run_session(kwargs, print) == 0
+    assert capsys.readouterr().out.count("    warm-up ---") == 2
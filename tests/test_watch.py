@@ -0,0 +1,75 @@
+"""Tests watching speed files, and re-timing only what changed."""
+
+import os
+import sys
+
+import pytest
+
+from speedtest._kwargs import Kwargs
+from speedtest._watch import WatchSession, _PollingWatcher, make_watcher
+
+SPEED_FILE = """
+import watch_helper
+
+def speed_a():
+    sum(range(10))
+
+def speed_b():
+    watch_helper.work()
+"""
+
+
+@pytest.fixture
+def watch_dir(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    with open(os.path.join(tmpdir, "watch_helper.py"), "w") as fid:
+        fid.write("def work():\n    return 1\n")
+    with open(os.path.join(tmpdir, "speed_watch.py"), "w") as fid:
+        fid.write(SPEED_FILE)
+    yield str(tmpdir)
+    for name in ("speed_watch", "watch_helper"):
+        sys.modules.pop(name, None)
+
+
+@pytest.mark.parametrize("watcher_class", [_PollingWatcher, make_watcher])
+def test_watcher(watch_dir, watcher_class):
+    path = os.path.join(watch_dir, "speed_watch.py")
+    watcher = watcher_class([path])
+    try:
+        assert watcher.wait(timeout=0.1) == set()
+        with open(path, "a") as fid:
+            fid.write("\n# edit\n")
+        os.utime(path, ns=(0, 0))
+        assert watcher.wait(timeout=5.0) == {path}
+    finally:
+        watcher.close()
+
+
+def test_watch_session(watch_dir, capsys):
+    lines = []
+    session = WatchSession(Kwargs(file_or_dir=["."], no_cache=True), lines.append)
+    session.refresh(set())
+    (src,) = session.results
+    assert sorted(session.results[src]) == ["speed_a", "speed_b"]
+    assert any(p.endswith("watch_helper.py") for p in session.paths())
+
+    # only the edited method is re-timed, and its delta reported.
+    with open(src, "w") as fid:
+        fid.write(SPEED_FILE.replace("range(10)", "range(20)"))
+    capsys.readouterr()
+    lines.clear()
+    session.refresh({src})
+    lines += capsys.readouterr().out.splitlines()
+    assert any(":speed_a " in line and "per loop" in line for line in lines)
+    assert not any(":speed_b " in line and "per loop" in line for line in lines)
+    assert any(line.lstrip().startswith("Δ") for line in lines)
+
+    # changing a dependency re-times every method that could use it.
+    helper = os.path.realpath(os.path.join(watch_dir, "watch_helper.py"))
+    with open(helper, "w") as fid:
+        fid.write("def work():\n    return 2\n")
+    capsys.readouterr()
+    session.refresh({helper})
+    lines = capsys.readouterr().out.splitlines()
+    assert sum("per loop" in line for line in lines) == 2